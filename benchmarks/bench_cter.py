@@ -0,0 +1,163 @@
+"""
+MIT License
+
+Copyright (c) 2018 Max Planck Institute of Molecular Physiology
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import timeit
+import typing
+
+import numpy as np # type: ignore
+import pandas as pd # type: ignore
+
+from transphire_transform.dump_load import cter
+
+
+def reference_amplitude_contrast_to_angle(amp_contrast: pd.Series) -> pd.Series:
+    """
+    Reference implementation of the amplitude contrast to angle conversion.
+
+    Arguments:
+    amp_contrast - Value of the amplitude contrast in percent.
+
+    Returns:
+    Amplitude contrast value in phase shift in degrees.
+    """
+    assert (-100 <= amp_contrast).all() and (amp_contrast <= 100).all(), amp_contrast
+    value = np.arctan2(amp_contrast, np.sqrt(1e4 - amp_contrast**2))
+    value.loc[value < 0] += np.pi
+    return np.degrees(value)
+
+
+def reference_angle_to_amplitude_contrast(angle: pd.Series) -> pd.Series:
+    """
+    Reference implementation of the angle to amplitude contrast conversion.
+
+    Arguments:
+    angle - Value of the phase shift in degrees
+
+    Returns:
+    Value of the amplitude contrast in percent.
+    """
+    return np.tan(np.radians(angle)) / np.sqrt(1 + np.tan(np.radians(angle))**2) * 100.0
+
+
+def run_benchmark(
+        name: str,
+        function: typing.Callable[[], typing.Any],
+        repeat: int
+    ) -> float:
+    """
+    Run the function repeatedly and print the best time.
+
+    Arguments:
+    name - Name of the benchmark
+    function - Function to run
+    repeat - Number of repetitions
+
+    Returns:
+    Best time in seconds
+    """
+    best_time: float
+
+    best_time = min(timeit.repeat(function, number=1, repeat=repeat))
+    print(f'{name:<45} {best_time*1e3:10.3f} ms')
+    return best_time
+
+
+def main(size: int=1000000, repeat: int=10) -> None:
+    """
+    Compare the vectorised conversions against the reference implementations.
+
+    Arguments:
+    size - Number of entries to convert
+    repeat - Number of repetitions
+
+    Returns:
+    None
+    """
+    amp_contrast: pd.Series
+    angle: pd.Series
+    out: np.ndarray
+    out_32: np.ndarray
+
+    amp_contrast = pd.Series(np.random.uniform(-100, 100, size))
+    angle = pd.Series(np.random.uniform(-180, 180, size))
+    out = np.empty(size)
+    out_32 = np.empty(size, dtype=np.float32)
+
+    assert np.allclose(
+        cter.amplitude_contrast_to_angle(amp_contrast),
+        reference_amplitude_contrast_to_angle(amp_contrast.copy()),
+        rtol=0,
+        atol=1e-10
+        )
+    assert np.allclose(
+        cter.angle_to_amplitude_contrast(angle),
+        reference_angle_to_amplitude_contrast(angle),
+        rtol=0,
+        atol=1e-10
+        )
+
+    run_benchmark(
+        'amplitude_contrast_to_angle reference',
+        lambda: reference_amplitude_contrast_to_angle(amp_contrast.copy()),
+        repeat
+        )
+    run_benchmark(
+        'amplitude_contrast_to_angle',
+        lambda: cter.amplitude_contrast_to_angle(amp_contrast),
+        repeat
+        )
+    run_benchmark(
+        'amplitude_contrast_to_angle out',
+        lambda: cter.amplitude_contrast_to_angle(amp_contrast, out=out),
+        repeat
+        )
+    run_benchmark(
+        'amplitude_contrast_to_angle out float32',
+        lambda: cter.amplitude_contrast_to_angle(amp_contrast, out=out_32),
+        repeat
+        )
+    run_benchmark(
+        'angle_to_amplitude_contrast reference',
+        lambda: reference_angle_to_amplitude_contrast(angle),
+        repeat
+        )
+    run_benchmark(
+        'angle_to_amplitude_contrast',
+        lambda: cter.angle_to_amplitude_contrast(angle),
+        repeat
+        )
+    run_benchmark(
+        'angle_to_amplitude_contrast out',
+        lambda: cter.angle_to_amplitude_contrast(angle, out=out),
+        repeat
+        )
+    run_benchmark(
+        'angle_to_amplitude_contrast out float32',
+        lambda: cter.angle_to_amplitude_contrast(angle, out=out_32),
+        repeat
+        )
+
+
+if __name__ == '__main__':
+    main()
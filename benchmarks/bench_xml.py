@@ -0,0 +1,166 @@
+"""
+MIT License
+
+Copyright (c) 2018 Max Planck Institute of Molecular Physiology
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import functools
+import os
+import re
+import timeit
+import typing
+import xml.etree.ElementTree as et
+
+from transphire_transform.dump_load import epu
+from transphire_transform.dump_load import xml
+
+
+THIS_DIR = os.path.dirname(os.path.realpath(__file__))
+INPUT_TEST_FOLDER = '../test_files'
+
+
+def reference_get_key_without_prefix(key: str) -> str:
+    """
+    Reference implementation of the uncached namespace stripping.
+
+    Arguments:
+    key - XML key
+
+    Returns:
+    Key without trailing and leading whitespace and underscore
+    """
+    xml_key_match: typing.Optional[typing.Match[str]]
+
+    xml_key_match = re.match(r'.*{.*}(.*)', key)
+    if xml_key_match is None:
+        return key.strip().strip('_')
+    return xml_key_match.group(1).strip().strip('_')
+
+
+def reference_get_search_keys_without_prefix(
+        search_keys: typing.Tuple[str, ...]
+    ) -> typing.List[str]:
+    """
+    Reference implementation of the uncached search key normalisation.
+
+    Arguments:
+    search_keys - XML search keys
+
+    Returns:
+    List of keys without prefix
+    """
+    return [reference_get_key_without_prefix(search_key) for search_key in search_keys]
+
+
+def map_tags(
+        function: typing.Callable[[str], str],
+        tags: typing.List[str]
+    ) -> typing.List[str]:
+    """
+    Apply the normalisation function to every tag.
+
+    Arguments:
+    function - Normalisation function
+    tags - List of XML tags
+
+    Returns:
+    List of normalised tags
+    """
+    return [function(tag) for tag in tags]
+
+
+def run_benchmark(
+        name: str,
+        function: typing.Callable[[], typing.Any],
+        repeat: int
+    ) -> float:
+    """
+    Run the function repeatedly and print the best time.
+
+    Arguments:
+    name - Name of the benchmark
+    function - Function to run
+    repeat - Number of repetitions
+
+    Returns:
+    Best time in seconds
+    """
+    best_time: float
+
+    best_time = min(timeit.repeat(function, number=1, repeat=repeat))
+    print(f'{name:<45} {best_time*1e3:10.3f} ms')
+    return best_time
+
+
+def main(repeat: int=20) -> None:
+    """
+    Compare the cached tag normalisation against the uncached reference
+    on the falcon and K2 test files.
+
+    Arguments:
+    repeat - Number of repetitions
+
+    Returns:
+    None
+    """
+    level_dict: typing.Dict[str, typing.Dict[str, typing.List[str]]]
+    cached_functions: typing.Tuple[typing.Any, typing.Any]
+    file_name: str
+    tags: typing.List[str]
+
+    level_dict = epu.get_xml_level_dict('epu')
+    cached_functions = (xml.get_key_without_prefix, xml.get_search_keys_without_prefix)
+    for name in ['xml_1_8_falcon_2.xml', 'xml_1_11_falcon.xml', 'xml_1_8_k2.xml', 'xml_1_9_k2.xml']:
+        file_name = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, name)
+        tags = [element.tag for element in et.parse(file_name).getroot().iter()]
+        assert [xml.get_key_without_prefix(tag) for tag in tags] == \
+            [reference_get_key_without_prefix(tag) for tag in tags]
+
+        run_benchmark(
+            f'{name} tags reference',
+            functools.partial(map_tags, reference_get_key_without_prefix, tags),
+            repeat
+            )
+        run_benchmark(
+            f'{name} tags cached',
+            functools.partial(map_tags, xml.get_key_without_prefix, tags),
+            repeat
+            )
+
+        xml.get_key_without_prefix = reference_get_key_without_prefix # type: ignore
+        xml.get_search_keys_without_prefix = reference_get_search_keys_without_prefix # type: ignore
+        try:
+            run_benchmark(
+                f'{name} load_xml reference',
+                functools.partial(xml.load_xml, file_name, level_dict),
+                repeat
+                )
+        finally:
+            xml.get_key_without_prefix, xml.get_search_keys_without_prefix = cached_functions
+        run_benchmark(
+            f'{name} load_xml cached',
+            functools.partial(xml.load_xml, file_name, level_dict),
+            repeat
+            )
+
+
+if __name__ == '__main__':
+    main()
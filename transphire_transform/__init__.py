@@ -25,10 +25,12 @@ SOFTWARE.
 from .dump_load.cter import load_cter, dump_cter # silence pyflakes
 assert load_cter
 assert dump_cter
-from .dump_load.ctffind import load_ctffind # silence pyflakes
+from .dump_load.ctffind import load_ctffind, load_ctffind_avrot # silence pyflakes
 assert load_ctffind
-from .dump_load.mrc import load_mrc_header # silence pyflakes
+assert load_ctffind_avrot
+from .dump_load.mrc import load_mrc_header, load_mrc_extended_header # silence pyflakes
 assert load_mrc_header
+assert load_mrc_extended_header
 from .dump_load.star import load_star, dump_star # silence pyflakes
 assert load_star
 assert dump_star
@@ -37,9 +39,18 @@ assert load_file
 assert dump_file
 from .dump_load.xml import load_xml # silence pyflakes
 assert load_xml
+from .dump_load.xml import load_xml_many # silence pyflakes
+assert load_xml_many
 from .dump_load.motioncor2 import load_motioncor2 # silence pyflakes
 assert load_motioncor2
 from .dump_load.unblur import load_unblur # silence pyflakes
 assert load_unblur
 from .dump_load.box import load_box # silence pyflakes
 assert load_box
+from .dump_load.box import dump_box # silence pyflakes
+assert dump_box
+from .dump_load.table import Table # silence pyflakes
+assert Table
+from .dump_load.convert import ctffind_to_cter, ctffind_to_star # silence pyflakes
+assert ctffind_to_cter
+assert ctffind_to_star
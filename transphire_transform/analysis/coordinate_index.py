@@ -0,0 +1,343 @@
+"""
+MIT License
+
+Copyright (c) 2018 Max Planck Institute of Molecular Physiology
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import typing
+
+import numpy as np # type: ignore
+import pandas as pd # type: ignore
+
+
+def get_coordinate_arrays(
+        coordinate_data: pd.DataFrame,
+        micrograph_name: typing.Optional[str]=None
+    ) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """
+    Extract the coordinates and a micrograph number from a box or star data frame.
+
+    Arguments:
+    coordinate_data - Pandas data frame containing CoordinateX and CoordinateY
+    micrograph_name - Column that identifies the micrograph (default all in one micrograph)
+
+    Returns:
+    Coordinates of shape (n_particles, 2), micrograph number for every particle
+    """
+    coordinates: np.ndarray
+    micrograph_index: np.ndarray
+
+    coordinates = coordinate_data[['CoordinateX', 'CoordinateY']].values.astype(float)
+    if micrograph_name is None:
+        micrograph_index = np.zeros(len(coordinate_data), dtype=np.int64)
+    else:
+        micrograph_index = pd.factorize(coordinate_data[micrograph_name])[0].astype(np.int64)
+    return coordinates, micrograph_index
+
+
+def get_cell_keys(
+        coordinate_index: typing.Dict[str, np.ndarray],
+        cells: np.ndarray,
+        micrograph_index: np.ndarray
+    ) -> np.ndarray:
+    """
+    Combine the micrograph number and the grid cell into a single integer key.
+    Cells outside of the grid get the key -1.
+
+    Arguments:
+    coordinate_index - Index created by create_coordinate_index
+    cells - Grid cells of shape (n, 2) relative to the grid origin
+    micrograph_index - Micrograph number for every cell
+
+    Returns:
+    Integer key for every cell
+    """
+    n_cells: np.ndarray
+    keys: np.ndarray
+    outside: np.ndarray
+
+    n_cells = coordinate_index['n_cells']
+    keys = (micrograph_index * n_cells[1] + cells[:, 1]) * n_cells[0] + cells[:, 0]
+    outside = (cells < 0).any(axis=1) | (cells >= n_cells).any(axis=1)
+    keys[outside] = -1
+    return keys
+
+
+def create_coordinate_index(
+        coordinates: np.ndarray,
+        cell_size: float,
+        micrograph_index: typing.Optional[np.ndarray]=None
+    ) -> typing.Dict[str, np.ndarray]:
+    """
+    Create a uniform grid index for the coordinates of every micrograph.
+    Queries are limited to distances smaller or equal to the cell size.
+
+    Arguments:
+    coordinates - Coordinates of shape (n_particles, 2)
+    cell_size - Edge length of a grid cell in pixel
+    micrograph_index - Micrograph number for every particle (default all in one micrograph)
+
+    Returns:
+    Dictionary containing the grid information and the sorted cell keys
+    """
+    coordinate_index: typing.Dict[str, np.ndarray]
+    cells: np.ndarray
+    keys: np.ndarray
+    order: np.ndarray
+
+    assert cell_size > 0, cell_size
+
+    coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+    if micrograph_index is None:
+        micrograph_index = np.zeros(len(coordinates), dtype=np.int64)
+    micrograph_index = np.asarray(micrograph_index, dtype=np.int64)
+    assert len(micrograph_index) == len(coordinates)
+
+    coordinate_index = {
+        'coordinates': coordinates,
+        'micrograph_index': micrograph_index,
+        'cell_size': np.array(float(cell_size)),
+        }
+    if len(coordinates) == 0:
+        coordinate_index['origin'] = np.zeros(2, dtype=np.int64)
+        coordinate_index['n_cells'] = np.ones(2, dtype=np.int64)
+    else:
+        cells = np.floor(coordinates / cell_size).astype(np.int64)
+        coordinate_index['origin'] = cells.min(axis=0)
+        coordinate_index['n_cells'] = cells.max(axis=0) - coordinate_index['origin'] + 1
+
+    cells = np.floor(coordinates / cell_size).astype(np.int64) - coordinate_index['origin']
+    keys = get_cell_keys(coordinate_index, cells, micrograph_index)
+    order = np.argsort(keys, kind='stable')
+    coordinate_index['keys'] = keys[order]
+    coordinate_index['order'] = order
+    return coordinate_index
+
+
+def query_radius(
+        coordinate_index: typing.Dict[str, np.ndarray],
+        coordinates: np.ndarray,
+        radius: float,
+        micrograph_index: typing.Optional[np.ndarray]=None
+    ) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the indexed particles within the inclusive radius of the query coordinates.
+    Only particles of the same micrograph are reported.
+
+    Arguments:
+    coordinate_index - Index created by create_coordinate_index
+    coordinates - Query coordinates of shape (n_queries, 2)
+    radius - Search radius in pixel, needs to be smaller or equal to the cell size
+    micrograph_index - Micrograph number for every query (default all in micrograph 0)
+
+    Returns:
+    Query position and indexed particle position for every pair within the radius
+    """
+    query_cells: np.ndarray
+    keys: np.ndarray
+    starts: np.ndarray
+    counts: np.ndarray
+    query_list: typing.List[np.ndarray]
+    target_list: typing.List[np.ndarray]
+    query_positions: np.ndarray
+    target_positions: np.ndarray
+
+    assert 0 <= radius <= coordinate_index['cell_size'], radius
+
+    coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+    if micrograph_index is None:
+        micrograph_index = np.zeros(len(coordinates), dtype=np.int64)
+    micrograph_index = np.asarray(micrograph_index, dtype=np.int64)
+
+    query_cells = np.floor(
+        coordinates / coordinate_index['cell_size']
+        ).astype(np.int64) - coordinate_index['origin']
+
+    query_list = []
+    target_list = []
+    for offset_x in (-1, 0, 1):
+        for offset_y in (-1, 0, 1):
+            keys = get_cell_keys(
+                coordinate_index,
+                query_cells + np.array([offset_x, offset_y]),
+                micrograph_index
+                )
+            starts = np.searchsorted(coordinate_index['keys'], keys, side='left')
+            counts = np.searchsorted(coordinate_index['keys'], keys, side='right') - starts
+            counts[keys == -1] = 0
+
+            query_positions = np.repeat(np.arange(len(coordinates)), counts)
+            target_positions = np.repeat(starts - np.cumsum(counts) + counts, counts)
+            query_list.append(query_positions)
+            target_list.append(
+                coordinate_index['order'][np.arange(counts.sum()) + target_positions]
+                )
+
+    query_positions = np.concatenate(query_list)
+    target_positions = np.concatenate(target_list)
+    mask = np.hypot(
+        *(coordinates[query_positions] - coordinate_index['coordinates'][target_positions]).T
+        ) <= radius
+    return query_positions[mask], target_positions[mask]
+
+
+def query_nearest(
+        coordinate_index: typing.Dict[str, np.ndarray],
+        coordinates: typing.Optional[np.ndarray]=None,
+        micrograph_index: typing.Optional[np.ndarray]=None,
+        max_distance: typing.Optional[float]=None
+    ) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the nearest indexed particle for every query coordinate.
+    Without query coordinates the indexed particles are used,
+    but a particle is not its own neighbour.
+
+    Arguments:
+    coordinate_index - Index created by create_coordinate_index
+    coordinates - Query coordinates of shape (n_queries, 2) (default indexed coordinates)
+    micrograph_index - Micrograph number for every query (default all in micrograph 0)
+    max_distance - Maximum search distance in pixel (default cell size)
+
+    Returns:
+    Nearest particle position (-1 if none is found), distance (inf if none is found)
+    """
+    query_positions: np.ndarray
+    target_positions: np.ndarray
+    distance: np.ndarray
+    nearest: np.ndarray
+    nearest_distance: np.ndarray
+    order: np.ndarray
+    first: np.ndarray
+
+    if max_distance is None:
+        max_distance = float(coordinate_index['cell_size'])
+
+    if coordinates is None:
+        coordinates = coordinate_index['coordinates']
+        micrograph_index = coordinate_index['micrograph_index']
+        query_positions, target_positions = query_radius(
+            coordinate_index, coordinates, max_distance, micrograph_index
+            )
+        mask = query_positions != target_positions
+        query_positions = query_positions[mask]
+        target_positions = target_positions[mask]
+    else:
+        query_positions, target_positions = query_radius(
+            coordinate_index, coordinates, max_distance, micrograph_index
+            )
+
+    nearest = np.full(len(coordinates), -1, dtype=np.int64)
+    nearest_distance = np.full(len(coordinates), np.inf)
+
+    distance = np.hypot(
+        *(np.asarray(coordinates, dtype=float)[query_positions] -
+          coordinate_index['coordinates'][target_positions]).T
+        )
+    order = np.lexsort((target_positions, distance, query_positions))
+    query_positions = query_positions[order]
+    first = np.ones(len(query_positions), dtype=bool)
+    first[1:] = query_positions[1:] != query_positions[:-1]
+
+    nearest[query_positions[first]] = target_positions[order][first]
+    nearest_distance[query_positions[first]] = distance[order][first]
+    return nearest, nearest_distance
+
+
+def remove_exact_duplicates(
+        coordinates: np.ndarray,
+        micrograph_index: typing.Optional[np.ndarray]=None
+    ) -> np.ndarray:
+    """
+    Remove particles with the same coordinates as an earlier particle of the same micrograph.
+
+    Arguments:
+    coordinates - Coordinates of shape (n_particles, 2)
+    micrograph_index - Micrograph number for every particle (default all in one micrograph)
+
+    Returns:
+    Boolean mask of the particles to keep
+    """
+    keys: np.ndarray
+    keep: np.ndarray
+
+    coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+    keys = np.empty((len(coordinates), 3), dtype=float)
+    keys[:, 0] = 0 if micrograph_index is None else micrograph_index
+    keys[:, 1:] = coordinates
+
+    keep = np.zeros(len(keys), dtype=bool)
+    keep[np.unique(keys, axis=0, return_index=True)[1]] = True
+    return keep
+
+
+def remove_duplicates(
+        coordinates: np.ndarray,
+        distance: float,
+        micrograph_index: typing.Optional[np.ndarray]=None
+    ) -> np.ndarray:
+    """
+    Remove particles that are within the inclusive distance of an earlier kept particle
+    of the same micrograph.
+    The input order is the priority, e.g. sort by confidence first.
+
+    Arguments:
+    coordinates - Coordinates of shape (n_particles, 2)
+    distance - Minimum distance between two particles in pixel
+    micrograph_index - Micrograph number for every particle (default all in one micrograph)
+
+    Returns:
+    Boolean mask of the particles to keep
+    """
+    coordinate_index: typing.Dict[str, np.ndarray]
+    query_positions: np.ndarray
+    target_positions: np.ndarray
+    keep: np.ndarray
+    order: np.ndarray
+    starts: np.ndarray
+    stops: np.ndarray
+    candidates: np.ndarray
+
+    assert distance >= 0, distance
+    if distance == 0:
+        return remove_exact_duplicates(coordinates, micrograph_index)
+
+    coordinate_index = create_coordinate_index(coordinates, float(distance), micrograph_index)
+    query_positions, target_positions = query_radius(
+        coordinate_index,
+        coordinate_index['coordinates'],
+        distance,
+        coordinate_index['micrograph_index']
+        )
+
+    mask = target_positions < query_positions
+    query_positions = query_positions[mask]
+    target_positions = target_positions[mask]
+    order = np.argsort(query_positions, kind='stable')
+    query_positions = query_positions[order]
+    target_positions = target_positions[order]
+
+    keep = np.ones(len(coordinate_index['coordinates']), dtype=bool)
+    candidates, starts = np.unique(query_positions, return_index=True)
+    stops = np.append(starts[1:], len(query_positions))
+    for position, start, stop in zip(candidates, starts, stops):
+        if keep[target_positions[start:stop]].any():
+            keep[position] = False
+    return keep
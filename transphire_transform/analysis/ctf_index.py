@@ -0,0 +1,188 @@
+"""
+MIT License
+
+Copyright (c) 2018 Max Planck Institute of Molecular Physiology
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import typing
+
+import numpy as np # type: ignore
+import pandas as pd # type: ignore
+
+from ..dump_load import cter
+from ..dump_load import star
+
+
+def get_ctf_index_column_names() -> typing.List[str]:
+    """
+    Returns the default column names that are indexed.
+
+    Arguments:
+    None
+
+    Returns:
+    List of names
+    """
+    return [
+        'CtfMaxResolution',
+        'Defocus',
+        'Astigmatism',
+        'CtfFigureOfMerit',
+        ]
+
+
+def add_defocus_columns(ctf_data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add the mean defocus and the astigmatism amplitude based on DefocusU and DefocusV.
+
+    Arguments:
+    ctf_data - Pandas data frame containing ctf information
+
+    Returns:
+    Pandas data frame containing the additional Defocus and Astigmatism columns
+    """
+    output_data: pd.DataFrame
+
+    output_data = ctf_data.copy(deep=False)
+    output_data['Defocus'] = (ctf_data['DefocusU'] + ctf_data['DefocusV']) / 2
+    output_data['Astigmatism'] = (ctf_data['DefocusV'] - ctf_data['DefocusU']).abs()
+    return output_data
+
+
+def create_ctf_index(
+        ctf_data: pd.DataFrame,
+        column_names: typing.Optional[typing.List[str]]=None
+    ) -> typing.Dict[str, typing.Tuple[np.ndarray, np.ndarray]]:
+    """
+    Create a sorted index for every column name.
+    Defocus and Astigmatism are calculated from DefocusU and DefocusV if requested.
+
+    Arguments:
+    ctf_data - Pandas data frame containing ctf information
+    column_names - Columns to index (default get_ctf_index_column_names)
+
+    Returns:
+    Dictionary with the column name as key and the sorted values and row positions as value
+    """
+    ctf_index: typing.Dict[str, typing.Tuple[np.ndarray, np.ndarray]]
+    index_data: pd.DataFrame
+    values: np.ndarray
+    order: np.ndarray
+
+    if column_names is None:
+        column_names = get_ctf_index_column_names()
+
+    index_data = ctf_data
+    if 'Defocus' in column_names or 'Astigmatism' in column_names:
+        index_data = add_defocus_columns(ctf_data)
+
+    ctf_index = {}
+    for name in column_names:
+        values = np.asarray(index_data[name], dtype=float)
+        order = np.argsort(values, kind='stable')
+        ctf_index[name] = (values[order], order)
+
+    return ctf_index
+
+
+def query_ctf_index(
+        ctf_index: typing.Dict[str, typing.Tuple[np.ndarray, np.ndarray]],
+        ranges: typing.Dict[str, typing.Tuple[typing.Optional[float], typing.Optional[float]]]
+    ) -> np.ndarray:
+    """
+    Select the rows that are inside all of the inclusive ranges.
+    A bound of None is open, NaN values are never selected.
+
+    Arguments:
+    ctf_index - Index created by create_ctf_index
+    ranges - Dictionary with the column name as key and (minimum, maximum) as value
+
+    Returns:
+    Boolean mask of the selected rows
+    """
+    mask: np.ndarray
+    column_mask: np.ndarray
+    sorted_values: np.ndarray
+    order: np.ndarray
+    start: int
+    stop: int
+
+    if not ctf_index:
+        raise IOError('Cannot query an empty ctf index')
+
+    mask = np.ones(len(next(iter(ctf_index.values()))[1]), dtype=bool)
+    for name, (minimum, maximum) in ranges.items():
+        sorted_values, order = ctf_index[name]
+        start = int(np.searchsorted(
+            sorted_values,
+            -np.inf if minimum is None else minimum,
+            side='left'
+            ))
+        stop = int(np.searchsorted(
+            sorted_values,
+            np.inf if maximum is None else maximum,
+            side='right'
+            ))
+        column_mask = np.zeros(mask.shape, dtype=bool)
+        column_mask[order[start:stop]] = True
+        mask &= column_mask
+
+    return mask
+
+
+def dump_ctf_selection(
+        file_name: str,
+        ctf_data: pd.DataFrame,
+        mask: np.ndarray,
+        file_format: str,
+        version: typing.Optional[str]=None
+    ) -> None:
+    """
+    Dump the selected rows of the ctf data to a star or cter partres file.
+
+    Arguments:
+    file_name - Path to the output file
+    ctf_data - Pandas data frame containing ctf information
+    mask - Boolean mask of the selected rows
+    file_format - Output file format: star or cter
+    version - Output file version, default relion_3 for star and the latest version for cter
+
+    Returns:
+    None
+    """
+    function_dict: typing.Dict[
+        str,
+        typing.Callable[..., None]
+        ]
+
+    function_dict = {
+        'star': star.dump_star,
+        'cter': cter.dump_cter,
+        }
+
+    if file_format not in function_dict:
+        raise IOError(
+            f'Unknown file format {file_format}, choose from: {", ".join(sorted(function_dict))}'
+            )
+    if file_format == 'star' and version is None:
+        version = 'relion_3'
+
+    function_dict[file_format](file_name, ctf_data[mask].reset_index(drop=True), version)
@@ -0,0 +1,87 @@
+"""
+MIT License
+
+Copyright (c) 2018 Max Planck Institute of Molecular Physiology
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import typing
+
+import numpy as np # type: ignore
+import pandas as pd # type: ignore
+
+
+def calculate_frame_drift(trajectories: np.ndarray, scale: float=1.0) -> np.ndarray:
+    """
+    Calculate the drift between consecutive frames.
+    Steps that involve padded nan frames are set to 0.
+
+    Arguments:
+    trajectories - Array of shape (n_movies, n_frames, 2) containing the shifts
+    scale - Factor the shifts are multiplied with, e.g. the pixel size to convert pixel to A
+
+    Returns:
+    Array of shape (n_movies, n_frames - 1) containing the drift per frame
+    """
+    difference: np.ndarray
+    frame_drift: np.ndarray
+
+    difference = np.diff(trajectories, axis=1)
+    frame_drift = np.hypot(difference[..., 0], difference[..., 1])
+    frame_drift[np.isnan(frame_drift)] = 0
+    if scale != 1.0:
+        frame_drift *= scale
+    return frame_drift
+
+
+def calculate_drift_statistics(
+        trajectories: np.ndarray,
+        n_frames: typing.Optional[np.ndarray]=None,
+        scale: float=1.0,
+        early_frames: int=3
+    ) -> pd.DataFrame:
+    """
+    Calculate the drift statistics for every movie in a single call.
+
+    Arguments:
+    trajectories - Array of shape (n_movies, n_frames, 2) containing the shifts
+    n_frames - Number of valid frames per movie (default all non nan frames)
+    scale - Factor the shifts are multiplied with, e.g. the pixel size to convert pixel to A
+    early_frames - Number of frame steps that count as early drift (default 3)
+
+    Returns:
+    Pandas data frame containing the total, per frame, early and maximum drift per movie
+    """
+    frame_drift: np.ndarray
+    n_steps: np.ndarray
+    output_data: pd.DataFrame
+
+    frame_drift = calculate_frame_drift(trajectories, scale)
+    if n_frames is None:
+        n_frames = np.count_nonzero(~np.isnan(trajectories[..., 0]), axis=1)
+    n_steps = np.maximum(np.asarray(n_frames) - 1, 1)
+
+    output_data = pd.DataFrame({
+        'drift_total': frame_drift.sum(axis=1),
+        'drift_early': frame_drift[:, :early_frames].sum(axis=1),
+        'drift_max_jump': frame_drift.max(axis=1, initial=0),
+        })
+    output_data['drift_per_frame'] = output_data['drift_total'] / n_steps
+    return output_data[['drift_total', 'drift_per_frame', 'drift_early', 'drift_max_jump']]
@@ -0,0 +1,275 @@
+"""
+MIT License
+
+Copyright (c) 2018 Max Planck Institute of Molecular Physiology
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import functools
+import os
+import typing
+
+import numpy as np # type: ignore
+import pandas as pd # type: ignore
+
+from ..dump_load import star
+from ..dump_load import xml
+
+
+def sort_group_labels(labels: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    """
+    Renumber the group labels by the sorted group centers, starting at 1.
+
+    Arguments:
+    labels - Group label of every entry
+    centers - Center of every group of shape (n_groups, 2)
+
+    Returns:
+    Group label of every entry starting at 1
+    """
+    order: np.ndarray
+    new_labels: np.ndarray
+
+    order = np.lexsort((centers[:, 1], centers[:, 0]))
+    new_labels = np.empty(len(order), dtype=np.int64)
+    new_labels[order] = np.arange(1, len(order) + 1)
+    return new_labels[labels]
+
+
+def cluster_finite_shifts(
+        shifts: np.ndarray,
+        function: typing.Callable[[np.ndarray], np.ndarray]
+    ) -> np.ndarray:
+    """
+    Apply the clustering function to the finite shifts only.
+    Micrographs with a missing shift are put in an additional last group.
+
+    Arguments:
+    shifts - Beam or image shifts of shape (n_micrographs, 2)
+    function - Clustering function returning group labels starting at 1
+
+    Returns:
+    Group label of every micrograph starting at 1
+    """
+    finite: np.ndarray
+    labels: np.ndarray
+
+    shifts = np.asarray(shifts, dtype=float).reshape(-1, 2)
+    finite = np.isfinite(shifts).all(axis=1)
+
+    labels = np.ones(len(shifts), dtype=np.int64)
+    if finite.any():
+        labels[finite] = function(shifts[finite])
+        labels[~finite] = labels[finite].max() + 1
+    return labels
+
+
+def cluster_shifts_grid(shifts: np.ndarray, bin_size: float) -> np.ndarray:
+    """
+    Assign the shifts to groups by binning them on a regular grid.
+    Only occupied grid cells become groups.
+    Micrographs with a missing shift are put in an additional last group.
+
+    Arguments:
+    shifts - Beam or image shifts of shape (n_micrographs, 2)
+    bin_size - Edge length of a grid cell
+
+    Returns:
+    Group label of every micrograph starting at 1
+    """
+    assert bin_size > 0, bin_size
+    return cluster_finite_shifts(
+        shifts,
+        functools.partial(grid_labels, bin_size=bin_size)
+        )
+
+
+def grid_labels(shifts: np.ndarray, bin_size: float) -> np.ndarray:
+    """
+    Grid binning of finite shifts, see cluster_shifts_grid.
+
+    Arguments:
+    shifts - Finite beam or image shifts of shape (n_micrographs, 2)
+    bin_size - Edge length of a grid cell
+
+    Returns:
+    Group label of every micrograph starting at 1
+    """
+    cells: np.ndarray
+    unique_cells: np.ndarray
+    labels: np.ndarray
+
+    cells = np.floor(shifts / bin_size).astype(np.int64)
+    unique_cells, labels = np.unique(cells, axis=0, return_inverse=True)
+    return sort_group_labels(labels.ravel(), unique_cells)
+
+
+def cluster_shifts_kmeans(
+        shifts: np.ndarray,
+        n_groups: int,
+        max_iterations: int=100
+    ) -> np.ndarray:
+    """
+    Assign the shifts to groups with k-means clustering.
+    The centers are initialised with the shift closest to the mean followed by
+    the shifts farthest away from the existing centers, so the result is reproducible.
+    Groups that end up empty, e.g. for duplicated shifts, are dropped and there are at most
+    as many groups as finite shifts, so there can be less than n_groups groups.
+    Micrographs with a missing shift are put in an additional last group.
+
+    Arguments:
+    shifts - Beam or image shifts of shape (n_micrographs, 2)
+    n_groups - Number of groups
+    max_iterations - Maximum number of iterations (default 100)
+
+    Returns:
+    Group label of every micrograph starting at 1
+    """
+    assert n_groups > 0, n_groups
+    return cluster_finite_shifts(
+        shifts,
+        functools.partial(kmeans_labels, n_groups=n_groups, max_iterations=max_iterations)
+        )
+
+
+def kmeans_labels(
+        shifts: np.ndarray,
+        n_groups: int,
+        max_iterations: int
+    ) -> np.ndarray:
+    """
+    K-means clustering of finite shifts, see cluster_shifts_kmeans.
+
+    Arguments:
+    shifts - Finite beam or image shifts of shape (n_micrographs, 2)
+    n_groups - Maximum number of groups
+    max_iterations - Maximum number of iterations
+
+    Returns:
+    Group label of every micrograph starting at 1
+    """
+    centers: np.ndarray
+    distance: np.ndarray
+    labels: np.ndarray
+    new_labels: np.ndarray
+    counts: np.ndarray
+    used_groups: np.ndarray
+
+    n_groups = min(n_groups, len(shifts))
+
+    distance = ((shifts - shifts.mean(axis=0))**2).sum(axis=1)
+    centers = shifts[[distance.argmin()]]
+    distance = ((shifts - centers[0])**2).sum(axis=1)
+    for _ in range(1, n_groups):
+        centers = np.concatenate([centers, shifts[[distance.argmax()]]])
+        distance = np.minimum(distance, ((shifts - centers[-1])**2).sum(axis=1))
+
+    labels = np.full(len(shifts), -1, dtype=np.int64)
+    for _ in range(max_iterations):
+        distance = (centers**2).sum(axis=1) - 2 * shifts @ centers.T
+        new_labels = distance.argmin(axis=1)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+
+        counts = np.bincount(labels, minlength=n_groups)
+        for axis in range(2):
+            centers[counts > 0, axis] = (
+                np.bincount(labels, weights=shifts[:, axis], minlength=n_groups)[counts > 0] /
+                counts[counts > 0]
+                )
+
+    used_groups = np.unique(labels)
+    return sort_group_labels(np.searchsorted(used_groups, labels), centers[used_groups])
+
+
+def create_micrograph_star_data(
+        xml_data: pd.DataFrame,
+        optics_groups: np.ndarray,
+        movie_extension: str='.mrc'
+    ) -> pd.DataFrame:
+    """
+    Convert typed EPU xml data to relion micrograph star data.
+    The optics group is stored as BeamTiltClass and BeamTiltGroupName,
+    which relion 3.0 uses to group micrographs.
+
+    Arguments:
+    xml_data - Pandas data frame created by xml.load_xml_many
+    optics_groups - Optics group of every micrograph starting at 1
+    movie_extension - Extension that replaces the xml extension for the movie name (default .mrc)
+
+    Returns:
+    Pandas data frame containing the star information
+    """
+    star_data: pd.DataFrame
+
+    star_data = pd.DataFrame({
+        'MicrographMovieName': [
+            f'{os.path.splitext(file_name)[0]}{movie_extension}'
+            for file_name in xml_data['file_name']
+            ],
+        })
+    if 'AccelerationVoltage' in xml_data:
+        star_data['Voltage'] = xml_data['AccelerationVoltage'].values / 1000
+    if 'pixelSize_x' in xml_data:
+        star_data['PixelSize'] = xml_data['pixelSize_x'].values * 1e10
+    star_data['BeamTiltClass'] = optics_groups
+    star_data['BeamTiltGroupName'] = [f'optics_group_{group}' for group in optics_groups]
+    return star_data
+
+
+def epu_to_star(
+        file_names: typing.List[str],
+        output_file: str,
+        star_version: str,
+        n_groups: int=1,
+        n_workers: int=1
+    ) -> pd.DataFrame:
+    """
+    Convert EPU xml files to a relion micrograph star file with optics groups.
+    The optics groups are found by k-means clustering of the beam shift.
+    Micrographs without a beam shift are put in an additional last group and
+    all micrographs are put in a single group if no file contains a beam shift.
+
+    Arguments:
+    file_names - Paths to the EPU xml files
+    output_file - Path to the output star file
+    star_version - Output star file version
+    n_groups - Number of optics groups (default 1)
+    n_workers - Number of parallel workers to read the xml files (default 1)
+
+    Returns:
+    Pandas data frame containing the star information
+    """
+    xml_data: pd.DataFrame
+    star_data: pd.DataFrame
+    labels: np.ndarray
+
+    if not file_names:
+        raise IOError('Cannot convert xml files from empty sequence')
+
+    xml_data = xml.load_xml_many(file_names, n_workers=n_workers)
+    if 'BeamShift_x' in xml_data and 'BeamShift_y' in xml_data:
+        labels = cluster_shifts_kmeans(xml_data[['BeamShift_x', 'BeamShift_y']].values, n_groups)
+    else:
+        labels = np.ones(len(xml_data), dtype=np.int64)
+    star_data = create_micrograph_star_data(xml_data, labels)
+    star.dump_star(output_file, star_data, star_version)
+    return star_data
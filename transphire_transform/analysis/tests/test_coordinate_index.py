@@ -0,0 +1,148 @@
+"""
+MIT License
+
+Copyright (c) 2018 Max Planck Institute of Molecular Physiology
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from .. import coordinate_index
+
+
+@pytest.fixture('module')
+def random_coordinates():
+    generator = np.random.RandomState(0)
+    coordinates = generator.uniform(0, 1000, size=(500, 2))
+    micrograph_index = generator.randint(0, 3, size=500)
+    return coordinates, micrograph_index
+
+
+def brute_force_pairs(coordinates, micrograph_index, radius):
+    distance = np.hypot(*(coordinates[:, None] - coordinates[None, :]).T).T
+    same = micrograph_index[:, None] == micrograph_index[None, :]
+    return set(zip(*np.nonzero((distance <= radius) & same)))
+
+
+class TestGetCoordinateArrays:
+
+    def test_micrograph_name_should_be_factorized(self):
+        data = pd.DataFrame({
+            'CoordinateX': [1, 2, 3],
+            'CoordinateY': [4, 5, 6],
+            'MicrographName': ['b.mrc', 'a.mrc', 'b.mrc'],
+            })
+        coordinates, micrograph_index = coordinate_index.get_coordinate_arrays(data, 'MicrographName')
+        assert coordinates.tolist() == [[1, 4], [2, 5], [3, 6]]
+        assert micrograph_index.tolist() == [0, 1, 0]
+
+    def test_no_micrograph_name_should_return_zeros(self):
+        data = pd.DataFrame({'CoordinateX': [1, 2], 'CoordinateY': [4, 5]})
+        _, micrograph_index = coordinate_index.get_coordinate_arrays(data)
+        assert micrograph_index.tolist() == [0, 0]
+
+
+class TestQueryRadius:
+
+    def test_pairs_should_match_brute_force(self, random_coordinates):
+        coordinates, micrograph_index = random_coordinates
+        index = coordinate_index.create_coordinate_index(coordinates, 50, micrograph_index)
+        query, target = coordinate_index.query_radius(index, coordinates, 50, micrograph_index)
+        assert set(zip(query, target)) == brute_force_pairs(coordinates, micrograph_index, 50)
+        assert len(query) == len(set(zip(query, target)))
+
+    def test_radius_smaller_cell_should_match_brute_force(self, random_coordinates):
+        coordinates, micrograph_index = random_coordinates
+        index = coordinate_index.create_coordinate_index(coordinates, 50, micrograph_index)
+        query, target = coordinate_index.query_radius(index, coordinates, 20, micrograph_index)
+        assert set(zip(query, target)) == brute_force_pairs(coordinates, micrograph_index, 20)
+
+    def test_query_outside_grid_should_return_empty(self, random_coordinates):
+        coordinates, micrograph_index = random_coordinates
+        index = coordinate_index.create_coordinate_index(coordinates, 50, micrograph_index)
+        query, target = coordinate_index.query_radius(index, [[-500, -500]], 50)
+        assert query.size == 0
+        assert target.size == 0
+
+    def test_radius_larger_cell_should_raise_assertionerror(self, random_coordinates):
+        coordinates, _ = random_coordinates
+        index = coordinate_index.create_coordinate_index(coordinates, 50)
+        with pytest.raises(AssertionError):
+            coordinate_index.query_radius(index, coordinates, 60)
+
+    def test_empty_index_should_return_empty(self):
+        index = coordinate_index.create_coordinate_index(np.empty((0, 2)), 50)
+        query, _ = coordinate_index.query_radius(index, [[0, 0]], 50)
+        assert query.size == 0
+
+
+class TestQueryNearest:
+
+    def test_self_query_should_match_brute_force(self, random_coordinates):
+        coordinates, micrograph_index = random_coordinates
+        index = coordinate_index.create_coordinate_index(coordinates, 100, micrograph_index)
+        nearest, distance = coordinate_index.query_nearest(index)
+        all_distance = np.hypot(*(coordinates[:, None] - coordinates[None, :]).T).T
+        all_distance[micrograph_index[:, None] != micrograph_index[None, :]] = np.inf
+        np.fill_diagonal(all_distance, np.inf)
+        expected = all_distance.min(axis=1)
+        assert np.allclose(distance, np.where(expected <= 100, expected, np.inf))
+        assert np.array_equal(nearest >= 0, expected <= 100)
+
+    def test_query_should_return_closest(self):
+        index = coordinate_index.create_coordinate_index([[0, 0], [10, 0], [30, 0]], 20)
+        nearest, distance = coordinate_index.query_nearest(index, [[12, 0], [100, 0]])
+        assert nearest.tolist() == [1, -1]
+        assert distance.tolist() == [2, np.inf]
+
+
+class TestRemoveDuplicates:
+
+    def test_later_close_particle_should_be_removed(self):
+        keep = coordinate_index.remove_duplicates([[0, 0], [5, 0], [20, 0]], 10)
+        assert keep.tolist() == [True, False, True]
+
+    def test_chain_should_keep_particle_of_removed_neighbour(self):
+        keep = coordinate_index.remove_duplicates([[0, 0], [8, 0], [16, 0]], 10)
+        assert keep.tolist() == [True, False, True]
+
+    def test_other_micrograph_should_be_kept(self):
+        keep = coordinate_index.remove_duplicates([[0, 0], [5, 0]], 10, [0, 1])
+        assert keep.tolist() == [True, True]
+
+    def test_kept_particles_should_respect_distance(self, random_coordinates):
+        coordinates, micrograph_index = random_coordinates
+        keep = coordinate_index.remove_duplicates(coordinates, 30, micrograph_index)
+        pairs = brute_force_pairs(coordinates[keep], micrograph_index[keep], 30)
+        assert all(first == second for first, second in pairs)
+        assert 0 < keep.sum() < len(keep)
+
+    def test_zero_distance_should_remove_exact_duplicates(self):
+        with np.errstate(all='raise'):
+            keep = coordinate_index.remove_duplicates(
+                [[0, 0], [0, 0], [0.5, 0], [0, 0]], 0, [0, 0, 0, 1]
+                )
+        assert keep.tolist() == [True, False, True, True]
+
+    def test_zero_distance_empty_should_return_empty(self):
+        keep = coordinate_index.remove_duplicates(np.empty((0, 2)), 0)
+        assert keep.tolist() == []
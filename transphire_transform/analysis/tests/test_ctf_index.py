@@ -0,0 +1,155 @@
+"""
+MIT License
+
+Copyright (c) 2018 Max Planck Institute of Molecular Physiology
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from .. import ctf_index
+from ...dump_load import star
+
+THIS_DIR = os.path.dirname(os.path.realpath(__file__))
+OUTPUT_TEST_FOLDER = 'OUTPUT_TESTS_CTF_INDEX'
+INPUT_TEST_FOLDER = '../../../test_files'
+
+
+@pytest.fixture('module')
+def ctf_data():
+    return pd.DataFrame({
+        'DefocusU': [10000, 20000, 15000, 30000, 25000],
+        'DefocusV': [11000, 20500, 15000, 33000, 25200],
+        'CtfMaxResolution': [3.5, 4.0, np.nan, 8.0, 2.9],
+        'CtfFigureOfMerit': [0.2, 0.1, 0.15, 0.05, 0.3],
+        'MicrographNameNoDW': ['a.mrc', 'b.mrc', 'c.mrc', 'd.mrc', 'e.mrc'],
+        })
+
+
+class TestAddDefocusColumns:
+
+    def test_defocus_should_be_mean(self, ctf_data):
+        data = ctf_index.add_defocus_columns(ctf_data)
+        assert data['Defocus'].tolist() == [10500, 20250, 15000, 31500, 25100]
+
+    def test_astigmatism_should_be_absolute_difference(self, ctf_data):
+        data = ctf_index.add_defocus_columns(ctf_data)
+        assert data['Astigmatism'].tolist() == [1000, 500, 0, 3000, 200]
+
+    def test_input_should_not_be_modified(self, ctf_data):
+        ctf_index.add_defocus_columns(ctf_data)
+        assert 'Defocus' not in ctf_data
+
+
+class TestCreateCtfIndex:
+
+    def test_default_columns_should_be_indexed(self, ctf_data):
+        index = ctf_index.create_ctf_index(ctf_data)
+        assert sorted(index) == sorted(ctf_index.get_ctf_index_column_names())
+
+    def test_values_should_be_sorted(self, ctf_data):
+        index = ctf_index.create_ctf_index(ctf_data, ['CtfFigureOfMerit'])
+        sorted_values, order = index['CtfFigureOfMerit']
+        assert sorted_values.tolist() == [0.05, 0.1, 0.15, 0.2, 0.3]
+        assert order.tolist() == [3, 1, 2, 0, 4]
+
+
+class TestQueryCtfIndex:
+
+    def test_single_range_should_return_mask(self, ctf_data):
+        index = ctf_index.create_ctf_index(ctf_data)
+        mask = ctf_index.query_ctf_index(index, {'CtfMaxResolution': (None, 4.0)})
+        assert mask.tolist() == [True, True, False, False, True]
+
+    def test_range_should_be_inclusive(self, ctf_data):
+        index = ctf_index.create_ctf_index(ctf_data)
+        mask = ctf_index.query_ctf_index(index, {'Defocus': (15000, 25100)})
+        assert mask.tolist() == [False, True, True, False, True]
+
+    def test_open_range_should_not_select_nan(self, ctf_data):
+        index = ctf_index.create_ctf_index(ctf_data)
+        mask = ctf_index.query_ctf_index(index, {'CtfMaxResolution': (None, None)})
+        assert mask.tolist() == [True, True, False, True, True]
+
+    def test_multiple_ranges_should_intersect(self, ctf_data):
+        index = ctf_index.create_ctf_index(ctf_data)
+        mask = ctf_index.query_ctf_index(
+            index,
+            {
+                'CtfMaxResolution': (None, 4.0),
+                'Astigmatism': (None, 600),
+                'CtfFigureOfMerit': (0.1, None),
+                }
+            )
+        assert mask.tolist() == [False, True, False, False, True]
+
+    def test_empty_ranges_should_select_all(self, ctf_data):
+        index = ctf_index.create_ctf_index(ctf_data)
+        mask = ctf_index.query_ctf_index(index, {})
+        assert mask.all()
+
+    def test_unknown_column_should_raise_keyerror(self, ctf_data):
+        index = ctf_index.create_ctf_index(ctf_data)
+        with pytest.raises(KeyError):
+            ctf_index.query_ctf_index(index, {'PhaseShift': (0, 10)})
+
+    def test_empty_index_should_raise_ioerror(self):
+        with pytest.raises(IOError):
+            ctf_index.query_ctf_index({}, {})
+
+
+class TestDumpCtfSelection:
+
+    def test_star_should_contain_selection(self, tmpdir, ctf_data):
+        output_file = str(tmpdir.mkdir(OUTPUT_TEST_FOLDER).join('selection.star'))
+        mask = np.array([True, False, False, True, False])
+        ctf_index.dump_ctf_selection(output_file, ctf_data, mask, 'star', 'relion_3')
+        assert star.load_star(output_file)['MicrographNameNoDW'].tolist() == ['a.mrc', 'd.mrc']
+
+    def test_cter_should_contain_selection(self, tmpdir, ctf_data):
+        output_file = str(tmpdir.mkdir(OUTPUT_TEST_FOLDER).join('selection.txt'))
+        data = ctf_data.assign(
+            PixelSize=1.0,
+            AmplitudeContrast=0.1,
+            PhaseShift=0.0,
+            Voltage=300.0,
+            SphericalAberration=2.7,
+            )
+        mask = np.array([False, True, False, True, True])
+        ctf_index.dump_ctf_selection(output_file, data, mask, 'cter')
+        with open(output_file, 'r') as read:
+            lines = read.readlines()
+        assert [line.split()[-1] for line in lines] == ['b.mrc', 'd.mrc', 'e.mrc']
+
+    def test_star_without_version_should_write_relion_3(self, tmpdir, ctf_data):
+        output_file = str(tmpdir.mkdir(OUTPUT_TEST_FOLDER).join('selection.star'))
+        mask = np.array([True, False, False, True, False])
+        ctf_index.dump_ctf_selection(output_file, ctf_data, mask, 'star')
+        assert star.load_star(output_file)['MicrographNameNoDW'].tolist() == ['a.mrc', 'd.mrc']
+
+    def test_unknown_format_should_raise_ioerror(self, tmpdir, ctf_data):
+        output_file = str(tmpdir.mkdir(OUTPUT_TEST_FOLDER).join('selection.txt'))
+        mask = np.ones(len(ctf_data), dtype=bool)
+        with pytest.raises(IOError):
+            ctf_index.dump_ctf_selection(output_file, ctf_data, mask, 'box')
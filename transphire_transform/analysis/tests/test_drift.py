@@ -0,0 +1,82 @@
+"""
+MIT License
+
+Copyright (c) 2018 Max Planck Institute of Molecular Physiology
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import os
+
+import numpy as np
+
+from .. import drift
+from ...dump_load import motioncor2
+
+THIS_DIR = os.path.dirname(os.path.realpath(__file__))
+INPUT_TEST_FOLDER = '../../../test_files'
+
+
+class TestCalculateFrameDrift:
+
+    def test_steps_should_be_euclidean_distance(self):
+        trajectories = np.array([[[0, 0], [3, 4], [3, 4], [0, 0]]], dtype=float)
+        assert drift.calculate_frame_drift(trajectories).tolist() == [[5, 0, 5]]
+
+    def test_padded_frames_should_be_zero(self):
+        trajectories = np.array([[[0, 0], [3, 4], [np.nan, np.nan]]], dtype=float)
+        assert drift.calculate_frame_drift(trajectories).tolist() == [[5, 0]]
+
+    def test_scale_should_be_applied(self):
+        trajectories = np.array([[[0, 0], [3, 4]]], dtype=float)
+        assert drift.calculate_frame_drift(trajectories, scale=2).tolist() == [[10]]
+
+
+class TestCalculateDriftStatistics:
+
+    def test_statistics_should_be_correct(self):
+        trajectories = np.array([
+            [[0, 0], [3, 4], [3, 4], [0, 0]],
+            [[0, 0], [0, 1], [np.nan, np.nan], [np.nan, np.nan]],
+            ], dtype=float)
+        data = drift.calculate_drift_statistics(trajectories, early_frames=1)
+        assert data['drift_total'].tolist() == [10, 1]
+        assert data['drift_per_frame'].tolist() == [10 / 3, 1]
+        assert data['drift_early'].tolist() == [5, 1]
+        assert data['drift_max_jump'].tolist() == [5, 1]
+
+    def test_n_frames_should_be_used(self):
+        trajectories = np.array([[[0, 0], [3, 4], [3, 4], [0, 0]]], dtype=float)
+        data = drift.calculate_drift_statistics(trajectories, n_frames=np.array([6]))
+        assert data['drift_per_frame'].tolist() == [2]
+
+    def test_single_frame_should_return_zero(self):
+        trajectories = np.array([[[0, 0]]], dtype=float)
+        data = drift.calculate_drift_statistics(trajectories)
+        assert data.values.tolist() == [[0, 0, 0, 0]]
+
+    def test_motioncor2_file_should_match_loop(self):
+        input_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'motioncor2_v1_0_0.txt')
+        trajectories, n_frames, _ = motioncor2.load_motioncor2_many([input_file])
+        data = drift.calculate_drift_statistics(trajectories, n_frames, scale=1.14)
+        shifts = motioncor2.load_motioncor2(input_file).values * 1.14
+        steps = [np.linalg.norm(shifts[idx+1] - shifts[idx]) for idx in range(len(shifts) - 1)]
+        assert np.isclose(data['drift_total'][0], sum(steps))
+        assert np.isclose(data['drift_max_jump'][0], max(steps))
+        assert np.isclose(data['drift_early'][0], sum(steps[:3]))
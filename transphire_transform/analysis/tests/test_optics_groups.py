@@ -0,0 +1,174 @@
+"""
+MIT License
+
+Copyright (c) 2018 Max Planck Institute of Molecular Physiology
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import os
+import re
+
+import numpy as np
+import pytest
+
+from .. import optics_groups
+from ...dump_load import star
+
+THIS_DIR = os.path.dirname(os.path.realpath(__file__))
+OUTPUT_TEST_FOLDER = 'OUTPUT_TESTS_OPTICS_GROUPS'
+INPUT_TEST_FOLDER = '../../../test_files'
+
+EPU_FILES = [
+    'xml_1_8_falcon_2.xml',
+    'xml_1_8_k2.xml',
+    'xml_1_9_k2.xml',
+    'xml_1_11_falcon.xml',
+    'xml_1_11_falcon_vpp.xml',
+    ]
+
+
+@pytest.fixture('module')
+def clustered_shifts():
+    generator = np.random.RandomState(0)
+    centers = np.array([[x, y] for x in range(-1, 2) for y in range(-1, 2)], dtype=float)
+    true_labels = generator.randint(0, len(centers), 2000)
+    shifts = centers[true_labels] + generator.normal(0, 0.05, (2000, 2))
+    return shifts, true_labels
+
+
+def same_partition(labels, true_labels):
+    return len(set(zip(labels, true_labels))) == len(set(true_labels)) == len(set(labels))
+
+
+class TestSortGroupLabels:
+
+    def test_labels_should_follow_sorted_centers(self):
+        labels = optics_groups.sort_group_labels(
+            np.array([0, 1, 2, 0]),
+            np.array([[1, 0], [0, 1], [0, 0]])
+            )
+        assert labels.tolist() == [3, 2, 1, 3]
+
+
+class TestClusterShiftsGrid:
+
+    def test_clusters_should_be_found(self, clustered_shifts):
+        shifts, true_labels = clustered_shifts
+        labels = optics_groups.cluster_shifts_grid(shifts + 0.5, 1)
+        assert same_partition(labels, true_labels)
+        assert labels.min() == 1
+        assert labels.max() == 9
+
+    def test_zero_bin_size_should_raise_assertionerror(self, clustered_shifts):
+        shifts, _ = clustered_shifts
+        with pytest.raises(AssertionError):
+            optics_groups.cluster_shifts_grid(shifts, 0)
+
+    def test_nan_shift_should_get_last_group(self):
+        labels = optics_groups.cluster_shifts_grid([[0, 0], [np.nan, 1], [3, 3]], 1)
+        assert labels.tolist() == [1, 3, 2]
+
+
+class TestClusterShiftsKmeans:
+
+    def test_clusters_should_be_found(self, clustered_shifts):
+        shifts, true_labels = clustered_shifts
+        labels = optics_groups.cluster_shifts_kmeans(shifts, 9)
+        assert same_partition(labels, true_labels)
+        assert labels.min() == 1
+        assert labels.max() == 9
+
+    def test_result_should_be_reproducible(self, clustered_shifts):
+        shifts, _ = clustered_shifts
+        labels = optics_groups.cluster_shifts_kmeans(shifts, 5)
+        assert np.array_equal(labels, optics_groups.cluster_shifts_kmeans(shifts, 5))
+
+    def test_single_group_should_return_ones(self, clustered_shifts):
+        shifts, _ = clustered_shifts
+        assert (optics_groups.cluster_shifts_kmeans(shifts, 1) == 1).all()
+
+    def test_identical_shifts_should_return_single_group(self):
+        labels = optics_groups.cluster_shifts_kmeans(np.zeros((4, 2)), 2)
+        assert labels.tolist() == [1, 1, 1, 1]
+
+    def test_empty_groups_should_be_dropped(self):
+        labels = optics_groups.cluster_shifts_kmeans([[0, 0]] * 3 + [[1, 1]], 3)
+        assert labels.tolist() == [1, 1, 1, 2]
+
+    def test_nan_shift_should_get_last_group(self):
+        shifts = [[0, 0], [0.1, 0], [5, 5], [5.1, 5], [np.nan, np.nan]]
+        labels = optics_groups.cluster_shifts_kmeans(shifts, 2)
+        assert labels.tolist() == [1, 1, 2, 2, 3]
+
+    def test_only_nan_shifts_should_return_ones(self):
+        labels = optics_groups.cluster_shifts_kmeans(np.full((3, 2), np.nan), 2)
+        assert labels.tolist() == [1, 1, 1]
+
+    def test_too_many_groups_should_return_one_group_per_shift(self):
+        labels = optics_groups.cluster_shifts_kmeans(np.array([[1, 0], [0, 0]]), 3)
+        assert labels.tolist() == [2, 1]
+
+    def test_single_shift_should_return_ones(self):
+        labels = optics_groups.cluster_shifts_kmeans(np.array([[1, 0]]), 2)
+        assert labels.tolist() == [1]
+
+    def test_too_many_groups_for_finite_shifts_should_be_clamped(self):
+        labels = optics_groups.cluster_shifts_kmeans(np.array([[1, 0], [np.nan, 0], [0, 0]]), 3)
+        assert labels.tolist() == [2, 3, 1]
+
+
+class TestEpuToStar:
+
+    def test_star_file_should_contain_micrographs(self, tmpdir):
+        input_files = [os.path.join(THIS_DIR, INPUT_TEST_FOLDER, name) for name in EPU_FILES]
+        output_file = str(tmpdir.mkdir(OUTPUT_TEST_FOLDER).join('micrographs.star'))
+        star_data = optics_groups.epu_to_star(input_files, output_file, 'relion_3', n_groups=2)
+
+        star_file = star.load_star(output_file)
+        assert 'MicrographMetadata' not in star_file
+        assert star_file['MicrographMovieName'][0].endswith('xml_1_8_falcon_2.mrc')
+        assert star_file['Voltage'].tolist() == [300, 300, 300, 200, 200]
+        assert np.allclose(star_file['PixelSize'], star_data['PixelSize'])
+        assert sorted(set(star_file['BeamTiltClass'])) == [1, 2]
+        assert (star_file['BeamTiltGroupName'] == 'optics_group_' + star_file['BeamTiltClass'].astype(str)).all()
+
+    def test_single_file_should_return_single_group(self, tmpdir):
+        input_files = [os.path.join(THIS_DIR, INPUT_TEST_FOLDER, EPU_FILES[0])]
+        output_file = str(tmpdir.mkdir(OUTPUT_TEST_FOLDER).join('micrographs.star'))
+        star_data = optics_groups.epu_to_star(input_files, output_file, 'relion_3', n_groups=2)
+        assert star_data['BeamTiltClass'].tolist() == [1]
+
+    def test_missing_beam_shift_should_return_single_group(self, tmpdir):
+        output_dir = tmpdir.mkdir(OUTPUT_TEST_FOLDER)
+        input_files = []
+        for name in EPU_FILES[:2]:
+            with open(os.path.join(THIS_DIR, INPUT_TEST_FOLDER, name), 'r') as read:
+                content = re.sub(r'<BeamShift .*?</BeamShift>', '', read.read(), flags=re.DOTALL)
+            input_files.append(str(output_dir.join(name)))
+            with open(input_files[-1], 'w') as write:
+                write.write(content)
+        output_file = str(output_dir.join('micrographs.star'))
+        star_data = optics_groups.epu_to_star(input_files, output_file, 'relion_3', n_groups=2)
+        assert star_data['BeamTiltClass'].tolist() == [1, 1]
+
+    def test_empty_list_should_raise_ioerror(self, tmpdir):
+        output_file = str(tmpdir.mkdir(OUTPUT_TEST_FOLDER).join('micrographs.star'))
+        with pytest.raises(IOError):
+            optics_groups.epu_to_star([], output_file, 'relion_3')
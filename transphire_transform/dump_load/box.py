@@ -23,13 +23,115 @@ SOFTWARE.
 """
 
 
+import functools
+import json
 import typing
 
+import numpy as np # type: ignore
 import pandas as pd # type: ignore
 
+from . import star
 from . import util
 
 
+def load_eman1_raw(file_name: str) -> np.ndarray:
+    """
+    Read the eman1 box file without centering the coordinates.
+    Empty box files return an empty array.
+
+    Arguments:
+    file_name - Name of the box file
+
+    Returns:
+    Numpy array of shape (n_particles, 4) containing the lower left corner and the box size
+    """
+    try:
+        return util.load_file(
+            file_name,
+            names=['CoordinateX', 'CoordinateY', 'box_x', 'box_y'],
+            usecols=[0, 1, 2, 3],
+            comment='#',
+            ).values
+    except pd.errors.EmptyDataError:
+        return np.empty((0, 4), dtype=int)
+
+
+def load_eman2_json_raw(file_name: str) -> np.ndarray:
+    """
+    Read the boxes of an eman2 info json file.
+    The coordinates are already centered, so the box size is 0.
+
+    Arguments:
+    file_name - Name of the json file
+
+    Returns:
+    Numpy array of shape (n_particles, 4) containing the center and a box size of 0
+    """
+    boxes: typing.List[typing.List[typing.Any]]
+    raw_data: np.ndarray
+
+    with open(file_name, 'r') as read:
+        boxes = json.load(read).get('boxes', [])
+
+    raw_data = np.zeros((len(boxes), 4), dtype=float)
+    for idx, entry in enumerate(boxes):
+        raw_data[idx, :2] = entry[:2]
+    return raw_data
+
+
+def load_relion_raw(file_name: str) -> np.ndarray:
+    """
+    Read the coordinates of a relion autopick star file.
+    The coordinates are already centered, so the box size is 0.
+
+    Arguments:
+    file_name - Name of the star file
+
+    Returns:
+    Numpy array of shape (n_particles, 4) containing the center and a box size of 0
+    """
+    star_data: pd.DataFrame
+    raw_data: np.ndarray
+
+    star_data = star.load_star(file_name)
+    raw_data = np.zeros((len(star_data), 4), dtype=float)
+    raw_data[:, :2] = star_data[['CoordinateX', 'CoordinateY']].values
+    return raw_data
+
+
+def get_box_raw_function_dict() -> typing.Dict[str, typing.Callable[[str], np.ndarray]]:
+    """
+    Returns the raw loading function for every box version.
+    crYOLO cbox files share the eman1 layout with additional columns.
+
+    Arguments:
+    None
+
+    Returns:
+    Dictionary with the version as key and the function as value
+    """
+    return {
+        'eman1': load_eman1_raw,
+        'eman2': load_eman1_raw,
+        'eman2_json': load_eman2_json_raw,
+        'cryolo': load_eman1_raw,
+        'relion': load_relion_raw,
+        }
+
+
+def center_box_coordinates(raw_data: np.ndarray) -> np.ndarray:
+    """
+    Shift the lower left box corner to the box center.
+
+    Arguments:
+    raw_data - Array of shape (n_particles, 4) containing the lower left corner and the box size
+
+    Returns:
+    Array of shape (n_particles, 2) containing the center coordinates
+    """
+    return raw_data[:, :2] + raw_data[:, 2:4] // 2
+
+
 def load_eman1(file_name: str) -> pd.DataFrame:
     """
     Read the eman2 box files
@@ -40,17 +142,10 @@ def load_eman1(file_name: str) -> pd.DataFrame:
     Returns:
     Pandas data containing the box coordinates
     """
-    output_data: pd.DataFrame
-
-    output_data = util.load_file(
-        file_name,
-        names=['CoordinateX', 'CoordinateY', 'box_x', 'box_y'],
-        comment='#',
+    return pd.DataFrame(
+        center_box_coordinates(load_eman1_raw(file_name)),
+        columns=['CoordinateX', 'CoordinateY']
         )
-    output_data['CoordinateX'] += output_data['box_x'] // 2
-    output_data['CoordinateY'] += output_data['box_y'] // 2
-
-    return output_data[['CoordinateX', 'CoordinateY']]
 
 
 def load_box(
@@ -62,7 +157,7 @@ def load_box(
 
     Arguments:
     file_name - Path to the input box file.
-    version - box type
+    version - box type: eman1, eman2, eman2_json, cryolo, relion
 
     Returns:
     Pnadas dataframe containing the motion information
@@ -71,12 +166,219 @@ def load_box(
         str,
         typing.Callable[
             [str],
-            pd.DataFrame
+            np.ndarray
+            ]
+        ]
+
+    function_dict = get_box_raw_function_dict()
+
+    return pd.DataFrame(
+        center_box_coordinates(function_dict[version](file_name)),
+        columns=['CoordinateX', 'CoordinateY']
+        )
+
+
+def load_box_many(
+        file_names: typing.List[str],
+        version: str='eman1',
+        dtype: typing.Any=np.float32,
+        n_workers: int=1
+    ) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """
+    Load many box files into a single coordinate array.
+    The box center shift is done once on the combined array.
+
+    Arguments:
+    file_names - Paths to the input box files.
+    version - box type: eman1, eman2, eman2_json, cryolo, relion (default eman1)
+    dtype - Data type of the coordinates (default float32)
+    n_workers - Number of parallel threads (default 1)
+
+    Returns:
+    Coordinates of shape (n_particles, 2), index of the file for every particle
+    """
+    function_dict: typing.Dict[
+        str,
+        typing.Callable[
+            [str],
+            np.ndarray
+            ]
+        ]
+    raw_list: typing.List[np.ndarray]
+    raw_data: np.ndarray
+    micrograph_index: np.ndarray
+
+    function_dict = get_box_raw_function_dict()
+
+    raw_list = util.map_files(function_dict[version], file_names, n_workers=n_workers)
+    if not raw_list:
+        raise IOError('Cannot load box files from empty sequence')
+
+    raw_data = np.concatenate(raw_list, axis=0)
+    micrograph_index = np.repeat(
+        np.arange(len(raw_list), dtype=np.int32),
+        [len(entry) for entry in raw_list]
+        )
+
+    return center_box_coordinates(raw_data).astype(dtype, copy=False), micrograph_index
+
+
+def box_data_to_corner(box_data: pd.DataFrame, box_size: int) -> pd.DataFrame:
+    """
+    Convert center coordinates into integer lower left corners with the box size.
+
+    Arguments:
+    box_data - Pandas data frame containing the CoordinateX and CoordinateY center coordinates
+    box_size - Box size in pixel
+
+    Returns:
+    Pandas data frame containing the lower left corner and the box size
+    """
+    corner_data: pd.DataFrame
+
+    if box_size <= 0:
+        raise IOError(f'Box size needs to be positive: {box_size}')
+
+    corner_data = pd.DataFrame(
+        np.rint(box_data[['CoordinateX', 'CoordinateY']].values).astype(int) - box_size // 2,
+        columns=['CoordinateX', 'CoordinateY']
+        )
+    corner_data['box_x'] = box_size
+    corner_data['box_y'] = box_size
+    return corner_data
+
+
+def dump_eman1(file_name: str, box_data: pd.DataFrame, box_size: int) -> None:
+    """
+    Write an eman1 box file.
+
+    Arguments:
+    file_name - Path to the output box file
+    box_data - Pandas data frame containing the CoordinateX and CoordinateY center coordinates
+    box_size - Box size in pixel
+
+    Returns:
+    None
+    """
+    util.dump_file(file_name=file_name, data=box_data_to_corner(box_data, box_size))
+
+
+def dump_cryolo(file_name: str, box_data: pd.DataFrame, box_size: int) -> None:
+    """
+    Write a crYOLO cbox file.
+    The confidence column is used if present, otherwise it is set to 1.
+
+    Arguments:
+    file_name - Path to the output cbox file
+    box_data - Pandas data frame containing the CoordinateX and CoordinateY center coordinates
+    box_size - Box size in pixel
+
+    Returns:
+    None
+    """
+    corner_data: pd.DataFrame
+
+    corner_data = box_data_to_corner(box_data, box_size)
+    if 'confidence' in box_data:
+        corner_data['confidence'] = box_data['confidence'].values
+    else:
+        corner_data['confidence'] = 1.0
+    util.dump_file(file_name=file_name, data=corner_data)
+
+
+def dump_eman2_json(file_name: str, box_data: pd.DataFrame) -> None:
+    """
+    Write the boxes of an eman2 info json file.
+
+    Arguments:
+    file_name - Path to the output json file
+    box_data - Pandas data frame containing the CoordinateX and CoordinateY center coordinates
+
+    Returns:
+    None
+    """
+    with open(file_name, 'w') as write:
+        json.dump(
+            {
+                'boxes': [
+                    [float(coord_x), float(coord_y), 'manual']
+                    for coord_x, coord_y in box_data[['CoordinateX', 'CoordinateY']].values
+                    ]
+                },
+            write
+            )
+
+
+def dump_relion(
+        file_name: str,
+        box_data: pd.DataFrame,
+        star_version: str='relion_3'
+    ) -> None:
+    """
+    Write a relion autopick star file.
+
+    Arguments:
+    file_name - Path to the output star file
+    box_data - Pandas data frame containing the CoordinateX and CoordinateY center coordinates
+    star_version - Output star file version (default relion_3)
+
+    Returns:
+    None
+    """
+    star.dump_star(
+        file_name=file_name,
+        data=box_data[['CoordinateX', 'CoordinateY']],
+        version=star_version
+        )
+
+
+def dump_box(
+        file_name: str,
+        box_data: pd.DataFrame,
+        version: str,
+        box_size: typing.Optional[int]=None,
+        star_version: str='relion_3'
+    ) -> None:
+    """
+    Dump the box file based on the version
+
+    Arguments:
+    file_name - Path to the output box file.
+    box_data - Pandas data frame containing the CoordinateX and CoordinateY center coordinates
+    version - box type: eman1, eman2, eman2_json, cryolo, relion
+    box_size - Box size in pixel, required for eman1, eman2 and cryolo (default None)
+    star_version - Output star file version for the relion type (default relion_3)
+
+    Returns:
+    None
+    """
+    sized_function_dict: typing.Dict[
+        str,
+        typing.Callable[
+            [str, pd.DataFrame, int],
+            None
+            ]
+        ]
+    function_dict: typing.Dict[
+        str,
+        typing.Callable[
+            [str, pd.DataFrame],
+            None
             ]
         ]
 
+    sized_function_dict = {
+        'eman1': dump_eman1,
+        'eman2': dump_eman1,
+        'cryolo': dump_cryolo,
+        }
     function_dict = {
-        'eman1': load_eman1,
+        'eman2_json': dump_eman2_json,
+        'relion': functools.partial(dump_relion, star_version=star_version),
         }
 
-    return function_dict[version](file_name)
+    if version in sized_function_dict:
+        if box_size is None:
+            raise IOError(f'Box size is required for {version}')
+        return sized_function_dict[version](file_name, box_data, box_size)
+    return function_dict[version](file_name, box_data)
@@ -0,0 +1,162 @@
+"""
+MIT License
+
+Copyright (c) 2018 Max Planck Institute of Molecular Physiology
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import time
+import typing
+
+import pandas as pd # type: ignore
+
+from . import cter
+from . import ctffind
+from . import star
+
+
+def split_into_chunks(
+        file_names: typing.List[str],
+        chunk_size: int
+    ) -> typing.Iterator[typing.List[str]]:
+    """
+    Split the file names into chunks of at most chunk_size entries.
+
+    Arguments:
+    file_names - List of file names
+    chunk_size - Maximum number of file names per chunk
+
+    Returns:
+    Iterator over the chunks
+    """
+    assert chunk_size > 0, f'Chunk size needs to be positive: {chunk_size}'
+    for idx in range(0, len(file_names), chunk_size):
+        yield file_names[idx:idx+chunk_size]
+
+
+def convert_files(
+        file_names: typing.List[str],
+        output_file: str,
+        load_function: typing.Callable[[str], pd.DataFrame],
+        dump_function: typing.Callable[[str, pd.DataFrame, bool], None],
+        chunk_size: int
+    ) -> typing.Tuple[int, float]:
+    """
+    Stream the content of many input files into a single output file.
+    Only chunk_size input files are kept in memory at the same time.
+
+    Arguments:
+    file_names - List of input file names
+    output_file - Path to the output file
+    load_function - Function to load a single input file
+    dump_function - Function to dump a chunk, the last argument indicates append mode
+    chunk_size - Number of input files per chunk
+
+    Returns:
+    Number of rows written, rows per second
+    """
+    chunk_data: pd.DataFrame
+    n_rows: int
+    start_time: float
+    elapsed_time: float
+
+    if not file_names:
+        raise IOError(f'Cannot convert empty sequence to {output_file}')
+
+    n_rows = 0
+    start_time = time.perf_counter()
+    for idx, chunk in enumerate(split_into_chunks(file_names, chunk_size)):
+        chunk_data = pd.concat(
+            [load_function(file_name) for file_name in chunk],
+            ignore_index=True
+            )
+        dump_function(output_file, chunk_data, idx != 0)
+        n_rows += len(chunk_data)
+    elapsed_time = time.perf_counter() - start_time
+
+    return n_rows, n_rows / elapsed_time if elapsed_time > 0 else float('inf')
+
+
+def ctffind_to_cter(
+        file_names: typing.List[str],
+        output_file: str,
+        ctffind_version: typing.Optional[str]=None,
+        cter_version: typing.Optional[str]=None,
+        chunk_size: int=1000
+    ) -> typing.Tuple[int, float]:
+    """
+    Convert many ctffind output files into a single cter partres file.
+
+    Arguments:
+    file_names - List of ctffind output files
+    output_file - Path to the output partres file
+    ctffind_version - Ctffind version default the latest version
+    cter_version - Cter version default the latest version
+    chunk_size - Number of ctffind files per chunk (default 1000)
+
+    Returns:
+    Number of rows written, rows per second
+    """
+    return convert_files(
+        file_names=file_names,
+        output_file=output_file,
+        load_function=lambda file_name: ctffind.load_ctffind(file_name, ctffind_version),
+        dump_function=lambda file_name, data, append: cter.dump_cter(
+            file_name,
+            data,
+            cter_version,
+            append
+            ),
+        chunk_size=chunk_size
+        )
+
+
+def ctffind_to_star(
+        file_names: typing.List[str],
+        output_file: str,
+        star_version: str,
+        ctffind_version: typing.Optional[str]=None,
+        chunk_size: int=1000
+    ) -> typing.Tuple[int, float]:
+    """
+    Convert many ctffind output files into a single star file.
+
+    Arguments:
+    file_names - List of ctffind output files
+    output_file - Path to the output star file
+    star_version - Output star file version
+    ctffind_version - Ctffind version default the latest version
+    chunk_size - Number of ctffind files per chunk (default 1000)
+
+    Returns:
+    Number of rows written, rows per second
+    """
+    return convert_files(
+        file_names=file_names,
+        output_file=output_file,
+        load_function=lambda file_name: ctffind.load_ctffind(file_name, ctffind_version),
+        dump_function=lambda file_name, data, append: star.dump_star(
+            file_name,
+            data,
+            star_version,
+            append
+            ),
+        chunk_size=chunk_size
+        )
@@ -22,11 +22,14 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import functools
 import typing
 
 import numpy as np # type: ignore
 import pandas as pd # type: ignore
 
+from . import shared
+from . import table
 from . import util
 
 
@@ -68,64 +71,115 @@ def get_cter_v1_0_header_names() -> typing.List[str]:
 
 def load_cter(
         file_name: str,
-        version: typing.Optional[str]=None
-    ) -> None:
+        version: typing.Optional[str]=None,
+        as_table: bool=False
+    ) -> typing.Union[pd.DataFrame, table.Table]:
     """
-    Create a cter partres file based on the cter_data information.
+    Load a cter partres file.
     By default, the latest cter version is assumed.
 
     Arguments:
-    file_name - Path to the output partres file.
+    file_name - Path to the input partres file.
     version - Cter version default the latest version
+    as_table - Return a Table instead of a pandas data frame (default False)
 
     Returns:
-    None
+    Pandas dataframe or Table containing the cter file information
     """
     function_dict: typing.Dict[
         str,
         typing.Callable[
             [str],
-            pd.DataFrame
+            table.Table
             ]
         ]
-    function: typing.Callable[[str], pd.DataFrame]
+    function: typing.Callable[[str], table.Table]
+    cter_table: table.Table
 
     function_dict = {
-        '1.0': load_cter_v1_0,
+        '1.0': load_cter_v1_0_table,
         }
 
     function = util.extract_function_from_function_dict(function_dict, version)
-    return function(file_name)
+    cter_table = function(file_name)
+    return cter_table if as_table else cter_table.to_pandas()
+
+
+def load_cter_many(
+        file_names: typing.List[str],
+        version: typing.Optional[str]=None,
+        n_workers: int=1,
+        as_table: bool=False,
+        use_shared_memory: bool=False
+    ) -> typing.Union[pd.DataFrame, table.Table]:
+    """
+    Load many cter partres files into a single table.
+    The per file results are only converted to pandas once at the end.
+
+    Arguments:
+    file_names - Paths to the input partres files.
+    version - Cter version default the latest version
+    n_workers - Number of parallel workers (default 1)
+    as_table - Return a Table instead of a pandas data frame (default False)
+    use_shared_memory - Load file chunks in processes returning via shared memory,
+                        small cter files load faster with the default threads (default False)
+
+    Returns:
+    Pandas dataframe or Table containing the information of all files
+    """
+    function: typing.Callable[[str], table.Table]
+    table_list: typing.List[table.Table]
+    cter_table: table.Table
+
+    if not file_names:
+        raise IOError('Cannot load cter files from empty sequence')
+
+    function = functools.partial(load_cter, version=version, as_table=True)
+    if use_shared_memory:
+        cter_table = shared.load_many_shared(function, file_names, n_workers=n_workers)
+    else:
+        table_list = util.map_files(function, file_names, n_workers=n_workers)
+        cter_table = table.concatenate_tables(table_list)
+    return cter_table if as_table else cter_table.to_pandas()
 
 
 def load_cter_v1_0(file_name: str) -> pd.DataFrame:
     """
-    Load a ctffind file.
+    Load a cter partres file.
 
     Arguments:
-    file_name - Path to the ctffind file
+    file_name - Path to the cter file
 
     Returns:
-    Pandas dataframe containing the ctffind file information
+    Pandas dataframe containing the cter file information
     """
-    header_names: typing.List[str]
-    cter_data: pd.DataFrame
+    return load_cter_v1_0_table(file_name).to_pandas()
 
-    header_names = get_cter_v1_0_header_names()
-    cter_data = util.load_file(
-        file_name,
-        names=header_names,
-        )
 
-    defocus_data, cter_data_dropped = cter_to_intern(cter_data=cter_data)
+def load_cter_v1_0_table(file_name: str) -> table.Table:
+    """
+    Load a cter partres file without creating a pandas data frame.
 
-    return pd.concat([defocus_data, cter_data_dropped], axis=1)
+    Arguments:
+    file_name - Path to the cter file
+
+    Returns:
+    Table containing the cter file information
+    """
+    cter_table: table.Table
+
+    cter_table = table.load_text_table(
+        file_name,
+        names=get_cter_v1_0_header_names(),
+        )
+    return cter_table_to_intern(cter_table)
 
 
 def dump_cter(
         file_name: str,
         cter_data: pd.DataFrame,
-        version: typing.Optional[str]=None
+        version: typing.Optional[str]=None,
+        append: bool=False
     ) -> None:
     """
     Create a cter partres file based on the cter_data information.
@@ -135,6 +189,7 @@ def dump_cter(
     file_name - Path to the output partres file.
     cter_data - Pandas data frame containing ctf information.
     version - Cter version default the latest version
+    append - Append the data to an existing partres file (default False)
 
     Returns:
     None
@@ -142,27 +197,28 @@ def dump_cter(
     function_dict: typing.Dict[
         str,
         typing.Callable[
-            [str, pd.DataFrame],
+            [str, pd.DataFrame, bool],
             None
             ]
         ]
-    function: typing.Callable[[str, pd.DataFrame], None]
+    function: typing.Callable[[str, pd.DataFrame, bool], None]
 
     function_dict = {
         '1.0': dump_cter_v1_0,
         }
 
     function = util.extract_function_from_function_dict(function_dict, version)
-    return function(file_name, cter_data)
+    return function(file_name, cter_data, append)
 
 
-def dump_cter_v1_0(file_name: str, cter_data: pd.DataFrame) -> None:
+def dump_cter_v1_0(file_name: str, cter_data: pd.DataFrame, append: bool=False) -> None:
     """
     Create a cter v1.0 partres file based on the cter_data information.
 
     Arguments:
     file_name - Path to the output partres file.
     cter_data - Pandas data frame containing ctf information.
+    append - Append the data to an existing partres file (default False)
 
     Returns:
     None
@@ -204,49 +260,79 @@ def dump_cter_v1_0(file_name: str, cter_data: pd.DataFrame) -> None:
 
     intern_to_cter(cter_data=output_frame, valid_list=cter_valid_list)
 
-    util.dump_file(file_name=file_name, data=output_frame.round(7))
+    util.dump_file(file_name=file_name, data=output_frame.round(7), append=append)
 
 
 def cter_to_intern(cter_data: pd.DataFrame) -> typing.Tuple[pd.DataFrame, pd.DataFrame]:
     """
     Convert the necessary values from cter format to internal mrc format.
+    Pandas adaptor of cter_table_to_intern, the converted values are also written to cter_data.
 
     Arguments:
     cter_data - Data containing the raw information.
 
     Returns:
-    None
+    DefocusU and DefocusV data frame, converted cter_data without defocus and astigmatism_amplitude
     """
-    cter_data['AmplitudeContrast'] = cter_data['AmplitudeContrast'] / 100
-    cter_data['total_ac'] = cter_data['total_ac'] / 100
-    cter_data['DefocusAngle'] = 45 - cter_data['DefocusAngle']
+    intern_data: pd.DataFrame
+    defocus_data: pd.DataFrame
 
-    cter_data['nyquist'] = 1 / cter_data['nyquist']
-    cter_data['resolution_limit_defocus_astig'] = 1 / cter_data['resolution_limit_defocus_astig']
-    cter_data['resolution_limit_defocus'] = 1 / cter_data['resolution_limit_defocus']
-    cter_data['CtfMaxResolution'] = 1 / cter_data['CtfMaxResolution']
+    intern_data = cter_table_to_intern(table.Table.from_pandas(cter_data)).to_pandas()
+    for name in cter_data:
+        if name in intern_data:
+            cter_data[name] = intern_data[name].values
 
-    mask = (cter_data['DefocusAngle'] < 0)
+    defocus_data = intern_data[['DefocusU', 'DefocusV']]
+    intern_data = intern_data.drop(labels=['DefocusU', 'DefocusV'], axis=1)
+    intern_data.index = cter_data.index
+    return defocus_data, intern_data
+
+
+def cter_table_to_intern(cter_table: table.Table) -> table.Table:
+    """
+    Convert the necessary values from cter format to internal mrc format.
+    Numpy version of cter_to_intern that works on the columns of a Table.
+
+    Arguments:
+    cter_table - Table containing the raw information.
+
+    Returns:
+    Table with DefocusU and DefocusV replacing defocus and astigmatism_amplitude
+    """
+    defocus_angle: np.ndarray
+    mask: np.ndarray
+    intern_table: table.Table
+
+    defocus_angle = 45 - cter_table['DefocusAngle']
+    mask = (defocus_angle < 0)
     while mask.any():
-        cter_data.loc[mask, 'DefocusAngle'] += 180
-        mask = (cter_data['DefocusAngle'] < 0)
+        defocus_angle[mask] += 180
+        mask = (defocus_angle < 0)
 
-    mask = (cter_data['DefocusAngle'] >= 180)
+    mask = (defocus_angle >= 180)
     while mask.any():
-        cter_data.loc[mask, 'DefocusAngle'] -= 180
-        mask = (cter_data['DefocusAngle'] >= 180)
+        defocus_angle[mask] -= 180
+        mask = (defocus_angle >= 180)
 
-    defocus_data = pd.DataFrame(
-        index=range(len(cter_data)),
-        columns=('DefocusU', 'DefocusV')
-        )
-    defocus_data['DefocusU'], defocus_data['DefocusV'] = \
+    intern_table = table.Table()
+    intern_table['DefocusU'], intern_table['DefocusV'] = \
         defocus_defocus_diff_to_defocus_u_and_v(
-            cter_data['defocus'],
-            cter_data['astigmatism_amplitude']
+            cter_table['defocus'],
+            cter_table['astigmatism_amplitude']
             )
-    cter_data_dropped = cter_data.drop(labels=['defocus', 'astigmatism_amplitude'], axis=1)
-    return defocus_data, cter_data_dropped
+    for name in cter_table:
+        if name not in ('defocus', 'astigmatism_amplitude'):
+            intern_table[name] = cter_table[name]
+
+    intern_table['AmplitudeContrast'] = cter_table['AmplitudeContrast'] / 100
+    intern_table['total_ac'] = cter_table['total_ac'] / 100
+    intern_table['DefocusAngle'] = defocus_angle
+    intern_table['nyquist'] = 1 / cter_table['nyquist']
+    intern_table['resolution_limit_defocus_astig'] = \
+        1 / cter_table['resolution_limit_defocus_astig']
+    intern_table['resolution_limit_defocus'] = 1 / cter_table['resolution_limit_defocus']
+    intern_table['CtfMaxResolution'] = 1 / cter_table['CtfMaxResolution']
+    return intern_table
 
 
 def intern_to_cter(cter_data: pd.DataFrame, valid_list: typing.List[str]) -> None:
@@ -346,33 +432,83 @@ def defocus_u_and_v_to_defocus_defocus_diff(
     return defocus, astigmatism_amplitude
 
 
-def amplitude_contrast_to_angle(amp_contrast: pd.Series) -> pd.Series:
+def amplitude_contrast_to_angle(
+        amp_contrast: pd.Series,
+        out: typing.Optional[np.ndarray]=None,
+        dtype: typing.Any=np.float64
+    ) -> typing.Union[pd.Series, np.ndarray]:
     """
     Convert amplitude contrast into an phase shift angle.
+    The calculation is done elementwise in the output buffer and out may be the input array.
 
     Argument:
     amp_contrast - Value of the amplitude contrast in percent.
+    out - Optional output array to store the result in
+    dtype - Data type of the calculation if out is None (default float64)
 
     Returns:
     Amplitude contrast value in phase shift in degrees.
     """
-    value: pd.Series
-    assert (-100 <= amp_contrast).all() and (amp_contrast <= 100).all(), amp_contrast
+    values: np.ndarray
+    value: np.ndarray
 
-    value = np.arctan2(amp_contrast, np.sqrt(1e4 - amp_contrast**2))
-    mask = (value < 0)
-    value.loc[mask] += np.pi
-    return np.degrees(value)
+    values = np.asarray(amp_contrast)
+    # Check the domain before out is written, as out may be the input array.
+    # Two reductions without a temporary array; nan entries fail the comparisons as well.
+    assert values.size == 0 or (values.min() >= -100 and values.max() <= 100), amp_contrast
 
+    if out is None:
+        value = np.empty(values.shape, dtype=dtype)
+    else:
+        value = out
+
+    # arctan2(a, sqrt(1e4 - a**2)) == arcsin(a / 100)
+    np.divide(values, 100, out=value)
+    np.arcsin(value, out=value)
+    np.degrees(value, out=value)
+    np.mod(value, 180, out=value)
+
+    if isinstance(amp_contrast, pd.Series) and out is None:
+        return pd.Series(value, index=amp_contrast.index, name=amp_contrast.name)
+    return value
 
-def angle_to_amplitude_contrast(angle: pd.Series) -> pd.Series:
+
+def angle_to_amplitude_contrast(
+        angle: pd.Series,
+        out: typing.Optional[np.ndarray]=None,
+        dtype: typing.Any=np.float64
+    ) -> typing.Union[pd.Series, np.ndarray]:
     """
     Convert phase shift angle into amplitude contrast percentage.
+    The calculation is done elementwise in the output buffer and out may be the input array.
 
     Argument:
     angle - Value of the phase shift in degrees
+    out - Optional output array to store the result in
+    dtype - Data type of the calculation if out is None (default float64)
 
     Returns:
     Value of the amplitude contrast in percent.
     """
-    return np.tan(np.radians(angle)) / np.sqrt(1 + np.tan(np.radians(angle))**2) * 100.0
+    values: np.ndarray
+    value: np.ndarray
+    denominator: np.ndarray
+
+    values = np.asarray(angle)
+    if out is None:
+        value = np.empty(values.shape, dtype=dtype)
+    else:
+        value = out
+
+    # tan / sqrt(1 + tan**2) with the tangent calculated only once
+    np.radians(values, out=value)
+    np.tan(value, out=value)
+    denominator = np.multiply(value, value)
+    np.add(denominator, 1, out=denominator)
+    np.sqrt(denominator, out=denominator)
+    np.divide(value, denominator, out=value)
+    np.multiply(value, 100.0, out=value)
+
+    if isinstance(angle, pd.Series) and out is None:
+        return pd.Series(value, index=angle.index, name=angle.name)
+    return value
@@ -167,3 +167,120 @@ def load_ctffind(
 
     function = util.extract_function_from_function_dict(function_dict, version)
     return function(file_name)
+
+
+def get_ctffind_4_1_0_avrot_row_names() -> typing.List[str]:
+    """
+    Returns the row names for the ctffind4 rotational average file.
+
+    Arguments:
+    None
+
+    Returns:
+    List of names
+    """
+    return [
+        'SpatialFrequency',
+        'RotationalAverageNoAstig',
+        'RotationalAverage',
+        'CtfFit',
+        'CrossCorrelation',
+        'TwoSigmaNoise',
+        ]
+
+
+def load_ctffind_avrot_4_1_0(file_name: str) -> np.ndarray:
+    """
+    Load a ctffind _avrot.txt rotational average file.
+
+    Arguments:
+    file_name - Path to the ctffind _avrot.txt file
+
+    Returns:
+    Numpy array of shape (n_micrographs, n_rows, n_bins) containing the rotational average
+    """
+    row_names: typing.List[str]
+    avrot_data: np.ndarray
+
+    row_names = get_ctffind_4_1_0_avrot_row_names()
+    avrot_data = util.load_file(
+        file_name,
+        comment='#',
+        dtype=np.float32,
+        ).values
+
+    if avrot_data.shape[0] % len(row_names) != 0:
+        raise IOError(
+            f'{file_name} does not contain a multiple of {len(row_names)} rows'
+            )
+
+    return np.ascontiguousarray(
+        avrot_data.reshape(-1, len(row_names), avrot_data.shape[1])
+        )
+
+
+def load_ctffind_avrot(
+        file_name: str,
+        version: typing.Optional[str]=None
+    ) -> np.ndarray:
+    """
+    Load a ctffind _avrot.txt rotational average file.
+    By default, the latest ctffind version is assumed.
+
+    Arguments:
+    file_name - Path to the ctffind _avrot.txt file
+    version - Ctffind version default the latest version
+
+    Returns:
+    Numpy array of shape (n_micrographs, n_rows, n_bins) containing the rotational average
+    """
+    function_dict: typing.Dict[
+        str,
+        typing.Callable[
+            [str],
+            np.ndarray
+            ]
+        ]
+    function: typing.Callable[[str], np.ndarray]
+
+    function_dict = {
+        '4.1.0': load_ctffind_avrot_4_1_0,
+        }
+
+    function = util.extract_function_from_function_dict(function_dict, version)
+    return function(file_name)
+
+
+def load_ctffind_avrot_many(
+        file_names: typing.List[str],
+        version: typing.Optional[str]=None
+    ) -> np.ndarray:
+    """
+    Load multiple ctffind _avrot.txt files into a single contiguous array.
+    All files need to share the same spatial frequency axis.
+
+    Arguments:
+    file_names - Paths to the ctffind _avrot.txt files
+    version - Ctffind version default the latest version
+
+    Returns:
+    Numpy float32 array of shape (n_micrographs, n_rows, n_bins)
+    """
+    avrot_list: typing.List[np.ndarray]
+    output_data: np.ndarray
+    frequency: np.ndarray
+
+    if not file_names:
+        raise IOError('Cannot load rotational averages from empty sequence')
+
+    avrot_list = [load_ctffind_avrot(file_name, version) for file_name in file_names]
+
+    frequency = avrot_list[0][0, 0]
+    for file_name, avrot_data in zip(file_names, avrot_list):
+        if avrot_data.shape[2] != frequency.shape[0] or \
+                not (avrot_data[:, 0] == frequency).all():
+            raise IOError(f'Spatial frequency axis of {file_name} does not match')
+
+    output_data = np.concatenate(avrot_list, axis=0)
+
+    return output_data
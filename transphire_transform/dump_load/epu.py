@@ -0,0 +1,213 @@
+"""
+MIT License
+
+Copyright (c) 2018 Max Planck Institute of Molecular Physiology
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import typing
+import xml.etree.ElementTree as et
+
+from . import util
+
+
+def get_epu_1_8_output_dict() -> typing.Dict[
+        str,
+        typing.Dict[str, typing.Dict[str, typing.List[str]]]
+        ]:
+    """
+    Returns the level_dict entries for every output of the EPU MicroscopeImage xml.
+    The layout is the same for EPU 1.8, 1.9 and 1.11 and for Falcon and K2 cameras,
+    camera and phase plate specific values are part of the custom_data output.
+
+    Arguments:
+    None
+
+    Returns:
+    Dictionary with the output name as key and the level_dict entries as value
+    """
+    shared: str
+    arrays: str
+
+    shared = '{http://schemas.datacontract.org/2004/07/Fei.SharedObjects}'
+    arrays = '{http://schemas.microsoft.com/2003/10/Serialization/Arrays}'
+    return {
+        'custom_data': {
+            'key_value': {f'{arrays}Key': [f'{arrays}Value']},
+            },
+        'instrument': {
+            'level 0': {
+                f'{shared}AccelerationVoltage': [],
+                f'{shared}ApplicationSoftware': [],
+                f'{shared}ApplicationSoftwareVersion': [],
+                f'{shared}ComputerName': [],
+                f'{shared}InstrumentID': [],
+                f'{shared}InstrumentModel': [],
+                },
+            },
+        'acquisition': {
+            'level 0': {
+                f'{shared}acquisitionDateTime': [],
+                },
+            'level 1': {
+                f'{shared}camera': ['ExposureTime', 'PreExposureTime', 'PreExposurePauseTime'],
+                f'{shared}Binning': ['x', 'y'],
+                f'{shared}ReadoutArea': ['height', 'width'],
+                },
+            },
+        'optics': {
+            'level 0': {
+                f'{shared}Defocus': [],
+                f'{shared}Intensity': [],
+                f'{shared}NominalMagnification': [],
+                },
+            'level 1': {
+                f'{shared}ImageShift': ['_x', '_y'],
+                f'{shared}BeamShift': ['_x', '_y'],
+                f'{shared}BeamTilt': ['_x', '_y'],
+                },
+            },
+        'stage': {
+            'level 1': {
+                f'{shared}Position': ['A', 'B', 'X', 'Y', 'Z'],
+                },
+            },
+        'pixel_size': {
+            'level 3': {
+                f'{shared}SpatialScale': ['numericValue'],
+                },
+            },
+        }
+
+
+def get_fractions_1_8_output_dict() -> typing.Dict[
+        str,
+        typing.Dict[str, typing.Dict[str, typing.List[str]]]
+        ]:
+    """
+    Returns the level_dict entries for every output of the Falcon Acquisition fractions xml.
+
+    Arguments:
+    None
+
+    Returns:
+    Dictionary with the output name as key and the level_dict entries as value
+    """
+    return {
+        'info': {
+            'level 0': {
+                'FileVersion': [],
+                'Detector': [],
+                'AcquisitionID': [],
+                'ExpectedNumberOfFractions': [],
+                'RecordedNumberOfFractions': [],
+                'Format': [],
+                'Binning': [],
+                'ElectronCounting': [],
+                'AlignIntegratedImage': [],
+                },
+            },
+        'region': {
+            'level 1': {
+                'RegionOfInterest': ['Top', 'Left', 'Width', 'Height'],
+                },
+            },
+        }
+
+
+def detect_xml_preset(file_name: str) -> str:
+    """
+    Detect the xml preset based on the root tag and its namespace.
+    Only the first element of the file is read.
+
+    Arguments:
+    file_name - Path to the xml file
+
+    Returns:
+    Preset name: epu or fractions
+    """
+    preset_dict: typing.Dict[str, str]
+    root_tag: typing.Optional[str]
+
+    preset_dict = {
+        '{http://schemas.datacontract.org/2004/07/Fei.SharedObjects}MicroscopeImage': 'epu',
+        'Acquisition': 'fractions',
+        }
+
+    root_tag = None
+    with open(file_name, 'rb') as read:
+        for _, element in et.iterparse(read, events=('start',)):
+            root_tag = element.tag
+            break
+
+    if root_tag not in preset_dict:
+        raise IOError(f'{file_name}: Unknown xml root tag {root_tag}')
+    return preset_dict[typing.cast(str, root_tag)]
+
+
+def get_xml_level_dict(
+        preset: str,
+        version: typing.Optional[str]=None,
+        outputs: typing.Optional[typing.List[str]]=None
+    ) -> typing.Dict[str, typing.Dict[str, typing.List[str]]]:
+    """
+    Create the level_dict of a preset containing only the requested outputs.
+    By default, the latest version and all outputs are used.
+
+    Arguments:
+    preset - Preset name: epu or fractions
+    version - EPU version default the latest version
+    outputs - Output names of the preset default all outputs
+
+    Returns:
+    Level dict
+    """
+    preset_dict: typing.Dict[
+        str,
+        typing.Dict[
+            str,
+            typing.Callable[
+                [],
+                typing.Dict[str, typing.Dict[str, typing.Dict[str, typing.List[str]]]]
+                ]
+            ]
+        ]
+    output_dict: typing.Dict[str, typing.Dict[str, typing.Dict[str, typing.List[str]]]]
+    level_dict: typing.Dict[str, typing.Dict[str, typing.List[str]]]
+
+    preset_dict = {
+        'epu': {
+            '1.8': get_epu_1_8_output_dict,
+            },
+        'fractions': {
+            '1.8': get_fractions_1_8_output_dict,
+            },
+        }
+
+    output_dict = util.extract_function_from_function_dict(preset_dict[preset], version)()
+    if outputs is None:
+        outputs = list(output_dict)
+
+    level_dict = {}
+    for level_key in ['key_value', 'level 0', 'level 1', 'level 3']:
+        for output in outputs:
+            if level_key in output_dict[output]:
+                level_dict.setdefault(level_key, {}).update(output_dict[output][level_key])
+    return level_dict
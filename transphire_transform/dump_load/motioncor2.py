@@ -23,13 +23,86 @@ SOFTWARE.
 """
 
 
+import os
 import typing
 
+import numpy as np # type: ignore
 import pandas as pd # type: ignore
 
 from . import util
 
 
+def parse_motioncor2_1_0_0(
+        file_name: str
+    ) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Read the full frame and patch sections of a motioncor2 shift file in a single pass.
+    Full frame rows contain frame, shift_x, shift_y.
+    Patch rows contain frame, patch center x, patch center y, shift_x, shift_y.
+    The shifts are not referenced to the first frame.
+
+    Arguments:
+    file_name - Name of the motioncor2 shift file
+
+    Returns:
+    Full frame shifts (n_frames, 2), patch centers (n_patches, 2),
+    patch shifts (n_patches, n_frames, 2)
+    """
+    full_frame: typing.List[typing.Tuple[float, float]]
+    patch_dict: typing.Dict[typing.Tuple[float, float], typing.List[typing.Tuple[float, float]]]
+    patch_shifts: np.ndarray
+    patch_centers: np.ndarray
+    columns: typing.List[str]
+
+    full_frame = []
+    patch_dict = {}
+    with open(file_name, 'r') as read:
+        for line in read:
+            columns = line.split()
+            if not columns or columns[0].startswith('#'):
+                continue
+
+            if len(columns) == 3:
+                full_frame.append((float(columns[1]), float(columns[2])))
+            elif len(columns) == 5:
+                patch_dict.setdefault(
+                    (float(columns[1]), float(columns[2])),
+                    []
+                    ).append((float(columns[3]), float(columns[4])))
+            else:
+                raise IOError(f'Unknown motioncor2 shift line in {file_name}: {line.strip()}')
+
+    if patch_dict:
+        patch_centers = np.array(list(patch_dict.keys()), dtype=float)
+        patch_shifts, _ = util.stack_padded(
+            [np.array(value, dtype=float) for value in patch_dict.values()]
+            )
+    else:
+        patch_centers = np.empty((0, 2), dtype=float)
+        patch_shifts = np.empty((0, len(full_frame), 2), dtype=float)
+
+    return np.array(full_frame, dtype=float).reshape(-1, 2), patch_centers, patch_shifts
+
+
+def load_motioncor2_shifts_1_0_0(file_name: str) -> np.ndarray:
+    """
+    Read the raw full frame shifts of a motioncor2 shift file
+    without referencing them to the first frame.
+
+    Arguments:
+    file_name - Name of the motioncor2 shift file
+
+    Returns:
+    Numpy array of shape (n_frames, 2) containing the x and y shifts
+    """
+    full_frame: np.ndarray
+
+    full_frame, _, _ = parse_motioncor2_1_0_0(file_name)
+    if not full_frame.size:
+        raise IOError(f'No full frame shifts found in {file_name}')
+    return full_frame
+
+
 def load_motioncor2_1_0_0(file_name: str) -> pd.DataFrame:
     """
     Read the motioncor2 shift files.
@@ -40,18 +113,10 @@ def load_motioncor2_1_0_0(file_name: str) -> pd.DataFrame:
     Returns:
     Pandas data frame containing the extended header information
     """
-    output_data: pd.DataFrame
-
-    output_data = util.load_file(
-        file_name,
-        names=['shift_x', 'shift_y'],
-        usecols=[1, 2],
-        comment='#',
-        )
-    output_data['shift_x'] -= output_data['shift_x'].iloc[0]
-    output_data['shift_y'] -= output_data['shift_y'].iloc[0]
+    shifts: np.ndarray
 
-    return output_data
+    shifts = load_motioncor2_shifts_1_0_0(file_name)
+    return pd.DataFrame(shifts - shifts[0], columns=['shift_x', 'shift_y'])
 
 
 def load_motioncor2(
@@ -82,3 +147,108 @@ def load_motioncor2(
 
     function = util.extract_function_from_function_dict(function_dict, version)
     return function(file_name)
+
+
+def load_motioncor2_many(
+        file_names: typing.List[str],
+        version: typing.Optional[str]=None,
+        n_workers: int=1,
+        use_processes: bool=False
+    ) -> typing.Tuple[np.ndarray, np.ndarray, typing.List[str]]:
+    """
+    Load many motioncor2 shift files into a single trajectory array.
+    Movies with less frames are padded with nan.
+
+    Arguments:
+    file_names - Paths to the input motioncor2 files.
+    version - Motioncor2 version default the latest version
+    n_workers - Number of parallel workers (default 1)
+    use_processes - Use processes instead of threads (default False)
+
+    Returns:
+    Trajectory array of shape (n_movies, max_frames, 2), number of frames per movie, movie names
+    """
+    function_dict: typing.Dict[
+        str,
+        typing.Callable[
+            [str],
+            np.ndarray
+            ]
+        ]
+    function: typing.Callable[[str], np.ndarray]
+    trajectories: np.ndarray
+    n_frames: np.ndarray
+    movie_names: typing.List[str]
+
+    function_dict = {
+        '1.0.0': load_motioncor2_shifts_1_0_0,
+        }
+
+    function = util.extract_function_from_function_dict(function_dict, version)
+    trajectories, n_frames = util.stack_padded(
+        util.map_files(function, file_names, n_workers, use_processes)
+        )
+    trajectories -= trajectories[:, :1]
+    movie_names = [os.path.splitext(os.path.basename(file_name))[0] for file_name in file_names]
+
+    return trajectories, n_frames, movie_names
+
+
+def load_motioncor2_patches_1_0_0(
+        file_name: str
+    ) -> typing.Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+    """
+    Read the full frame and the local patch trajectories of a motioncor2 shift file.
+    All trajectories are referenced to their first frame.
+
+    Arguments:
+    file_name - Name of the motioncor2 shift file
+
+    Returns:
+    Pandas data frame containing the full frame shifts,
+    patch centers (n_patches, 2), patch trajectories (n_patches, n_frames, 2)
+    """
+    full_frame: np.ndarray
+    patch_centers: np.ndarray
+    patch_shifts: np.ndarray
+    output_data: pd.DataFrame
+
+    full_frame, patch_centers, patch_shifts = parse_motioncor2_1_0_0(file_name)
+    output_data = pd.DataFrame(full_frame, columns=['shift_x', 'shift_y'])
+    if full_frame.size:
+        output_data -= full_frame[0]
+    patch_shifts -= patch_shifts[:, :1]
+
+    return output_data, patch_centers, patch_shifts
+
+
+def load_motioncor2_patches(
+        file_name: str,
+        version: typing.Optional[str]=None
+    ) -> typing.Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+    """
+    Load the full frame and the local patch trajectories based on the version number
+
+    Arguments:
+    file_name - Path to the input motioncor2 file.
+    version - Motioncor2 version default the latest version
+
+    Returns:
+    Pandas data frame containing the full frame shifts,
+    patch centers (n_patches, 2), patch trajectories (n_patches, n_frames, 2)
+    """
+    function_dict: typing.Dict[
+        str,
+        typing.Callable[
+            [str],
+            typing.Tuple[pd.DataFrame, np.ndarray, np.ndarray]
+            ]
+        ]
+    function: typing.Callable[[str], typing.Tuple[pd.DataFrame, np.ndarray, np.ndarray]]
+
+    function_dict = {
+        '1.0.0': load_motioncor2_patches_1_0_0,
+        }
+
+    function = util.extract_function_from_function_dict(function_dict, version)
+    return function(file_name)
@@ -22,9 +22,98 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import glob
+import time
+import typing
+
 import mrcfile # type: ignore
+import numpy as np # type: ignore
 import pandas as pd # type: ignore
 
+from . import util
+
+
+def read_mrc_header(file_name: str) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """
+    Read the main header and the extended header of an mrc file.
+    Only the header bytes are read, the image data is not touched.
+
+    Arguments:
+    file_name - Name of the mrc file
+
+    Returns:
+    Main header record, extended header records
+    """
+    header: np.ndarray
+    extended_header: np.ndarray
+    header_bytes: bytes
+    extended_header_bytes: bytes
+    byte_order: str
+
+    with open(file_name, 'rb') as read:
+        header_bytes = read.read(mrcfile.dtypes.HEADER_DTYPE.itemsize)
+        if len(header_bytes) < mrcfile.dtypes.HEADER_DTYPE.itemsize:
+            raise IOError(f'Could not read enough bytes for the mrc header: {file_name}')
+
+        header = np.frombuffer(header_bytes, dtype=mrcfile.dtypes.HEADER_DTYPE)[0]
+        if header['map'] != mrcfile.constants.MAP_ID:
+            raise IOError(f'Map ID string not found in {file_name}')
+
+        try:
+            byte_order = mrcfile.utils.byte_order_from_machine_stamp(header['machst'])
+        except ValueError as err:
+            raise IOError(f'{file_name}: {err}') from err
+        header = np.frombuffer(
+            header_bytes,
+            dtype=mrcfile.dtypes.HEADER_DTYPE.newbyteorder(byte_order)
+            )[0]
+
+        extended_header_bytes = read.read(int(header['nsymbt']))
+        if len(extended_header_bytes) < int(header['nsymbt']):
+            raise IOError(f'Could not read enough bytes for the extended header: {file_name}')
+
+    if header['exttyp'] == b'FEI1':
+        extended_header = np.frombuffer(
+            extended_header_bytes,
+            dtype=mrcfile.dtypes.FEI_EXTENDED_HEADER_DTYPE,
+            count=len(extended_header_bytes) // mrcfile.dtypes.FEI_EXTENDED_HEADER_DTYPE.itemsize
+            )
+    else:
+        extended_header = np.frombuffer(extended_header_bytes, dtype='V1')
+
+    return header, extended_header
+
+
+def mmap_mrc_data(file_name: str) -> np.ndarray:
+    """
+    Memory map the image data of an mrc file read-only.
+    Only the header is read, the data is loaded on access.
+
+    Arguments:
+    file_name - Name of the mrc file
+
+    Returns:
+    Memory mapped numpy array of shape (nz, ny, nx)
+    """
+    header: np.ndarray
+    dtype: np.dtype
+
+    header, _ = read_mrc_header(file_name)
+    try:
+        dtype = mrcfile.utils.dtype_from_mode(header['mode']).newbyteorder(
+            header.dtype['mode'].byteorder
+            )
+    except ValueError as err:
+        raise IOError(f'{file_name}: {err}') from err
+
+    return np.memmap(
+        file_name,
+        dtype=dtype,
+        mode='r',
+        offset=mrcfile.dtypes.HEADER_DTYPE.itemsize + int(header['nsymbt']),
+        shape=(max(int(header['nz']), 1), int(header['ny']), int(header['nx'])),
+        )
+
 
 def load_mrc_header(file_name: str) -> pd.DataFrame:
     """
@@ -38,7 +127,203 @@ def load_mrc_header(file_name: str) -> pd.DataFrame:
     """
     output_data: pd.DataFrame
 
-    with mrcfile.open(file_name) as mrc:
-        output_data = pd.DataFrame(mrc.extended_header)
+    _, extended_header = read_mrc_header(file_name)
+    output_data = pd.DataFrame(extended_header)
 
     return output_data.iloc[0]
+
+
+def read_mrc_frame_records(file_name: str) -> np.ndarray:
+    """
+    Read the FEI extended header records of all frames of an mrc file.
+    The records are a read-only view on the header buffer.
+    Records beyond the number of sections are reserved space and are dropped.
+
+    Arguments:
+    file_name - Name of the mrc file
+
+    Returns:
+    Structured numpy array containing one extended header record per frame
+    """
+    header: np.ndarray
+    extended_header: np.ndarray
+
+    header, extended_header = read_mrc_header(file_name)
+    if extended_header.dtype.names is None:
+        raise IOError(f'{file_name} does not contain an FEI extended header')
+
+    return extended_header[:max(int(header['nz']), 1)]
+
+
+def load_mrc_extended_header(file_name: str) -> pd.DataFrame:
+    """
+    Read the complete FEI extended header of an mrc file.
+
+    Arguments:
+    file_name - Name of the mrc file
+
+    Returns:
+    Pandas data frame containing one row per frame
+    """
+    return pd.DataFrame(read_mrc_frame_records(file_name))
+
+
+def get_mrc_header_data(
+        file_name: str,
+        per_frame: bool=False
+    ) -> typing.Tuple[pd.DataFrame, float]:
+    """
+    Read the header information of a single mrc file into a data frame.
+
+    Arguments:
+    file_name - Name of the mrc file
+    per_frame - Return one row per extended header record instead of the first one
+
+    Returns:
+    Pandas data frame containing the header information, read time in seconds
+    """
+    header: np.ndarray
+    extended_header: np.ndarray
+    output_data: pd.DataFrame
+    start_time: float
+    read_time: float
+
+    start_time = time.perf_counter()
+    header, extended_header = read_mrc_header(file_name)
+    read_time = time.perf_counter() - start_time
+    if extended_header.dtype.names is not None:
+        extended_header = extended_header[:max(int(header['nz']), 1)]
+
+    if extended_header.dtype.names is None or extended_header.size == 0:
+        output_data = pd.DataFrame(index=[0])
+    elif per_frame:
+        output_data = pd.DataFrame(extended_header)
+        output_data['frame'] = np.arange(len(extended_header))
+    else:
+        output_data = pd.DataFrame(extended_header[:1])
+
+    output_data['file_name'] = file_name
+    output_data['nx'] = int(header['nx'])
+    output_data['ny'] = int(header['ny'])
+    output_data['nz'] = int(header['nz'])
+    output_data['mode'] = int(header['mode'])
+    output_data['PixelSize'] = float(header['cella']['x']) / max(int(header['mx']), 1)
+
+    return output_data, read_time
+
+
+def scan_mrc_headers(
+        file_names: typing.Union[str, typing.List[str]],
+        n_workers: int=8,
+        per_frame: bool=False
+    ) -> typing.Tuple[pd.DataFrame, typing.Dict[str, float]]:
+    """
+    Read the headers of many mrc files concurrently with a thread pool.
+
+    Arguments:
+    file_names - List of mrc files or a glob pattern
+    n_workers - Number of threads (default 8)
+    per_frame - Return one row per extended header record instead of one per file
+
+    Returns:
+    Pandas data frame containing the header information,
+    Dictionary with the 50, 90 and 99 percentile of the read time per file in seconds
+    """
+    results: typing.List[typing.Tuple[pd.DataFrame, float]]
+    read_times: np.ndarray
+
+    if isinstance(file_names, str):
+        file_names = sorted(glob.glob(file_names))
+    if not file_names:
+        raise IOError('No mrc files to scan')
+
+    results = util.map_files(
+        lambda file_name: get_mrc_header_data(file_name, per_frame),
+        file_names,
+        n_workers=n_workers
+        )
+    read_times = np.array([read_time for _, read_time in results])
+
+    return (
+        pd.concat([data for data, _ in results], ignore_index=True, sort=False),
+        {
+            f'p{percentile}': float(np.percentile(read_times, percentile))
+            for percentile in (50, 90, 99)
+            },
+        )
+
+
+def bin_image(image: np.ndarray, bin_factor: int) -> np.ndarray:
+    """
+    Sum bin_factor x bin_factor pixel blocks of an image.
+    Rows and columns that do not fill a complete block are cropped.
+
+    Arguments:
+    image - Image of shape (ny, nx)
+    bin_factor - Integer binning factor
+
+    Returns:
+    Binned image of shape (ny // bin_factor, nx // bin_factor)
+    """
+    n_y: int
+    n_x: int
+
+    assert bin_factor > 0, f'Bin factor needs to be positive: {bin_factor}'
+    if bin_factor == 1:
+        return image
+
+    n_y = image.shape[0] // bin_factor
+    n_x = image.shape[1] // bin_factor
+    return image[:n_y*bin_factor, :n_x*bin_factor].reshape(
+        n_y,
+        bin_factor,
+        n_x,
+        bin_factor
+        ).sum(axis=(1, 3))
+
+
+def sum_mrc_frames(
+        file_name: str,
+        output_file: typing.Optional[str]=None,
+        bin_factor: int=1,
+        average: bool=False,
+        chunk_size: int=4
+    ) -> np.ndarray:
+    """
+    Sum the frames of a memory mapped mrc stack chunk by chunk into a float32 image.
+    Only chunk_size frames are read at the same time.
+
+    Arguments:
+    file_name - Name of the mrc stack
+    output_file - Write the result as mrc file if provided (default None)
+    bin_factor - Integer binning factor (default 1)
+    average - Return the average instead of the sum (default False)
+    chunk_size - Number of frames that are summed at the same time (default 4)
+
+    Returns:
+    Numpy float32 array containing the summed image
+    """
+    header: np.ndarray
+    stack: np.ndarray
+    accumulator: np.ndarray
+    pixel_size: float
+
+    assert chunk_size > 0, f'Chunk size needs to be positive: {chunk_size}'
+    header, _ = read_mrc_header(file_name)
+    stack = mmap_mrc_data(file_name)
+
+    accumulator = np.zeros(stack.shape[1:], dtype=np.float32)
+    for start in range(0, stack.shape[0], chunk_size):
+        accumulator += stack[start:start+chunk_size].sum(axis=0, dtype=np.float32)
+
+    accumulator = bin_image(accumulator, bin_factor)
+    if average:
+        accumulator /= stack.shape[0] * bin_factor**2
+
+    if output_file is not None:
+        pixel_size = float(header['cella']['x']) / max(int(header['mx']), 1)
+        with mrcfile.new(output_file, overwrite=True) as mrc:
+            mrc.set_data(accumulator)
+            mrc.voxel_size = pixel_size * bin_factor
+
+    return accumulator
@@ -0,0 +1,173 @@
+"""
+MIT License
+
+Copyright (c) 2018 Max Planck Institute of Molecular Physiology
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import collections
+import os
+import typing
+
+import numpy as np # type: ignore
+import pandas as pd # type: ignore
+
+from . import mrc
+
+
+def parse_image_names(image_names: pd.Series) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """
+    Split star file image names of the form index@stack into stack names and indices.
+
+    Arguments:
+    image_names - Image names in the star file notation, the index starts at 1
+
+    Returns:
+    Array of stack names, array of zero based indices
+    """
+    split_names: pd.DataFrame
+    indices: np.ndarray
+
+    split_names = pd.Series(image_names).astype(str).str.split('@', n=1, expand=True)
+    if split_names.shape[1] != 2 or split_names[1].isnull().any():
+        raise IOError('Image names need to be in the format index@stack')
+
+    indices = split_names[0].astype(int).values - 1
+    if (indices < 0).any():
+        raise IOError('Image name indices need to start at 1')
+
+    return split_names[1].values, indices
+
+
+class ParticleImageSource:
+    """
+    Lazy access to the particle images referenced in the ImageName column of a star file.
+    Every stack is memory mapped once and kept in a least recently used cache.
+    """
+
+    def __init__(
+            self,
+            star_data: pd.DataFrame,
+            project_directory: str='',
+            max_open_stacks: int=64
+        ) -> None:
+        """
+        Parse the image names of the star data.
+
+        Arguments:
+        star_data - Pandas data frame containing the ImageName column
+        project_directory - Directory the stack names are relative to (default '')
+        max_open_stacks - Maximum number of memory mapped stacks (default 64)
+
+        Returns:
+        None
+        """
+        assert max_open_stacks > 0, f'max_open_stacks needs to be positive: {max_open_stacks}'
+        self.stack_names: np.ndarray
+        self.indices: np.ndarray
+        self.project_directory: str = project_directory
+        self.max_open_stacks: int = max_open_stacks
+        self._open_stacks: typing.MutableMapping[str, np.ndarray] = collections.OrderedDict()
+
+        self.stack_names, self.indices = parse_image_names(star_data['ImageName'])
+
+    def __len__(self) -> int:
+        """
+        Number of particles.
+
+        Arguments:
+        None
+
+        Returns:
+        Number of particles
+        """
+        return len(self.indices)
+
+    def __enter__(self) -> 'ParticleImageSource':
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Release all memory mapped stacks.
+
+        Arguments:
+        None
+
+        Returns:
+        None
+        """
+        self._open_stacks.clear()
+
+    def get_stack(self, stack_name: str) -> np.ndarray:
+        """
+        Return the memory mapped stack and mark it as recently used.
+
+        Arguments:
+        stack_name - Name of the stack as written in the star file
+
+        Returns:
+        Memory mapped numpy array of shape (n_images, ny, nx)
+        """
+        stack: np.ndarray
+
+        try:
+            stack = self._open_stacks.pop(stack_name)
+        except KeyError:
+            stack = mrc.mmap_mrc_data(os.path.join(self.project_directory, stack_name))
+            while len(self._open_stacks) >= self.max_open_stacks:
+                self._open_stacks.pop(next(iter(self._open_stacks)))
+        self._open_stacks[stack_name] = stack
+        return stack
+
+    def get_images(self, rows: typing.Union[typing.Sequence[int], np.ndarray]) -> np.ndarray:
+        """
+        Return the particle images of the requested rows.
+        Rows of the same stack are read together with a single fancy index.
+
+        Arguments:
+        rows - Row positions in the star data
+
+        Returns:
+        Numpy array of shape (n_rows, ny, nx)
+        """
+        row_array: np.ndarray
+        stack_names: np.ndarray
+        output_array: typing.Optional[np.ndarray]
+        stack: np.ndarray
+        mask: np.ndarray
+
+        row_array = np.asarray(rows, dtype=int)
+        stack_names = self.stack_names[row_array]
+        output_array = None
+        for stack_name in pd.unique(stack_names):
+            stack = self.get_stack(stack_name)
+            if output_array is None:
+                output_array = np.empty((len(row_array),) + stack.shape[1:], dtype=stack.dtype)
+            elif stack.shape[1:] != output_array.shape[1:]:
+                raise IOError(f'Image size of {stack_name} does not match: {stack.shape[1:]}')
+            mask = stack_names == stack_name
+            output_array[mask] = stack[self.indices[row_array[mask]]]
+
+        if output_array is None:
+            return np.empty((0, 0, 0), dtype=np.float32)
+        return output_array
@@ -0,0 +1,379 @@
+"""
+MIT License
+
+Copyright (c) 2018 Max Planck Institute of Molecular Physiology
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import collections
+import concurrent.futures
+import os
+import tempfile
+import typing
+
+import numpy as np # type: ignore
+
+from . import table
+
+
+STRING_DTYPE = 'str'
+STRING_SEPARATOR = '\x00'
+# Memory backed file system if available, so the files never touch the disk.
+SHARED_DIRECTORY = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+SHARED_PREFIX = 'transphire_shared_'
+
+
+def create_shared_block(size: int) -> typing.Tuple[str, np.memmap]:
+    """
+    Create a new memory mapped file in the shared directory.
+
+    Arguments:
+    size - Size of the block in bytes
+
+    Returns:
+    File name and writable uint8 memmap of the block
+    """
+    file_descriptor: int
+    block_name: str
+
+    file_descriptor, block_name = tempfile.mkstemp(prefix=SHARED_PREFIX, dir=SHARED_DIRECTORY)
+    try:
+        # Empty files cannot be mapped
+        os.ftruncate(file_descriptor, max(size, 1))
+    except OSError:
+        os.close(file_descriptor)
+        os.remove(block_name)
+        raise
+    os.close(file_descriptor)
+    return block_name, np.memmap(block_name, dtype=np.uint8, mode='r+')
+
+
+def string_column_to_shared(values: np.ndarray) -> typing.Tuple[str, np.memmap]:
+    """
+    Copy a string column into a shared block.
+    The values are stored as utf-8 text separated by NUL characters.
+    The block starts with a header of length + 2 int64 values: the character offsets
+    of the length + 1 value boundaries followed by the size of the text in bytes.
+
+    Arguments:
+    values - Object array of strings
+
+    Returns:
+    File name and writable uint8 memmap of the block
+    """
+    header: np.ndarray
+    text: bytes
+    block_name: str
+    block: np.memmap
+
+    for value in values:
+        if not isinstance(value, str):
+            raise IOError(f'Only str values are supported in object columns: {value!r}')
+
+    text = STRING_SEPARATOR.join(values).encode('utf-8')
+    header = np.zeros(len(values) + 2, dtype=np.int64)
+    np.cumsum([len(value) + 1 for value in values], out=header[1:-1])
+    header[-1] = len(text)
+
+    block_name, block = create_shared_block(header.nbytes + len(text))
+    block[:header.nbytes] = header.view(np.uint8)
+    block[header.nbytes:header.nbytes + len(text)] = np.frombuffer(text, dtype=np.uint8)
+    return block_name, block
+
+
+def table_to_shared(data: table.Table) -> typing.List[typing.Tuple[str, str, int, str]]:
+    """
+    Copy every column of the table into its own shared block.
+    The blocks are flushed but not removed, table_from_shared takes ownership.
+
+    Arguments:
+    data - Table with numeric or str columns
+
+    Returns:
+    List of (column name, dtype, length, block name) entries
+    """
+    descriptor: typing.List[typing.Tuple[str, str, int, str]]
+    block_names: typing.List[str]
+    block_name: str
+    block: np.memmap
+    dtype: str
+
+    descriptor = []
+    block_names = []
+    try:
+        for name in data:
+            values = np.ascontiguousarray(data[name])
+            if values.dtype == object:
+                block_name, block = string_column_to_shared(values)
+                dtype = STRING_DTYPE
+            else:
+                block_name, block = create_shared_block(values.nbytes)
+                block[:values.nbytes] = values.view(np.uint8)
+                dtype = values.dtype.str
+            block_names.append(block_name)
+            block.flush()
+            del block
+            descriptor.append((name, dtype, len(values), block_name))
+    except (OSError, ValueError):
+        unlink_shared([[('', '', 0, block_name) for block_name in block_names]])
+        raise
+
+    return descriptor
+
+
+def attach_shared_block(block_name: str) -> np.memmap:
+    """
+    Map an existing shared block and remove its file.
+    The mapping stays valid until the returned memmap is released.
+    Changes to the memmap are private to this process.
+
+    Arguments:
+    block_name - File name of the block
+
+    Returns:
+    Copy on write uint8 memmap of the block
+    """
+    block: np.memmap
+
+    block = np.memmap(block_name, dtype=np.uint8, mode='c')
+    os.remove(block_name)
+    return block
+
+
+def read_shared_column(block: np.memmap, dtype: str, length: int) -> np.ndarray:
+    """
+    Read a column of table_to_shared from its block.
+
+    Arguments:
+    block - Memmap of the block
+    dtype - Dtype string of the column or STRING_DTYPE
+    length - Number of rows
+
+    Returns:
+    View on the block for numeric columns, decoded object array for str columns
+    """
+    header: np.ndarray
+    text: str
+    values: typing.List[str]
+
+    if dtype != STRING_DTYPE:
+        return np.asarray(block[:length * np.dtype(dtype).itemsize]).view(np.dtype(dtype))
+
+    header = np.asarray(block[:(length + 2) * 8]).view(np.int64).copy()
+    text = block[header.nbytes:header.nbytes + header[-1]].tobytes().decode('utf-8')
+    values = text.split(STRING_SEPARATOR) if length else []
+    if len(values) != length:
+        # A value contains the separator itself, so fall back to the offsets.
+        values = [text[start:stop - 1] for start, stop in zip(header[:-2], header[1:-1])]
+    return np.array(values, dtype=object)
+
+
+def unlink_shared(
+        descriptor_list: typing.List[typing.List[typing.Tuple[str, str, int, str]]]
+    ) -> None:
+    """
+    Remove all block files of the descriptors that still exist.
+
+    Arguments:
+    descriptor_list - List of table_to_shared results
+
+    Returns:
+    None
+    """
+    for descriptor in descriptor_list:
+        for _, _, _, block_name in descriptor:
+            try:
+                os.remove(block_name)
+            except FileNotFoundError:
+                pass
+
+
+def table_from_shared(descriptor: typing.List[typing.Tuple[str, str, int, str]]) -> table.Table:
+    """
+    Create a table from the shared blocks of table_to_shared.
+    Numeric columns are views on the blocks, str columns are decoded once.
+    The block files are removed and the memory is released together with the table.
+
+    Arguments:
+    descriptor - List of (column name, dtype, length, block name) entries
+
+    Returns:
+    Table
+    """
+    blocks: typing.List[np.memmap]
+    block: np.memmap
+    columns: typing.Dict[str, np.ndarray]
+
+    blocks = []
+    columns = collections.OrderedDict()
+    try:
+        for name, dtype, length, block_name in descriptor:
+            block = attach_shared_block(block_name)
+            columns[name] = read_shared_column(block, dtype, length)
+            if dtype != STRING_DTYPE:
+                blocks.append(block)
+    finally:
+        unlink_shared([descriptor])
+
+    return table.Table(columns, buffers=blocks)
+
+
+def concatenate_shared(
+        descriptor_list: typing.List[typing.List[typing.Tuple[str, str, int, str]]]
+    ) -> table.Table:
+    """
+    Concatenate the tables of table_to_shared into a single table.
+    Every column is copied once from the blocks into a preallocated output array.
+    A single table is returned as views on its blocks without copying.
+
+    Arguments:
+    descriptor_list - List of table_to_shared results
+
+    Returns:
+    Table
+    """
+    column_dict: typing.Dict[str, typing.List[typing.Tuple[str, int, str]]]
+    columns: typing.Dict[str, np.ndarray]
+    output: np.ndarray
+
+    if not descriptor_list:
+        raise IOError('Cannot concatenate empty sequence')
+    if len(descriptor_list) == 1:
+        return table_from_shared(descriptor_list[0])
+
+    try:
+        column_dict = collections.OrderedDict(
+            (name, []) for name, _, _, _ in descriptor_list[0]
+            )
+        for descriptor in descriptor_list:
+            if sorted(entry[0] for entry in descriptor) != sorted(column_dict):
+                raise IOError(f'Columns do not match: {[entry[0] for entry in descriptor]}')
+            for name, dtype, length, block_name in descriptor:
+                column_dict[name].append((dtype, length, block_name))
+
+        columns = collections.OrderedDict()
+        for name, entries in column_dict.items():
+            output = np.empty(
+                sum(length for _, length, _ in entries),
+                dtype=object if STRING_DTYPE in [dtype for dtype, _, _ in entries] else
+                np.result_type(*[np.dtype(dtype) for dtype, _, _ in entries])
+                )
+            copy_shared_entries(entries, output)
+            columns[name] = output
+    finally:
+        unlink_shared(descriptor_list)
+
+    return table.Table(columns)
+
+
+def copy_shared_entries(
+        entries: typing.List[typing.Tuple[str, int, str]],
+        output: np.ndarray
+    ) -> None:
+    """
+    Copy the blocks of a column one after another into the output array.
+
+    Arguments:
+    entries - List of (dtype, length, block name) entries
+    output - Output array with the summed length of the entries
+
+    Returns:
+    None
+    """
+    start: int
+
+    start = 0
+    for dtype, length, block_name in entries:
+        output[start:start + length] = read_shared_column(
+            attach_shared_block(block_name),
+            dtype,
+            length
+            )
+        start += length
+
+
+def load_chunk_to_shared(
+        function: typing.Callable[[str], table.Table],
+        file_names: typing.List[str]
+    ) -> typing.List[typing.Tuple[str, str, int, str]]:
+    """
+    Load a chunk of files and move the concatenated table into shared blocks.
+    Used as the worker function of load_many_shared.
+
+    Arguments:
+    function - Function returning a Table, needs to be picklable
+    file_names - Names of the files to load
+
+    Returns:
+    List of (column name, dtype, length, block name) entries
+    """
+    return table_to_shared(
+        table.concatenate_tables([function(file_name) for file_name in file_names])
+        )
+
+
+def load_many_shared(
+        function: typing.Callable[[str], table.Table],
+        file_names: typing.List[str],
+        n_workers: int=1
+    ) -> table.Table:
+    """
+    Load the files in a process pool and concatenate the tables.
+    Every worker loads a contiguous chunk of files and hands the concatenated
+    columns back via memory mapped files instead of pickling them.
+    The files are placed in /dev/shm if available, otherwise in the temporary directory.
+    With a single worker, the files are loaded directly.
+    The process start up only pays off for large files,
+    many small files are loaded faster with threads.
+
+    Arguments:
+    function - Function returning a Table, needs to be picklable
+    file_names - List of file names
+    n_workers - Number of worker processes (default 1)
+
+    Returns:
+    Table with the rows of all files in input order
+    """
+    chunks: typing.List[typing.List[str]]
+    futures: typing.List[concurrent.futures.Future]
+    errors: typing.List[typing.Optional[BaseException]]
+
+    if not file_names:
+        raise IOError('Cannot load files from empty sequence')
+    if n_workers <= 1:
+        return table.concatenate_tables([function(file_name) for file_name in file_names])
+
+    chunks = [
+        [file_names[idx] for idx in indices]
+        for indices in np.array_split(np.arange(len(file_names)), min(n_workers, len(file_names)))
+        ]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=n_workers) as executor:
+        futures = [executor.submit(load_chunk_to_shared, function, chunk) for chunk in chunks]
+
+    # All futures are done here, so no worker creates blocks anymore.
+    errors = [future.exception() for future in futures]
+    for error in errors:
+        if error is not None:
+            unlink_shared([
+                future.result() for future, entry in zip(futures, errors) if entry is None
+                ])
+            raise error
+
+    return concatenate_shared([future.result() for future in futures])
@@ -27,6 +27,8 @@ import os
 import glob
 import typing
 import pandas as pd # type: ignore
+from . import shared
+from . import table
 from . import util
 
 FILE_DIRECTORY: str = os.path.dirname(os.path.realpath(__file__))
@@ -52,7 +54,7 @@ def create_star_header(names: typing.List[str], prefix: str) -> typing.List[str]
     return output_list
 
 
-def dump_star(file_name: str, data: pd.DataFrame, version: str) -> None:
+def dump_star(file_name: str, data: pd.DataFrame, version: str, append: bool=False) -> None:
     """
     Create a star file.
 
@@ -60,6 +62,7 @@ def dump_star(file_name: str, data: pd.DataFrame, version: str) -> None:
     file_name - File name to export
     data - Data to export
     version - output version string
+    append - Append the data to an existing star file without header (default False)
 
     Returns:
     None
@@ -76,7 +79,8 @@ def dump_star(file_name: str, data: pd.DataFrame, version: str) -> None:
         file_name=file_name,
         data=data[old_header],
         header=header,
-        vertical=True
+        vertical=True,
+        append=append
         )
 
 
@@ -132,6 +136,51 @@ def load_star(file_name: str) -> pd.DataFrame:
     return star_data
 
 
+def load_star_table(file_name: str) -> table.Table:
+    """
+    Load a star file as Table.
+
+    Arguments:
+    file_name - Path to the star file
+
+    Returns:
+    Table containing the star file
+    """
+    return table.Table.from_pandas(load_star(file_name))
+
+
+def load_star_many(
+        file_names: typing.List[str],
+        n_workers: int=1,
+        as_table: bool=False,
+        use_shared_memory: bool=False
+    ) -> typing.Union[pd.DataFrame, table.Table]:
+    """
+    Load many star files with the same columns into a single table.
+
+    Arguments:
+    file_names - Paths to the star files
+    n_workers - Number of parallel workers (default 1)
+    as_table - Return a Table instead of a pandas data frame (default False)
+    use_shared_memory - Load file chunks in processes returning via shared memory (default False)
+
+    Returns:
+    Pandas dataframe or Table containing the information of all files
+    """
+    star_table: table.Table
+
+    if not file_names:
+        raise IOError('Cannot load star files from empty sequence')
+
+    if use_shared_memory:
+        star_table = shared.load_many_shared(load_star_table, file_names, n_workers=n_workers)
+    else:
+        star_table = table.concatenate_tables(
+            util.map_files(load_star_table, file_names, n_workers=n_workers)
+            )
+    return star_table if as_table else star_table.to_pandas()
+
+
 def import_star_header(header_names: typing.List[str]) -> typing.List[str]:
     """
     Get the header keys.
@@ -0,0 +1,290 @@
+"""
+MIT License
+
+Copyright (c) 2018 Max Planck Institute of Molecular Physiology
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import collections
+import typing
+
+import numpy as np # type: ignore
+import pandas as pd # type: ignore
+
+
+class Table:
+    """
+    Lightweight columnar table of one dimensional numpy arrays with the same length.
+    Slices share the memory of the parent table, masks and index arrays create copies.
+    """
+    __slots__ = ('_columns', '_length', '_buffers')
+
+    def __init__(
+            self,
+            columns: typing.Optional[typing.Mapping[str, typing.Any]]=None,
+            buffers: typing.Optional[typing.List[typing.Any]]=None
+        ) -> None:
+        """
+        Create the table from a mapping of column names to array like values.
+        The column order of the mapping is kept.
+
+        Arguments:
+        columns - Mapping of column names to array like values (default None)
+        buffers - Objects owning the memory of the columns, kept alive with the table (default None)
+
+        Returns:
+        None
+        """
+        self._columns: typing.Dict[str, np.ndarray] = collections.OrderedDict()
+        self._length: typing.Optional[int] = None
+        self._buffers: typing.List[typing.Any] = [] if buffers is None else buffers
+
+        if columns is not None:
+            for name, values in columns.items():
+                self[name] = values
+
+    def __len__(self) -> int:
+        """
+        Number of rows.
+
+        Arguments:
+        None
+
+        Returns:
+        Number of rows
+        """
+        return 0 if self._length is None else self._length
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._columns
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(self._columns)
+
+    def __repr__(self) -> str:
+        return f'Table(rows={len(self)}, columns={self.column_names})'
+
+    def __getitem__(self, key: typing.Any) -> typing.Any:
+        """
+        Return a column by name or a table with the selected rows.
+
+        Arguments:
+        key - Column name, slice, boolean mask or index array
+
+        Returns:
+        Numpy array for a column name, otherwise Table
+        """
+        if isinstance(key, str):
+            return self._columns[key]
+        return Table(
+            collections.OrderedDict(
+                (name, values[key]) for name, values in self._columns.items()
+                ),
+            buffers=self._buffers if isinstance(key, slice) else None
+            )
+
+    def __setitem__(self, name: str, values: typing.Any) -> None:
+        """
+        Add or replace a column.
+
+        Arguments:
+        name - Column name
+        values - Array like values with one entry per row
+
+        Returns:
+        None
+        """
+        array: np.ndarray
+
+        array = np.asarray(values)
+        if array.ndim != 1:
+            raise IOError(f'Column {name} needs to be one dimensional: {array.shape}')
+        if self._length is None or not self._columns:
+            self._length = len(array)
+        elif len(array) != self._length:
+            raise IOError(f'Column {name} has {len(array)} rows instead of {self._length}')
+        self._columns[name] = array
+
+    def __delitem__(self, name: str) -> None:
+        del self._columns[name]
+
+    @property
+    def column_names(self) -> typing.List[str]:
+        """
+        Names of the columns in table order.
+
+        Arguments:
+        None
+
+        Returns:
+        List of names
+        """
+        return list(self._columns)
+
+    @property
+    def schema(self) -> typing.Dict[str, np.dtype]:
+        """
+        Data type of every column.
+
+        Arguments:
+        None
+
+        Returns:
+        Dictionary with the column name as key and the numpy dtype as value
+        """
+        return collections.OrderedDict(
+            (name, values.dtype) for name, values in self._columns.items()
+            )
+
+    def copy(self) -> 'Table':
+        """
+        Copy the table including the column data.
+
+        Arguments:
+        None
+
+        Returns:
+        Table
+        """
+        return Table(
+            collections.OrderedDict(
+                (name, values.copy()) for name, values in self._columns.items()
+                )
+            )
+
+    def to_pandas(self) -> pd.DataFrame:
+        """
+        Convert the table to a pandas data frame.
+
+        Arguments:
+        None
+
+        Returns:
+        Pandas data frame with the same column order
+        """
+        return pd.DataFrame(self._columns, columns=self.column_names)
+
+    @classmethod
+    def from_pandas(cls, data: pd.DataFrame) -> 'Table':
+        """
+        Create a table from a pandas data frame.
+        Columns of a single dtype block are not copied.
+
+        Arguments:
+        data - Pandas data frame
+
+        Returns:
+        Table
+        """
+        return cls(
+            collections.OrderedDict(
+                (name, np.asarray(data[name])) for name in data.columns
+                )
+            )
+
+
+def concatenate_tables(tables: typing.Sequence[Table]) -> Table:
+    """
+    Concatenate the rows of tables with the same columns.
+    The column order of the first table is used.
+
+    Arguments:
+    tables - Tables to concatenate
+
+    Returns:
+    Table
+    """
+    column_names: typing.List[str]
+
+    if not tables:
+        raise IOError('Cannot concatenate empty sequence')
+
+    column_names = tables[0].column_names
+    for table in tables:
+        if sorted(table.column_names) != sorted(column_names):
+            raise IOError(f'Columns do not match: {table.column_names} != {column_names}')
+
+    return Table(
+        collections.OrderedDict(
+            (name, np.concatenate([table[name] for table in tables]))
+            for name in column_names
+            )
+        )
+
+
+def infer_column(values: typing.Sequence[str]) -> np.ndarray:
+    """
+    Convert text values to the narrowest of int64, float64 or object.
+
+    Arguments:
+    values - Text values of a single column
+
+    Returns:
+    Numpy array
+    """
+    text: np.ndarray
+
+    text = np.array(values, dtype=str)
+    for dtype in (np.int64, np.float64):
+        try:
+            return text.astype(dtype)
+        except (ValueError, OverflowError):
+            pass
+    return np.array(values, dtype=object)
+
+
+def load_text_table(
+        file_name: str,
+        names: typing.List[str],
+        skiprows: int=0
+    ) -> Table:
+    """
+    Load a whitespace separated text file without pandas.
+    Every column is typed like read_csv would do: int64, float64 or object.
+
+    Arguments:
+    file_name - Name of the file that contains the data
+    names - Column names
+    skiprows - Nr of rows to skip (default 0)
+
+    Returns:
+    Table
+    """
+    rows: typing.List[typing.List[str]]
+
+    with open(file_name, 'r') as read:
+        rows = [line.split() for line in read.readlines()[skiprows:]]
+    rows = [row for row in rows if row]
+
+    for row in rows:
+        if len(row) != len(names):
+            raise IOError(f'{file_name} row has {len(row)} instead of {len(names)} columns')
+
+    if not rows:
+        return Table(
+            collections.OrderedDict(
+                (name, np.empty(0, dtype=float)) for name in names
+                )
+            )
+    return Table(
+        collections.OrderedDict(
+            (name, infer_column(values)) for name, values in zip(names, zip(*rows))
+            )
+        )
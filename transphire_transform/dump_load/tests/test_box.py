@@ -24,6 +24,7 @@ SOFTWARE.
 
 import os
 
+import numpy as np
 import pytest
 import pandas as pd
 
@@ -78,3 +79,113 @@ class TestLoadBox:
         input_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'box_eman1.box')
         with pytest.raises(KeyError):
             return_frame = box.load_box(input_file, 'dummy')
+
+
+class TestLoadBoxMany:
+
+    def test_two_files_should_return_combined_array(self):
+        input_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'box_eman1.box')
+        coordinates, micrograph_index = box.load_box_many([input_file, input_file])
+        assert coordinates.shape == (20, 2)
+        assert coordinates.dtype == np.float32
+        assert micrograph_index.tolist() == [0] * 10 + [1] * 10
+
+    def test_coordinates_should_match_load_box(self):
+        input_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'box_eman1.box')
+        coordinates, _ = box.load_box_many([input_file], dtype=np.int32)
+        assert np.array_equal(coordinates, box.load_box(input_file, 'eman1').values)
+
+    def test_empty_file_should_be_skipped(self, tmpdir):
+        input_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'box_eman1.box')
+        empty_file = tmpdir.join('empty.box')
+        empty_file.write('')
+        coordinates, micrograph_index = box.load_box_many([str(empty_file), input_file], n_workers=2)
+        assert coordinates.shape == (10, 2)
+        assert micrograph_index.tolist() == [1] * 10
+
+    def test_unknown_key_should_raise_KeyError(self):
+        input_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'box_eman1.box')
+        with pytest.raises(KeyError):
+            box.load_box_many([input_file], 'dummy')
+
+    def test_empty_list_should_raise_ioerror(self):
+        with pytest.raises(IOError):
+            box.load_box_many([])
+
+
+class TestLoadBoxFormats:
+
+    @pytest.mark.parametrize('version, file_name', [
+        ('eman2', 'box_eman1.box'),
+        ('eman2_json', 'box_eman2.json'),
+        ('cryolo', 'box_cryolo.cbox'),
+        ('relion', 'box_relion_autopick.star'),
+        ])
+    def test_format_should_match_eman1(self, version, file_name):
+        input_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, file_name)
+        eman1_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'box_eman1.box')
+        return_frame = box.load_box(input_file, version)
+        assert np.array_equal(return_frame.values, box.load_box(eman1_file, 'eman1').values)
+        assert return_frame.columns.tolist() == ['CoordinateX', 'CoordinateY']
+
+    def test_load_box_many_cryolo_should_return_combined_array(self):
+        input_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'box_cryolo.cbox')
+        coordinates, micrograph_index = box.load_box_many([input_file, input_file], 'cryolo')
+        assert coordinates.shape == (20, 2)
+        assert micrograph_index.tolist() == [0] * 10 + [1] * 10
+
+
+class TestDumpBox:
+
+    @pytest.mark.parametrize('version', ['eman1', 'eman2', 'eman2_json', 'cryolo', 'relion'])
+    def test_roundtrip_should_return_same_coordinates(self, tmpdir, version):
+        input_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'box_eman1.box')
+        output_file = tmpdir.join(f'output_{version}.txt')
+        box_data = box.load_box(input_file, 'eman1')
+        box.dump_box(str(output_file), box_data, version, box_size=352)
+        return_frame = box.load_box(str(output_file), version)
+        assert np.array_equal(return_frame.values, box_data.values)
+
+    def test_eman1_should_write_lower_left_corner(self, tmpdir):
+        input_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'box_eman1.box')
+        output_file = tmpdir.join('output.box')
+        box.dump_box(str(output_file), box.load_box(input_file, 'eman1'), 'eman1', box_size=352)
+        assert np.array_equal(box.load_eman1_raw(str(output_file)), box.load_eman1_raw(input_file))
+
+    def test_cryolo_should_keep_confidence(self, tmpdir):
+        output_file = tmpdir.join('output.cbox')
+        box_data = pd.DataFrame({'CoordinateX': [10.0], 'CoordinateY': [20.0], 'confidence': [0.5]})
+        box.dump_box(str(output_file), box_data, 'cryolo', box_size=10)
+        assert output_file.read().split() == ['5', '15', '10', '10', '0.5']
+
+    def test_relion_2_should_write_relion_2_header(self, tmpdir):
+        output_file = tmpdir.join('output.star')
+        box_data = pd.DataFrame({'CoordinateX': [10.0], 'CoordinateY': [20.0]})
+        box.dump_box(str(output_file), box_data, 'relion', star_version='relion_2')
+        assert '_rlnCoordinateX' in output_file.read()
+        assert np.array_equal(box.load_box(str(output_file), 'relion').values, box_data.values)
+
+    @pytest.mark.parametrize('version', ['eman1', 'eman2', 'cryolo'])
+    def test_missing_box_size_should_raise_ioerror(self, tmpdir, version):
+        output_file = tmpdir.join('output.box')
+        box_data = pd.DataFrame({'CoordinateX': [100.0], 'CoordinateY': [200.0]})
+        with pytest.raises(IOError):
+            box.dump_box(str(output_file), box_data, version)
+
+    @pytest.mark.parametrize('box_size', [0, -10])
+    def test_non_positive_box_size_should_raise_ioerror(self, tmpdir, box_size):
+        output_file = tmpdir.join('output.box')
+        box_data = pd.DataFrame({'CoordinateX': [100.0], 'CoordinateY': [200.0]})
+        with pytest.raises(IOError):
+            box.dump_box(str(output_file), box_data, 'eman1', box_size=box_size)
+
+    def test_eman2_json_without_box_size_should_write_boxes(self, tmpdir):
+        output_file = tmpdir.join('output.json')
+        box_data = pd.DataFrame({'CoordinateX': [100.0], 'CoordinateY': [200.0]})
+        box.dump_box(str(output_file), box_data, 'eman2_json')
+        assert np.array_equal(box.load_box(str(output_file), 'eman2_json').values, box_data.values)
+
+    def test_unknown_key_should_raise_KeyError(self, tmpdir):
+        output_file = tmpdir.join('output.box')
+        with pytest.raises(KeyError):
+            box.dump_box(str(output_file), pd.DataFrame(), 'dummy')
@@ -0,0 +1,103 @@
+"""
+MIT License
+
+Copyright (c) 2018 Max Planck Institute of Molecular Physiology
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from .. import convert
+from .. import cter
+from .. import ctffind
+from .. import star
+
+THIS_DIR = os.path.dirname(os.path.realpath(__file__))
+OUTPUT_TEST_FOLDER = 'OUTPUT_TESTS_CONVERT'
+INPUT_TEST_FOLDER = '../../../test_files'
+
+
+@pytest.fixture('module')
+def ctffind_files():
+    return [os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'ctffind.txt')] * 5
+
+
+class TestSplitIntoChunks:
+
+    def test_five_entries_chunk_two_should_return_three_chunks(self):
+        assert list(convert.split_into_chunks(list('abcde'), 2)) == [['a', 'b'], ['c', 'd'], ['e']]
+
+    def test_empty_list_should_return_no_chunk(self):
+        assert list(convert.split_into_chunks([], 2)) == []
+
+    def test_chunk_size_zero_should_raise_assertionerror(self):
+        with pytest.raises(AssertionError):
+            list(convert.split_into_chunks(list('abcde'), 0))
+
+
+class TestCtffindToCter:
+
+    def test_chunked_output_should_match_direct_dump(self, tmpdir, ctffind_files):
+        output_dir = tmpdir.mkdir(OUTPUT_TEST_FOLDER)
+        expected_file = str(output_dir.join('expected.txt'))
+        output_file = str(output_dir.join('output.txt'))
+        data = pd.concat([ctffind.load_ctffind(entry) for entry in ctffind_files], ignore_index=True)
+        cter.dump_cter(expected_file, data)
+
+        convert.ctffind_to_cter(ctffind_files, output_file, chunk_size=2)
+        with open(expected_file, 'r') as read:
+            expected_content = read.read()
+        with open(output_file, 'r') as read:
+            assert read.read() == expected_content
+
+    def test_should_return_number_of_rows(self, tmpdir, ctffind_files):
+        output_file = str(tmpdir.mkdir(OUTPUT_TEST_FOLDER).join('output.txt'))
+        n_rows, rows_per_second = convert.ctffind_to_cter(ctffind_files, output_file, chunk_size=2)
+        assert n_rows == 5
+        assert rows_per_second > 0
+
+    def test_empty_list_should_raise_ioerror(self, tmpdir):
+        output_file = str(tmpdir.mkdir(OUTPUT_TEST_FOLDER).join('output.txt'))
+        with pytest.raises(IOError):
+            convert.ctffind_to_cter([], output_file)
+
+
+class TestCtffindToStar:
+
+    def test_chunked_output_should_load_all_rows(self, tmpdir, ctffind_files):
+        output_file = str(tmpdir.mkdir(OUTPUT_TEST_FOLDER).join('output.star'))
+        convert.ctffind_to_star(ctffind_files, output_file, 'relion_3', chunk_size=2)
+        assert len(star.load_star(output_file)) == 5
+
+    def test_chunked_output_should_match_direct_dump(self, tmpdir, ctffind_files):
+        output_dir = tmpdir.mkdir(OUTPUT_TEST_FOLDER)
+        expected_file = str(output_dir.join('expected.star'))
+        output_file = str(output_dir.join('output.star'))
+        data = pd.concat([ctffind.load_ctffind(entry) for entry in ctffind_files], ignore_index=True)
+        star.dump_star(expected_file, data, 'relion_3')
+
+        convert.ctffind_to_star(ctffind_files, output_file, 'relion_3', chunk_size=2)
+        with open(expected_file, 'r') as read:
+            expected_content = read.read()
+        with open(output_file, 'r') as read:
+            assert read.read() == expected_content
@@ -29,6 +29,7 @@ import pandas as pd
 import pytest
 
 from .. import cter
+from .. import table
 
 THIS_DIR = os.path.dirname(os.path.realpath(__file__))
 OUTPUT_TEST_FOLDER = 'OUTPUT_TESTS_DUMP'
@@ -677,6 +678,43 @@ class TestAmplitudeContrastToAngle:
             assert cter.amplitude_contrast_to_angle(value)
 
 
+    def test_nan_should_raise_assertionerror(self):
+        value = pd.Series([np.nan, 0, 50])
+        with pytest.raises(AssertionError):
+            assert cter.amplitude_contrast_to_angle(value)
+
+    def test_should_match_reference_implementation(self):
+        value = pd.Series(np.linspace(-100, 100, 1001))
+        expected = np.arctan2(value, np.sqrt(1e4 - value**2))
+        expected.loc[expected < 0] += np.pi
+        expected = np.degrees(expected)
+        assert np.allclose(cter.amplitude_contrast_to_angle(value), expected, rtol=0, atol=1e-10)
+
+    def test_should_keep_series_index(self):
+        value = pd.Series([0, 50], index=[3, 7])
+        assert list(cter.amplitude_contrast_to_angle(value).index) == [3, 7]
+
+    def test_out_should_be_filled_inplace(self):
+        value = np.array([0, 100, -100, 50, -50], dtype=float)
+        return_value = np.array([0, 90, 90, 30, 150], dtype=float)
+        return_array = cter.amplitude_contrast_to_angle(value, out=value)
+        assert return_array is value
+        assert np.array_equal(value.round(1), return_value)
+
+    def test_out_200_should_keep_input_unchanged(self):
+        value = np.array([0, 200, 50], dtype=float)
+        with pytest.raises(AssertionError):
+            cter.amplitude_contrast_to_angle(value, out=value)
+        assert np.array_equal(value, [0, 200, 50])
+
+    def test_float32_should_return_float32(self):
+        value = pd.Series([0, 100, -100, 50, -50])
+        return_value = np.array([0, 90, 90, 30, 150], dtype=np.float32)
+        data_frame = cter.amplitude_contrast_to_angle(value, dtype=np.float32)
+        assert data_frame.dtype == np.float32
+        assert np.allclose(data_frame, return_value, atol=1e-4)
+
+
 class TestAngleToAmplitudeContrast:
 
     def test_zero_should_return_zero(self):
@@ -713,6 +751,26 @@ class TestAngleToAmplitudeContrast:
         assert return_value.equals(data_frame.round(1))
 
 
+    def test_should_match_reference_implementation(self):
+        value = pd.Series(np.linspace(-180, 180, 1001))
+        expected = np.tan(np.radians(value)) / np.sqrt(1 + np.tan(np.radians(value))**2) * 100.0
+        assert np.allclose(cter.angle_to_amplitude_contrast(value), expected, rtol=0, atol=1e-10)
+
+    def test_out_should_be_filled_inplace(self):
+        return_value = np.array([0, 100, -100, 50, -50], dtype=float)
+        value = np.array([0, 90, -90, 30, 150], dtype=float)
+        return_array = cter.angle_to_amplitude_contrast(value, out=value)
+        assert return_array is value
+        assert np.array_equal(value.round(1), return_value)
+
+    def test_float32_should_return_float32(self):
+        return_value = np.array([0, -50, 50, -50], dtype=np.float32)
+        value = pd.Series([0, -30, 30, 150], dtype=float)
+        data_frame = cter.angle_to_amplitude_contrast(value, dtype=np.float32)
+        assert data_frame.dtype == np.float32
+        assert np.allclose(data_frame, return_value, atol=1e-3)
+
+
 class TestInternToCter:
 
     def test_input_cter_values_should_return_output_values(self):
@@ -1520,6 +1578,54 @@ class TestLoadCter:
             cter.load_cter(file_name=file_name, version='0.0')
 
 
+class TestLoadCterTable:
+
+    def test_as_table_should_return_table_equal_to_data_frame(self):
+        file_name = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'cter_v1_0_multiline.txt')
+        return_table = cter.load_cter(file_name=file_name, as_table=True)
+        assert isinstance(return_table, table.Table)
+        assert return_table.to_pandas().equals(cter.load_cter(file_name=file_name))
+
+    def test_high_angle_should_wrap_defocus_angle(self):
+        file_name = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'cter_v1_0_high_angle.txt')
+        return_table = cter.load_cter_v1_0_table(file_name=file_name)
+        assert np.round(return_table['DefocusAngle'], 5).tolist() == [19.435]
+
+
+class TestLoadCterMany:
+
+    def test_two_files_should_return_all_rows(self):
+        file_names = [
+            os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'cter_v1_0.txt'),
+            os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'cter_v1_0_multiline.txt'),
+            ]
+        return_frame = cter.load_cter_many(file_names)
+        data_frame = pd.concat(
+            [cter.load_cter(file_name) for file_name in file_names],
+            ignore_index=True
+            )
+        assert return_frame.equals(data_frame)
+
+    def test_threads_should_return_table(self):
+        file_names = [
+            os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'cter_v1_0.txt'),
+            ] * 3
+        return_table = cter.load_cter_many(file_names, n_workers=2, as_table=True)
+        assert len(return_table) == 3
+
+    def test_shared_memory_should_return_same_data_frame(self):
+        file_names = [
+            os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'cter_v1_0.txt'),
+            os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'cter_v1_0_multiline.txt'),
+            ]
+        return_frame = cter.load_cter_many(file_names, n_workers=2, use_shared_memory=True)
+        assert return_frame.equals(cter.load_cter_many(file_names))
+
+    def test_empty_list_should_raise_IOError(self):
+        with pytest.raises(IOError):
+            cter.load_cter_many([])
+
+
 class TestDumpCter:
 
     def test_valid_cter_data_version_1_0_should_create_partres_file(self, tmpdir):
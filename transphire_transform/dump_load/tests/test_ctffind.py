@@ -172,3 +172,89 @@ class TestLoadCtffind:
         with pytest.raises(AssertionError):
             return_frame = ctffind.load_ctffind_4_1_0(ctffind_4_1_0_file)
 
+
+
+class TestLoadCtffindAvrot410:
+
+    def test_single_file_should_return_correct_shape(self):
+        avrot_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'ctffind_avrot.txt')
+        return_array = ctffind.load_ctffind_avrot_4_1_0(avrot_file)
+        assert return_array.shape == (1, 6, 5)
+
+    def test_single_file_should_return_float32(self):
+        avrot_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'ctffind_avrot.txt')
+        return_array = ctffind.load_ctffind_avrot_4_1_0(avrot_file)
+        assert return_array.dtype == np.float32
+
+    def test_single_file_should_return_correct_values(self):
+        avrot_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'ctffind_avrot.txt')
+        return_array = ctffind.load_ctffind_avrot_4_1_0(avrot_file)
+        data = np.array([0.5, 0.95, 0.8, 0.35, 0.1], dtype=np.float32)
+        assert np.array_equal(return_array[0, 3], data)
+
+    def test_multi_micrograph_file_should_return_correct_shape(self):
+        avrot_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'ctffind_avrot_multi.txt')
+        return_array = ctffind.load_ctffind_avrot_4_1_0(avrot_file)
+        assert return_array.shape == (2, 6, 5)
+
+    def test_multi_micrograph_file_should_return_correct_values(self):
+        avrot_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'ctffind_avrot_multi.txt')
+        return_array = ctffind.load_ctffind_avrot_4_1_0(avrot_file)
+        data = np.array([0.3, 0.75, 0.6, 0.15, 0.0], dtype=np.float32)
+        assert np.array_equal(return_array[1, 3], data)
+
+    def test_incomplete_file_should_raise_ioerror(self, tmpdir):
+        avrot_file = tmpdir.join('incomplete_avrot.txt')
+        avrot_file.write('0.0 0.1 0.2\n1.0 1.0 1.0\n')
+        with pytest.raises(IOError):
+            ctffind.load_ctffind_avrot_4_1_0(str(avrot_file))
+
+
+class TestLoadCtffindAvrot:
+
+    def test_version_4_1_0_should_return_correct_shape(self):
+        avrot_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'ctffind_avrot.txt')
+        return_array = ctffind.load_ctffind_avrot(avrot_file, '4.1.0')
+        assert return_array.shape == (1, 6, 5)
+
+
+class TestLoadCtffindAvrotMany:
+
+    def test_two_files_should_return_stacked_array(self):
+        avrot_files = [
+            os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'ctffind_avrot.txt'),
+            os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'ctffind_avrot_multi.txt'),
+            ]
+        return_array = ctffind.load_ctffind_avrot_many(avrot_files)
+        assert return_array.shape == (3, 6, 5)
+
+    def test_two_files_should_keep_file_order(self):
+        avrot_files = [
+            os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'ctffind_avrot_multi.txt'),
+            os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'ctffind_avrot.txt'),
+            ]
+        return_array = ctffind.load_ctffind_avrot_many(avrot_files)
+        data = np.array([0.5, 0.95, 0.8, 0.35, 0.1], dtype=np.float32)
+        assert np.array_equal(return_array[2, 3], data)
+
+    def test_stacked_array_should_be_contiguous(self):
+        avrot_files = [
+            os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'ctffind_avrot.txt'),
+            os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'ctffind_avrot_multi.txt'),
+            ]
+        return_array = ctffind.load_ctffind_avrot_many(avrot_files)
+        assert return_array.flags['C_CONTIGUOUS']
+
+    def test_different_frequency_axis_should_raise_ioerror(self, tmpdir):
+        avrot_file = tmpdir.join('other_avrot.txt')
+        avrot_file.write('\n'.join(['0.0 0.05 0.1 0.15 0.2'] + ['1.0 1.0 1.0 1.0 1.0'] * 5))
+        avrot_files = [
+            os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'ctffind_avrot.txt'),
+            str(avrot_file),
+            ]
+        with pytest.raises(IOError):
+            ctffind.load_ctffind_avrot_many(avrot_files)
+
+    def test_empty_list_should_raise_ioerror(self):
+        with pytest.raises(IOError):
+            ctffind.load_ctffind_avrot_many([])
@@ -0,0 +1,132 @@
+"""
+MIT License
+
+Copyright (c) 2018 Max Planck Institute of Molecular Physiology
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import os
+
+import pytest
+
+from .. import epu
+from .. import xml
+
+
+THIS_DIR = os.path.dirname(os.path.realpath(__file__))
+INPUT_TEST_FOLDER = '../../../test_files'
+
+EPU_FILES = [
+    'xml_1_8_falcon_2.xml',
+    'xml_1_8_k2.xml',
+    'xml_1_9_k2.xml',
+    'xml_1_11_falcon.xml',
+    'xml_1_11_falcon_vpp.xml',
+    ]
+FRACTIONS_FILES = [
+    'xml_1_8_falcon_2_fractions.xml',
+    'xml_1_11_falcon_frames.xml',
+    'xml_1_11_falcon_vpp_fractions.xml',
+    ]
+
+
+class TestDetectXmlPreset:
+
+    @pytest.mark.parametrize('file_name', EPU_FILES)
+    def test_microscope_image_should_return_epu(self, file_name):
+        input_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, file_name)
+        assert epu.detect_xml_preset(input_file) == 'epu'
+
+    @pytest.mark.parametrize('file_name', FRACTIONS_FILES)
+    def test_acquisition_should_return_fractions(self, file_name):
+        input_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, file_name)
+        assert epu.detect_xml_preset(input_file) == 'fractions'
+
+    def test_unknown_root_should_raise_ioerror(self, tmpdir):
+        input_file = tmpdir.join('unknown.xml')
+        input_file.write('<root><a>1</a></root>')
+        with pytest.raises(IOError):
+            epu.detect_xml_preset(str(input_file))
+
+
+class TestGetXmlLevelDict:
+
+    def test_outputs_should_only_contain_requested_keys(self):
+        level_dict = epu.get_xml_level_dict('epu', outputs=['pixel_size'])
+        assert level_dict == {
+            'level 3': {
+                '{http://schemas.datacontract.org/2004/07/Fei.SharedObjects}SpatialScale': \
+                    ['numericValue']
+                }
+            }
+
+    def test_outputs_should_merge_levels(self):
+        level_dict = epu.get_xml_level_dict('epu', outputs=['optics', 'stage'])
+        assert list(level_dict) == ['level 0', 'level 1']
+        assert len(level_dict['level 1']) == 4
+
+    @pytest.mark.parametrize('version', ['1.8', '1.9', '1.11'])
+    def test_versions_should_return_same_level_dict(self, version):
+        assert epu.get_xml_level_dict('epu', version) == epu.get_xml_level_dict('epu')
+
+    def test_too_old_version_should_raise_assertionerror(self):
+        with pytest.raises(AssertionError):
+            epu.get_xml_level_dict('epu', '1.7')
+
+    def test_unknown_output_should_raise_keyerror(self):
+        with pytest.raises(KeyError):
+            epu.get_xml_level_dict('epu', outputs=['dummy'])
+
+    def test_unknown_preset_should_raise_keyerror(self):
+        with pytest.raises(KeyError):
+            epu.get_xml_level_dict('dummy')
+
+
+class TestLoadXmlPreset:
+
+    @pytest.mark.parametrize('file_name', EPU_FILES)
+    def test_detected_preset_should_match_explicit_level_dict(self, file_name):
+        input_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, file_name)
+        data_frame = xml.load_xml(input_file)
+        assert data_frame.equals(xml.load_xml(input_file, epu.get_xml_level_dict('epu')))
+        assert 'pixelSize_x' in data_frame
+        assert 'Dose' in data_frame
+
+    def test_minimal_outputs_should_return_requested_columns(self):
+        input_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'xml_1_11_falcon.xml')
+        level_dict = epu.get_xml_level_dict('epu', outputs=['pixel_size'])
+        data_frame = xml.load_xml(input_file, level_dict)
+        assert list(data_frame) == ['offset_x', 'offset_y', 'pixelSize_x', 'pixelSize_y']
+
+    @pytest.mark.parametrize('file_name', FRACTIONS_FILES)
+    def test_fractions_streaming_should_match_full_parse(self, file_name):
+        input_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, file_name)
+        data_frame = xml.load_xml(input_file, streaming=True)
+        assert data_frame.equals(xml.load_xml(input_file))
+        assert data_frame['Detector'][0] == 'Falcon-3'
+
+    def test_fractions_many_should_be_typed(self):
+        input_files = [
+            os.path.join(THIS_DIR, INPUT_TEST_FOLDER, file_name)
+            for file_name in FRACTIONS_FILES
+            ]
+        data_frame = xml.load_xml_many(input_files)
+        assert data_frame['RecordedNumberOfFractions'].tolist() == [30, 119, 40]
+        assert data_frame['RegionOfInterest_Width'].tolist() == [4096, 4096, 4096]
@@ -24,7 +24,9 @@ SOFTWARE.
 
 import os
 
+import numpy as np
 import pandas as pd
+import pytest
 
 from .. import motioncor2
 
@@ -136,3 +138,85 @@ class TestLoadMotioncor:
         data_frame['shift_y'] -= data_frame['shift_y'].iloc[0]
         return_frame = motioncor2.load_motioncor2(input_file, '1.0.0')
         assert data_frame.equals(return_frame)
+
+
+class TestLoadMotioncor2Many:
+
+    def test_two_files_should_return_padded_array(self, tmpdir):
+        input_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'motioncor2_v1_0_0.txt')
+        short_file = tmpdir.join('short.log')
+        short_file.write('# Full-frame alignment shift\n   1  2.00  3.00\n   2  1.00  1.00\n')
+        trajectories, n_frames, movie_names = motioncor2.load_motioncor2_many(
+            [input_file, str(short_file)]
+            )
+        assert trajectories.shape == (2, 40, 2)
+        assert n_frames.tolist() == [40, 2]
+        assert movie_names == ['motioncor2_v1_0_0', 'short']
+        assert np.isnan(trajectories[1, 2:]).all()
+
+    def test_shifts_should_be_referenced_to_first_frame(self, tmpdir):
+        input_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'motioncor2_v1_0_0.txt')
+        short_file = tmpdir.join('short.log')
+        short_file.write('   1  2.00  3.00\n   2  1.00  1.00\n')
+        trajectories, _, _ = motioncor2.load_motioncor2_many([input_file, str(short_file)])
+        expected = motioncor2.load_motioncor2(input_file).values
+        assert np.array_equal(trajectories[0], expected)
+        assert trajectories[1, :2].tolist() == [[0, 0], [-1, -2]]
+
+    def test_thread_pool_should_return_same_result(self):
+        input_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'motioncor2_v1_0_0.txt')
+        serial = motioncor2.load_motioncor2_many([input_file] * 4)
+        parallel = motioncor2.load_motioncor2_many([input_file] * 4, n_workers=2)
+        assert np.array_equal(serial[0], parallel[0])
+
+    def test_empty_list_should_raise_ioerror(self):
+        with pytest.raises(IOError):
+            motioncor2.load_motioncor2_many([])
+
+
+class TestParseMotioncor2100:
+
+    def test_full_frame_file_should_have_no_patches(self):
+        input_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'motioncor2_v1_0_0.txt')
+        full_frame, patch_centers, patch_shifts = motioncor2.parse_motioncor2_1_0_0(input_file)
+        assert full_frame.shape == (40, 2)
+        assert patch_centers.shape == (0, 2)
+        assert patch_shifts.shape == (0, 40, 2)
+
+    def test_patch_file_should_separate_sections(self):
+        input_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'motioncor2_patch_v1_0_0.txt')
+        full_frame, patch_centers, patch_shifts = motioncor2.parse_motioncor2_1_0_0(input_file)
+        assert full_frame.tolist() == [[2.0, 3.0], [1.5, 2.0], [0.5, 1.0], [0.0, 0.0]]
+        assert patch_centers.tolist() == [[409.5, 409.5], [1228.5, 409.5]]
+        assert patch_shifts.shape == (2, 4, 2)
+        assert patch_shifts[1, 0].tolist() == [-0.1, 0.3]
+
+    def test_unknown_line_should_raise_ioerror(self, tmpdir):
+        input_file = tmpdir.join('corrupt.log')
+        input_file.write('   1  2.00\n')
+        with pytest.raises(IOError):
+            motioncor2.parse_motioncor2_1_0_0(str(input_file))
+
+
+class TestLoadMotioncor2Patches:
+
+    def test_patch_file_full_frame_should_be_referenced(self):
+        input_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'motioncor2_patch_v1_0_0.txt')
+        full_frame, _, _ = motioncor2.load_motioncor2_patches(input_file, '1.0.0')
+        assert full_frame.values.tolist() == [[0, 0], [-0.5, -1], [-1.5, -2], [-2, -3]]
+
+    def test_patch_file_patches_should_be_referenced(self):
+        input_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'motioncor2_patch_v1_0_0.txt')
+        _, _, patch_shifts = motioncor2.load_motioncor2_patches(input_file, '1.0.0')
+        assert np.allclose(patch_shifts[0, :, 0], [0, -0.05, -0.1, -0.15])
+        assert np.allclose(patch_shifts[1, :, 1], [0, -0.1, -0.2, -0.3])
+
+    def test_patch_file_should_not_merge_patches_into_full_frame(self):
+        input_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'motioncor2_patch_v1_0_0.txt')
+        assert len(motioncor2.load_motioncor2(input_file)) == 4
+
+    def test_patch_only_file_should_raise_ioerror_for_full_frame(self, tmpdir):
+        input_file = tmpdir.join('patch_only.log')
+        input_file.write('   1   409.50   409.50    0.10    0.20\n')
+        with pytest.raises(IOError):
+            motioncor2.load_motioncor2(str(input_file))
@@ -23,6 +23,8 @@ SOFTWARE.
 """
 
 import os
+import mrcfile
+import numpy as np
 import pytest
 from .. import mrc
 
@@ -56,3 +58,160 @@ class TestLoadMrcHeader:
         """
         with pytest.raises(IOError):
             header = mrc.load_mrc_header(os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'dummy'))
+
+
+class TestReadMrcHeader:
+
+    def test_header_contains_dimensions(self):
+        header, _ = mrc.read_mrc_header(os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'mrc_test.mrc'))
+        assert (header['nx'], header['ny'], header['nz']) == (4, 4, 2)
+
+    def test_extended_header_contains_all_records(self):
+        _, extended_header = mrc.read_mrc_header(os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'mrc_test.mrc'))
+        assert len(extended_header) == 2
+
+    def test_truncated_data_should_still_read_header(self, tmpdir):
+        with open(os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'mrc_vpp_test.mrc'), 'rb') as read:
+            header_bytes = read.read(1024 + 2 * 768)
+        output_file = tmpdir.join('truncated.mrc')
+        output_file.write_binary(header_bytes)
+        assert mrc.load_mrc_header(str(output_file))['Phase Plate']
+
+    def test_no_mrc_file_should_raise_ioerror(self):
+        with pytest.raises(IOError):
+            mrc.read_mrc_header(os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'ctffind.txt'))
+
+    def test_short_file_should_raise_ioerror(self, tmpdir):
+        output_file = tmpdir.join('short.mrc')
+        output_file.write_binary(b'0' * 100)
+        with pytest.raises(IOError):
+            mrc.read_mrc_header(str(output_file))
+
+
+class TestScanMrcHeaders:
+
+    def test_list_should_return_one_row_per_file(self):
+        file_names = [
+            os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'mrc_test.mrc'),
+            os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'mrc_vpp_test.mrc'),
+            ]
+        data, _ = mrc.scan_mrc_headers(file_names, n_workers=2)
+        assert data['file_name'].tolist() == file_names
+        assert data['Phase Plate'].tolist() == [False, True]
+        assert data['nz'].tolist() == [2, 2]
+        assert data['PixelSize'].round(3).tolist() == [1.1, 1.1]
+
+    def test_glob_should_find_files(self):
+        data, _ = mrc.scan_mrc_headers(os.path.join(THIS_DIR, INPUT_TEST_FOLDER, '*.mrc'))
+        assert len(data) == 2
+
+    def test_per_frame_should_return_one_row_per_frame(self):
+        file_names = [
+            os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'mrc_test.mrc'),
+            os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'mrc_vpp_test.mrc'),
+            ]
+        data, _ = mrc.scan_mrc_headers(file_names, per_frame=True)
+        assert data['frame'].tolist() == [0, 1, 0, 1]
+
+    def test_should_return_latency_percentiles(self):
+        file_names = [os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'mrc_test.mrc')] * 3
+        _, latency = mrc.scan_mrc_headers(file_names)
+        assert sorted(latency) == ['p50', 'p90', 'p99']
+        assert latency['p50'] <= latency['p99']
+
+    def test_empty_glob_should_raise_ioerror(self):
+        with pytest.raises(IOError):
+            mrc.scan_mrc_headers(os.path.join(THIS_DIR, INPUT_TEST_FOLDER, '*.dummy'))
+
+
+class TestLoadMrcExtendedHeader:
+
+    def test_should_return_one_row_per_frame(self):
+        data = mrc.load_mrc_extended_header(os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'mrc_test.mrc'))
+        assert len(data) == 2
+        assert data['Fraction number'].tolist() == [0, 1]
+
+    def test_dose_should_be_decoded_per_frame(self):
+        data = mrc.load_mrc_extended_header(os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'mrc_test.mrc'))
+        assert np.allclose(data['Dose'], [1.5e-19, 1.6e-19], rtol=0, atol=1e-25)
+
+    def test_records_should_be_a_view(self):
+        records = mrc.read_mrc_frame_records(os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'mrc_test.mrc'))
+        assert records.base is not None
+        assert not records.flags['WRITEABLE']
+
+    def test_reserved_records_should_be_dropped(self, tmpdir):
+        with open(os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'mrc_test.mrc'), 'rb') as read:
+            header_bytes = bytearray(read.read(1024 + 2 * 768))
+        nsymbt = np.frombuffer(header_bytes, dtype='<i4', count=1, offset=92)[0]
+        assert nsymbt == 2 * 768
+        header_bytes[92:96] = np.array([4 * 768 + 10], dtype='<i4').tobytes()
+        output_file = tmpdir.join('reserved.mrc')
+        output_file.write_binary(bytes(header_bytes) + b'\0' * (2 * 768 + 10))
+        assert len(mrc.load_mrc_extended_header(str(output_file))) == 2
+
+    def test_no_fei_header_should_raise_ioerror(self, tmpdir):
+        with open(os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'mrc_test.mrc'), 'rb') as read:
+            header_bytes = bytearray(read.read(1024))
+        header_bytes[104:108] = b'MRCO'
+        output_file = tmpdir.join('no_fei.mrc')
+        output_file.write_binary(bytes(header_bytes) + b'\0' * (2 * 768))
+        with pytest.raises(IOError):
+            mrc.load_mrc_extended_header(str(output_file))
+
+
+class TestMmapMrcData:
+
+    def test_shape_should_match_header(self):
+        data = mrc.mmap_mrc_data(os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'mrc_test.mrc'))
+        assert data.shape == (2, 4, 4)
+        assert data.dtype == np.float32
+
+    def test_data_should_be_read_only(self):
+        data = mrc.mmap_mrc_data(os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'mrc_test.mrc'))
+        assert not data.flags['WRITEABLE']
+
+
+class TestBinImage:
+
+    def test_bin_two_should_sum_blocks(self):
+        image = np.arange(16, dtype=np.float32).reshape(4, 4)
+        assert mrc.bin_image(image, 2).tolist() == [[10, 18], [42, 50]]
+
+    def test_incomplete_blocks_should_be_cropped(self):
+        image = np.ones((5, 7), dtype=np.float32)
+        assert mrc.bin_image(image, 2).shape == (2, 3)
+
+    def test_bin_one_should_return_input(self):
+        image = np.ones((5, 7), dtype=np.float32)
+        assert mrc.bin_image(image, 1) is image
+
+
+class TestSumMrcFrames:
+
+    @pytest.fixture
+    def stack_file(self, tmpdir):
+        output_file = str(tmpdir.mkdir(OUTPUT_TEST_FOLDER).join('stack.mrcs'))
+        with mrcfile.new(output_file) as mrc_file:
+            mrc_file.set_data(np.arange(5 * 4 * 4, dtype=np.int16).reshape(5, 4, 4))
+            mrc_file.voxel_size = 1.5
+        return output_file
+
+    def test_sum_should_match_numpy_sum(self, stack_file):
+        expected = np.arange(5 * 4 * 4).reshape(5, 4, 4).sum(axis=0)
+        result = mrc.sum_mrc_frames(stack_file, chunk_size=2)
+        assert result.dtype == np.float32
+        assert np.array_equal(result, expected)
+
+    def test_average_binned_should_match_numpy_mean(self, stack_file):
+        expected = np.arange(5 * 4 * 4).reshape(5, 2, 2, 2, 2).mean(axis=(0, 2, 4))
+        result = mrc.sum_mrc_frames(stack_file, bin_factor=2, average=True, chunk_size=3)
+        assert np.allclose(result, expected)
+
+    def test_output_file_should_have_binned_pixel_size(self, stack_file, tmpdir):
+        output_file = str(tmpdir.join('sum.mrc'))
+        result = mrc.sum_mrc_frames(stack_file, output_file=output_file, bin_factor=2)
+        header, _ = mrc.read_mrc_header(output_file)
+        assert (header['nx'], header['ny'], header['nz']) == (2, 2, 1)
+        assert np.isclose(header['cella']['x'] / header['mx'], 3.0)
+        assert np.array_equal(mrc.mmap_mrc_data(output_file)[0], result)
@@ -0,0 +1,109 @@
+"""
+MIT License
+
+Copyright (c) 2018 Max Planck Institute of Molecular Physiology
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import mrcfile
+import numpy as np
+import pandas as pd
+import pytest
+
+from .. import particles
+
+
+OUTPUT_TEST_FOLDER = 'OUTPUT_TESTS_PARTICLES'
+
+
+@pytest.fixture
+def stack_directory(tmpdir):
+    output_dir = tmpdir.mkdir(OUTPUT_TEST_FOLDER)
+    for name, offset in (('mic_0001.mrcs', 0), ('mic_0002.mrcs', 100)):
+        data = np.arange(3 * 2 * 2, dtype=np.float32).reshape(3, 2, 2) + offset
+        with mrcfile.new(str(output_dir.join(name))) as mrc:
+            mrc.set_data(data)
+    return str(output_dir)
+
+
+@pytest.fixture
+def star_data():
+    return pd.DataFrame({
+        'ImageName': [
+            '000001@mic_0001.mrcs',
+            '000003@mic_0001.mrcs',
+            '000002@mic_0002.mrcs',
+            '000002@mic_0001.mrcs',
+            ],
+        })
+
+
+class TestParseImageNames:
+
+    def test_names_should_be_split(self, star_data):
+        stack_names, indices = particles.parse_image_names(star_data['ImageName'])
+        assert stack_names.tolist() == ['mic_0001.mrcs', 'mic_0001.mrcs', 'mic_0002.mrcs', 'mic_0001.mrcs']
+        assert indices.tolist() == [0, 2, 1, 1]
+
+    def test_missing_index_should_raise_ioerror(self):
+        with pytest.raises(IOError):
+            particles.parse_image_names(pd.Series(['mic_0001.mrcs']))
+
+    def test_zero_index_should_raise_ioerror(self):
+        with pytest.raises(IOError):
+            particles.parse_image_names(pd.Series(['1@mic_0001.mrcs', '0@mic_0001.mrcs']))
+
+
+class TestParticleImageSource:
+
+    def test_length_should_be_number_of_particles(self, star_data, stack_directory):
+        source = particles.ParticleImageSource(star_data, stack_directory)
+        assert len(source) == 4
+
+    def test_images_should_be_in_row_order(self, star_data, stack_directory):
+        with particles.ParticleImageSource(star_data, stack_directory) as source:
+            images = source.get_images([0, 1, 2, 3])
+        assert images.shape == (4, 2, 2)
+        assert images[:, 0, 0].tolist() == [0, 8, 104, 4]
+
+    def test_subset_should_return_subset(self, star_data, stack_directory):
+        with particles.ParticleImageSource(star_data, stack_directory) as source:
+            images = source.get_images(np.array([2]))
+        assert images[0].tolist() == [[104, 105], [106, 107]]
+
+    def test_cache_should_be_limited(self, star_data, stack_directory):
+        source = particles.ParticleImageSource(star_data, stack_directory, max_open_stacks=1)
+        source.get_images([0, 1, 2, 3])
+        assert len(source._open_stacks) == 1
+
+    def test_stack_should_be_mapped_once(self, star_data, stack_directory):
+        source = particles.ParticleImageSource(star_data, stack_directory)
+        assert source.get_stack('mic_0001.mrcs') is source.get_stack('mic_0001.mrcs')
+
+    def test_close_should_release_stacks(self, star_data, stack_directory):
+        source = particles.ParticleImageSource(star_data, stack_directory)
+        source.get_images([0])
+        source.close()
+        assert not source._open_stacks
+
+    def test_missing_stack_should_raise_ioerror(self, star_data, tmpdir):
+        source = particles.ParticleImageSource(star_data, str(tmpdir))
+        with pytest.raises(IOError):
+            source.get_images([0])
@@ -0,0 +1,142 @@
+"""
+MIT License
+
+Copyright (c) 2018 Max Planck Institute of Molecular Physiology
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from .. import shared
+from .. import table
+
+def create_table(file_name):
+    if file_name == 'missing.mrc':
+        raise FileNotFoundError(file_name)
+    return table.Table({
+        'FileName': np.array([file_name] * 2, dtype=object),
+        'Index': np.arange(2, dtype=np.int32),
+        'Value': np.array([0.5, len(file_name)]),
+        })
+
+
+def list_shared_blocks():
+    return set(
+        file_name for file_name in os.listdir(shared.SHARED_DIRECTORY)
+        if file_name.startswith(shared.SHARED_PREFIX)
+        )
+
+
+class TestTableToShared:
+
+    def test_round_trip_should_return_same_table(self):
+        data_table = create_table('ä.mrc')
+        return_table = shared.table_from_shared(shared.table_to_shared(data_table))
+        assert return_table.to_pandas().equals(data_table.to_pandas())
+        assert return_table.schema == data_table.schema
+
+    def test_empty_table_should_return_empty_table(self):
+        data_table = create_table('a.mrc')[:0]
+        return_table = shared.table_from_shared(shared.table_to_shared(data_table))
+        assert len(return_table) == 0
+        assert return_table.column_names == data_table.column_names
+
+    def test_slice_should_outlive_table(self):
+        return_table = shared.table_from_shared(shared.table_to_shared(create_table('a.mrc')))
+        sliced_table = return_table[1:]
+        del return_table
+        assert sliced_table['Value'].tolist() == [5]
+
+    def test_separator_in_value_should_return_same_values(self):
+        data_table = table.Table({'Name': np.array(['a', 'b\x00c', ''], dtype=object)})
+        return_table = shared.table_from_shared(shared.table_to_shared(data_table))
+        assert return_table['Name'].tolist() == ['a', 'b\x00c', '']
+
+    def test_non_str_object_should_raise_IOError_and_unlink(self):
+        blocks = list_shared_blocks()
+        data_table = table.Table({
+            'Value': np.array([1.0]),
+            'Wrong': np.array([None], dtype=object),
+            })
+        with pytest.raises(IOError):
+            shared.table_to_shared(data_table)
+        assert list_shared_blocks() == blocks
+
+    def test_round_trip_should_remove_files(self):
+        blocks = list_shared_blocks()
+        return_table = shared.table_from_shared(shared.table_to_shared(create_table('a.mrc')))
+        assert list_shared_blocks() == blocks
+        assert return_table['Index'].tolist() == [0, 1]
+
+    def test_columns_should_be_writable(self):
+        return_table = shared.table_from_shared(shared.table_to_shared(create_table('a.mrc')))
+        return_table['Value'][0] = 2
+        assert return_table['Value'].tolist() == [2, 5]
+
+
+class TestConcatenateShared:
+
+    def test_tables_should_be_concatenated(self):
+        data_list = [create_table('a.mrc'), create_table('bb.mrc')]
+        return_table = shared.concatenate_shared(
+            [shared.table_to_shared(data_table) for data_table in data_list]
+            )
+        assert return_table.to_pandas().equals(table.concatenate_tables(data_list).to_pandas())
+
+    def test_different_columns_should_raise_IOError_and_unlink(self):
+        blocks = list_shared_blocks()
+        descriptor_list = [
+            shared.table_to_shared(create_table('a.mrc')),
+            shared.table_to_shared(table.Table({'Value': [1.0]})),
+            ]
+        with pytest.raises(IOError):
+            shared.concatenate_shared(descriptor_list)
+        assert list_shared_blocks() == blocks
+
+
+class TestLoadManyShared:
+
+    def test_processes_should_return_rows_in_order(self):
+        file_names = ['a.mrc', 'bb.mrc', 'ccc.mrc']
+        return_table = shared.load_many_shared(create_table, file_names, n_workers=2)
+        assert return_table['FileName'].tolist() == [entry for entry in file_names for _ in range(2)]
+        assert return_table['Value'].tolist() == [0.5, 5, 0.5, 6, 0.5, 7]
+        assert return_table['Index'].dtype == np.int32
+
+    def test_single_worker_should_match_processes(self):
+        file_names = ['a.mrc', 'bb.mrc']
+        return_table = shared.load_many_shared(create_table, file_names)
+        assert return_table.to_pandas().equals(
+            shared.load_many_shared(create_table, file_names, n_workers=2).to_pandas()
+            )
+
+    def test_failing_file_should_raise_and_unlink(self):
+        blocks = list_shared_blocks()
+        file_names = ['a.mrc'] * 10 + ['missing.mrc'] + ['b.mrc'] * 10
+        with pytest.raises(FileNotFoundError):
+            shared.load_many_shared(create_table, file_names, n_workers=4)
+        assert list_shared_blocks() == blocks
+
+    def test_empty_list_should_raise_IOError(self):
+        with pytest.raises(IOError):
+            shared.load_many_shared(create_table, [])
@@ -270,6 +270,35 @@ class TestLoadStar:
             star.load_star(file_name=output_file)
 
 
+class TestLoadStarMany:
+
+    @pytest.fixture
+    def star_files(self, tmpdir):
+        data = pd.DataFrame({
+            'ImageName': ['1@a.mrcs', '2@a.mrcs'],
+            'CoordinateX': [1.0, 2.0],
+            'CoordinateY': [3, 4],
+            })
+        file_names = []
+        for idx in range(3):
+            output_file = str(tmpdir.join(f'test_load_star_many_{idx}.star'))
+            star.dump_star(file_name=output_file, data=data, version='relion_3')
+            file_names.append(output_file)
+        return file_names
+
+    def test_load_star_many_should_match_concat(self, star_files):
+        data = pd.concat([star.load_star(file_name) for file_name in star_files], ignore_index=True)
+        assert star.load_star_many(star_files, n_workers=2).equals(data)
+
+    def test_load_star_many_shared_memory_should_match_concat(self, star_files):
+        data = pd.concat([star.load_star(file_name) for file_name in star_files], ignore_index=True)
+        assert star.load_star_many(star_files, n_workers=2, use_shared_memory=True).equals(data)
+
+    def test_load_star_many_empty_list_should_raise_ioerror(self):
+        with pytest.raises(IOError):
+            star.load_star_many([])
+
+
 class TestImportStarHeader:
 
     def test_MicrographName_outputs_MicrographName(self):
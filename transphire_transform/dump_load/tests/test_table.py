@@ -0,0 +1,119 @@
+"""
+MIT License
+
+Copyright (c) 2018 Max Planck Institute of Molecular Physiology
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from .. import table
+
+THIS_DIR = os.path.dirname(os.path.realpath(__file__))
+INPUT_TEST_FOLDER = '../../../test_files'
+
+
+@pytest.fixture('module')
+def data_table():
+    return table.Table({
+        'CoordinateX': np.arange(4, dtype=float),
+        'Voltage': np.array([300, 300, 200, 200]),
+        'MicrographName': np.array(['a.mrc', 'b.mrc', 'c.mrc', 'd.mrc'], dtype=object),
+        })
+
+
+class TestTable:
+
+    def test_len_should_return_number_of_rows(self, data_table):
+        assert len(data_table) == 4
+
+    def test_empty_table_should_have_no_rows(self):
+        assert len(table.Table()) == 0
+
+    def test_column_names_should_keep_order(self, data_table):
+        assert data_table.column_names == ['CoordinateX', 'Voltage', 'MicrographName']
+
+    def test_schema_should_return_dtypes(self, data_table):
+        assert data_table.schema['CoordinateX'] == np.float64
+        assert data_table.schema['MicrographName'] == object
+
+    def test_slice_should_share_memory(self, data_table):
+        sliced_table = data_table[1:3]
+        assert len(sliced_table) == 2
+        assert np.shares_memory(sliced_table['CoordinateX'], data_table['CoordinateX'])
+
+    def test_mask_should_return_selected_rows(self, data_table):
+        masked_table = data_table[data_table['Voltage'] == 200]
+        assert masked_table['MicrographName'].tolist() == ['c.mrc', 'd.mrc']
+
+    def test_wrong_length_should_raise_IOError(self, data_table):
+        with pytest.raises(IOError):
+            data_table['Wrong'] = np.arange(3)
+
+    def test_two_dimensional_column_should_raise_IOError(self):
+        with pytest.raises(IOError):
+            table.Table({'Wrong': np.zeros((2, 2))})
+
+    def test_to_pandas_should_return_data_frame(self, data_table):
+        data_frame = pd.DataFrame({
+            'CoordinateX': np.arange(4, dtype=float),
+            'Voltage': [300, 300, 200, 200],
+            'MicrographName': ['a.mrc', 'b.mrc', 'c.mrc', 'd.mrc'],
+            }, columns=['CoordinateX', 'Voltage', 'MicrographName'])
+        assert data_table.to_pandas().equals(data_frame)
+
+    def test_from_pandas_should_return_same_columns(self, data_table):
+        return_table = table.Table.from_pandas(data_table.to_pandas())
+        assert return_table.column_names == data_table.column_names
+        assert return_table['Voltage'].tolist() == data_table['Voltage'].tolist()
+
+
+class TestConcatenateTables:
+
+    def test_two_tables_should_return_all_rows(self, data_table):
+        return_table = table.concatenate_tables([data_table, data_table[:1]])
+        assert return_table['MicrographName'].tolist() == ['a.mrc', 'b.mrc', 'c.mrc', 'd.mrc', 'a.mrc']
+
+    def test_different_columns_should_raise_IOError(self, data_table):
+        with pytest.raises(IOError):
+            table.concatenate_tables([data_table, table.Table({'Voltage': [300]})])
+
+    def test_empty_list_should_raise_IOError(self):
+        with pytest.raises(IOError):
+            table.concatenate_tables([])
+
+
+class TestLoadTextTable:
+
+    def test_cter_file_should_infer_read_csv_dtypes(self):
+        file_name = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'cter_v1_0.txt')
+        names = [f'column_{idx}' for idx in range(22)]
+        return_table = table.load_text_table(file_name, names)
+        data_frame = pd.read_csv(file_name, names=names, delim_whitespace=True, header=None)
+        assert return_table.to_pandas().equals(data_frame)
+
+    def test_wrong_number_of_names_should_raise_IOError(self):
+        file_name = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'cter_v1_0.txt')
+        with pytest.raises(IOError):
+            table.load_text_table(file_name, ['a', 'b'])
@@ -24,7 +24,9 @@ SOFTWARE.
 
 import os
 
+import numpy as np
 import pandas as pd
+import pytest
 
 from .. import unblur
 
@@ -104,3 +106,44 @@ class TestLoadUnblur:
         data_frame['shift_y'] -= data_frame['shift_y'].iloc[0]
         return_frame = unblur.load_unblur(input_file, '1.0.2')
         assert data_frame.round(4).equals(return_frame.round(4))
+
+
+class TestGetUnblur102Meta:
+
+    def test_single_file_should_return_meta(self):
+        input_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'unblur_v1_0_2.txt')
+        assert unblur.get_unblur_1_0_2_meta(input_file) == {'n_micrographs': 1, 'PixelSize': 1.14}
+
+
+class TestLoadUnblurTrajectories:
+
+    def test_single_file_should_match_data_frame(self):
+        input_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'unblur_v1_0_2.txt')
+        trajectories = unblur.load_unblur_trajectories(input_file, '1.0.2')
+        assert trajectories.shape == (1, 24, 2)
+        assert np.array_equal(trajectories[0], unblur.load_unblur(input_file).values)
+
+    def test_multi_file_should_return_all_micrographs(self):
+        input_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'unblur_v1_0_2_multi.txt')
+        trajectories = unblur.load_unblur_trajectories(input_file)
+        assert trajectories.shape == (2, 4, 2)
+        assert trajectories.flags['C_CONTIGUOUS']
+        assert np.allclose(trajectories[1, :, 0], [0, 0.5, 0.8, 1.0])
+        assert np.allclose(trajectories[1, :, 1], [0, -2.0, -3.2, -4.0])
+
+    def test_to_pixel_should_divide_by_pixel_size(self):
+        input_file = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'unblur_v1_0_2_multi.txt')
+        trajectories = unblur.load_unblur_trajectories(input_file, to_pixel=True)
+        assert np.allclose(trajectories[0, :, 1], [0, -0.5, -0.8, -1.0])
+
+    def test_missing_rows_should_raise_ioerror(self, tmpdir):
+        input_file = tmpdir.join('corrupt.txt')
+        input_file.write('# Number of micrographs: 2\n 1.0 2.0\n 1.0 2.0\n')
+        with pytest.raises(IOError):
+            unblur.load_unblur_trajectories(str(input_file))
+
+    def test_to_pixel_without_pixel_size_should_raise_ioerror(self, tmpdir):
+        input_file = tmpdir.join('no_pixel_size.txt')
+        input_file.write('# Number of micrographs: 1\n 1.0 2.0\n 1.0 2.0\n')
+        with pytest.raises(IOError):
+            unblur.load_unblur_trajectories(str(input_file), to_pixel=True)
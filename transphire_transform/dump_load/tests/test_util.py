@@ -136,6 +136,31 @@ class TestDumpFile:
         assert np.array_equal(load_data.values, data.values)
 
 
+    def test_dump_file_append_header(self, tmpdir):
+        """
+        """
+        data_1 = np.arange(4)
+        data = pd.DataFrame({
+            '_rlnTest1': data_1,
+            })
+        output_file: str = tmpdir.mkdir(OUTPUT_TEST_FOLDER).join('test_dump_file_append_header')
+        util.dump_file(
+            file_name=output_file,
+            data=data,
+            header=['_rlnTest1'],
+            vertical=True,
+            )
+        util.dump_file(
+            file_name=output_file,
+            data=data,
+            header=['_rlnTest1'],
+            vertical=True,
+            append=True,
+            )
+        load_data = util.load_file(file_name=output_file, skiprows=1)
+        assert np.array_equal(load_data.values.ravel(), np.tile(data_1, 2))
+
+
     def test_dump_file_single(self, tmpdir):
         """
         """
@@ -545,3 +570,35 @@ class TestExtractFunctionFromFunctionDict:
         with pytest.raises(AssertionError):
             util.extract_function_from_function_dict(func_dict, '1.0.1')
 
+
+
+class TestMapFiles:
+
+    def test_serial_should_keep_order(self):
+        assert util.map_files(len, ['a', 'bb', 'ccc']) == [1, 2, 3]
+
+    def test_threads_should_keep_order(self):
+        assert util.map_files(len, ['a', 'bb', 'ccc'] * 10, n_workers=3) == [1, 2, 3] * 10
+
+    def test_processes_should_keep_order(self):
+        assert util.map_files(len, ['a', 'bb', 'ccc'], n_workers=2, use_processes=True) == [1, 2, 3]
+
+
+class TestStackPadded:
+
+    def test_different_lengths_should_be_padded(self):
+        arrays = [np.ones((3, 2)), np.zeros((1, 2))]
+        output_array, lengths = util.stack_padded(arrays)
+        assert output_array.shape == (2, 3, 2)
+        assert lengths.tolist() == [3, 1]
+        assert np.isnan(output_array[1, 1:]).all()
+        assert (output_array[1, 0] == 0).all()
+
+    def test_fill_value_should_be_used(self):
+        arrays = [np.ones(3), np.ones(1)]
+        output_array, _ = util.stack_padded(arrays, fill_value=-1)
+        assert output_array[1].tolist() == [1, -1, -1]
+
+    def test_empty_list_should_raise_ioerror(self):
+        with pytest.raises(IOError):
+            util.stack_padded([])
@@ -19,6 +19,7 @@
 
 import os
 import xml.etree.ElementTree as et
+import numpy as np
 import pytest
 
 import pandas as pd
@@ -964,6 +965,20 @@ class TestGetKeyWithouPrefix():
         key = ' __test__ '
         assert xml.get_key_without_prefix(key) == 'test'
 
+    def test_repeated_key_should_return_same_object(self):
+        key = '{prefix}' + ''.join(['te', 'st'])
+        assert xml.get_key_without_prefix(key) is xml.get_key_without_prefix('{other}test')
+
+
+class TestGetSearchKeysWithoutPrefix():
+
+    def test_keys_should_return_set_without_prefix(self):
+        search_keys = ('{prefix}_x', ' y ', 'z')
+        assert xml.get_search_keys_without_prefix(search_keys) == frozenset(['x', 'y', 'z'])
+
+    def test_empty_keys_should_return_empty_set(self):
+        assert xml.get_search_keys_without_prefix(()) == frozenset()
+
 
 class TestRecursiveNode():
 
@@ -1346,3 +1361,271 @@ class TestLoadXML():
 
         assert data_dict.equals(pd.DataFrame(return_dict, index=[0])[list(data_dict)])
 
+
+    @pytest.mark.parametrize('file_name', [
+        'xml_1_8_falcon_2.xml',
+        'xml_1_8_falcon_2_fractions.xml',
+        'xml_1_8_k2.xml',
+        'xml_1_9_k2.xml',
+        'xml_1_11_falcon.xml',
+        'xml_1_11_falcon_frames.xml',
+        'xml_1_11_falcon_vpp.xml',
+        'xml_1_11_falcon_vpp_fractions.xml',
+        ])
+    def test_compiled_should_match_recursive_node(self, level_dict, file_name):
+        file_name = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, file_name)
+        recursive_dict = {}
+        xml.recursive_node(
+            et.parse(file_name).getroot(),
+            recursive_dict,
+            level_dict,
+            xml.get_level_func_dict()
+            )
+
+        data_frame = xml.load_xml(file_name, level_dict)
+
+        assert data_frame.equals(pd.DataFrame(recursive_dict, index=[0]))
+        assert list(data_frame) == list(recursive_dict)
+
+    @pytest.mark.parametrize('file_name', [
+        'xml_1_8_falcon_2.xml',
+        'xml_1_8_falcon_2_fractions.xml',
+        'xml_1_8_k2.xml',
+        'xml_1_9_k2.xml',
+        'xml_1_11_falcon.xml',
+        'xml_1_11_falcon_frames.xml',
+        'xml_1_11_falcon_vpp.xml',
+        'xml_1_11_falcon_vpp_fractions.xml',
+        ])
+    def test_streaming_should_match_load_xml(self, level_dict, file_name):
+        file_name = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, file_name)
+        data_frame = xml.load_xml(file_name, level_dict)
+        streaming_frame = xml.load_xml(file_name, level_dict, streaming=True)
+
+        assert streaming_frame.equals(data_frame)
+        assert list(streaming_frame) == list(data_frame)
+
+    @pytest.mark.parametrize('file_name', [
+        'xml_1_8_falcon_2.xml',
+        'xml_1_8_falcon_2_fractions.xml',
+        'xml_1_8_k2.xml',
+        'xml_1_9_k2.xml',
+        'xml_1_11_falcon.xml',
+        'xml_1_11_falcon_frames.xml',
+        'xml_1_11_falcon_vpp.xml',
+        'xml_1_11_falcon_vpp_fractions.xml',
+        ])
+    def test_streaming_key_value_only_should_match_load_xml(self, level_dict, file_name):
+        file_name = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, file_name)
+        key_value_dict = {'key_value': level_dict['key_value']}
+        data_frame = xml.load_xml(file_name, key_value_dict)
+        streaming_frame = xml.load_xml(file_name, key_value_dict, streaming=True)
+
+        assert streaming_frame.equals(data_frame)
+        assert list(streaming_frame) == list(data_frame)
+
+    def test_streaming_without_stop_early_should_match_load_xml(self, level_dict):
+        file_name = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'xml_1_11_falcon_vpp_fractions.xml')
+        data_dict = {}
+        xml.iterparse_node(file_name, data_dict, xml.compile_level_dict(level_dict), stop_early=False)
+
+        assert pd.DataFrame(data_dict, index=[0]).equals(xml.load_xml(file_name, level_dict))
+
+    def test_compiled_handlers_should_be_reusable(self, level_dict):
+        file_name_1 = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'xml_1_8_k2.xml')
+        file_name_2 = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'xml_1_11_falcon.xml')
+        tag_handlers = xml.compile_level_dict(level_dict)
+
+        assert xml.load_xml_compiled(file_name_1, tag_handlers).equals(xml.load_xml(file_name_1, level_dict))
+        assert xml.load_xml_compiled(file_name_2, tag_handlers).equals(xml.load_xml(file_name_2, level_dict))
+
+    def test_many_should_match_load_xml(self, level_dict):
+        file_names = [
+            os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'xml_1_8_k2.xml'),
+            os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'xml_1_11_falcon_vpp.xml'),
+            ]
+        data_frame = xml.load_xml_many(file_names, level_dict)
+
+        assert data_frame['file_name'].tolist() == file_names
+        for index, file_name in enumerate(file_names):
+            single_frame = xml.load_xml(file_name, level_dict, typed=True)
+            for name in single_frame:
+                assert data_frame[name][index] == single_frame[name][0]
+
+    def test_many_missing_key_should_be_nan(self, level_dict):
+        file_names = [
+            os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'xml_1_8_k2.xml'),
+            os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'xml_1_11_falcon_vpp.xml'),
+            ]
+        data_frame = xml.load_xml_many(file_names, level_dict)
+
+        assert pd.isnull(data_frame['PhasePlateApertureName'][0])
+        assert data_frame['PhasePlateApertureName'][1] == 'Ph P4'
+
+    def test_many_columns_should_follow_schema(self, level_dict):
+        file_name = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'xml_1_11_falcon.xml')
+        data_frame = xml.load_xml_many([file_name], level_dict)
+
+        assert data_frame['Dose'].dtype == float
+        assert data_frame['pixelSize_x'][0] == 1.237386165753307E-10
+        assert data_frame['NumberOffractions'].dtype == 'int32'
+        assert data_frame['NumberOffractions'][0] == 119
+        assert data_frame['PhasePlateUsed'].dtype == bool
+        assert not data_frame['PhasePlateUsed'][0]
+        assert data_frame['ApplicationSoftware'].dtype == 'category'
+        assert data_frame['ApplicationSoftware'][0] == 'Fei EPU'
+        assert data_frame['acquisitionDateTime'][0] == '2018-08-27T18:15:57.2721016+02:00'
+
+    def test_typed_should_not_change_untyped_default(self, level_dict):
+        file_name = os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'xml_1_11_falcon.xml')
+        data_frame = xml.load_xml(file_name, level_dict)
+
+        assert data_frame['Dose'][0] == '2.4137967554022204E+22'
+
+    def test_many_processes_should_match_single_worker(self, level_dict):
+        file_names = [
+            os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'xml_1_8_k2.xml'),
+            os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'xml_1_9_k2.xml'),
+            os.path.join(THIS_DIR, INPUT_TEST_FOLDER, 'xml_1_11_falcon.xml'),
+            ]
+        data_frame = xml.load_xml_many(file_names, level_dict, n_workers=2)
+
+        assert data_frame.equals(xml.load_xml_many(file_names, level_dict))
+
+    def test_many_empty_list_should_return_empty_frame(self, level_dict):
+        data_frame = xml.load_xml_many([], level_dict)
+
+        assert data_frame.empty
+
+
+class TestCompileLevelDict():
+
+    def test_key_value_should_be_parent_handler(self):
+        level_dict = {'key_value': {'Key': ['Value']}, 'level 0': {'tag': []}}
+        tag_handlers = xml.compile_level_dict(level_dict)
+
+        assert list(tag_handlers['parent']) == ['Key']
+        assert list(tag_handlers['node']) == ['tag']
+        assert tag_handlers['parent']['Key'][0] == (0, xml.get_all_key_value, 'Key', ['Value'])
+        assert tag_handlers['node']['tag'][0] == (1, xml.get_level_0_xml, 'tag', [])
+
+    def test_same_tag_in_two_levels_should_keep_both_handlers(self):
+        level_dict = {'level 0': {'tag': []}, 'level 1': {'tag': ['sub']}}
+        tag_handlers = xml.compile_level_dict(level_dict)
+
+        assert [handler[1] for handler in tag_handlers['node']['tag']] == \
+            [xml.get_level_0_xml, xml.get_level_1_xml]
+
+    def test_unknown_level_should_raise_keyerror(self):
+        with pytest.raises(KeyError):
+            xml.compile_level_dict({'level 2': {'tag': []}})
+
+
+class TestIterparseNode():
+
+    @pytest.fixture(scope='class')
+    def tag_handlers(self):
+        return xml.compile_level_dict({
+            'level 0': {'sub_level_0': []},
+            'level 1': {'sub_level_1_0': ['sub_level_1_1']},
+            })
+
+    @pytest.fixture(scope='class')
+    def truncated_file(self, tmpdir_factory):
+        output_file = tmpdir_factory.mktemp('xml').join('truncated.xml')
+        output_file.write(
+            '<root>'
+            '<sub_level_1_0><sub_level_1_1>1</sub_level_1_1></sub_level_1_0>'
+            '<data><pair><Key>key</Key><Value>value</Value></pair></data>'
+            '<sub_level_0>0</sub_level_0>' +
+            '<filler>filler</filler>' * 10000 +
+            '<broken'
+            )
+        return str(output_file)
+
+    def test_stop_early_should_not_read_rest_of_file(self, tag_handlers, truncated_file):
+        data_dict = {}
+        xml.iterparse_node(truncated_file, data_dict, tag_handlers)
+
+        assert data_dict == {'sub_level_1_0_sub_level_1_1': '1', 'sub_level_0': '0'}
+
+    def test_no_stop_early_should_raise_parseerror(self, tag_handlers, truncated_file):
+        data_dict = {}
+        with pytest.raises(et.ParseError):
+            xml.iterparse_node(truncated_file, data_dict, tag_handlers, stop_early=False)
+
+    def test_key_value_should_read_rest_of_file(self, truncated_file):
+        tag_handlers = xml.compile_level_dict({
+            'key_value': {'Key': ['Value']},
+            'level 0': {'sub_level_0': []},
+            })
+        data_dict = {}
+        with pytest.raises(et.ParseError):
+            xml.iterparse_node(truncated_file, data_dict, tag_handlers)
+
+    def test_key_value_pairs_should_all_be_read(self, tmpdir):
+        output_file = tmpdir.join('pairs.xml')
+        output_file.write(
+            '<root><data>'
+            '<pair><Key>key_1</Key><Value>1</Value></pair>'
+            '<pair><Key>key_2</Key><Value>2</Value></pair>'
+            '</data></root>'
+            )
+        data_dict = {}
+        xml.iterparse_node(
+            str(output_file),
+            data_dict,
+            xml.compile_level_dict({'key_value': {'Key': ['Value']}})
+            )
+
+        assert data_dict == {'key_1': '1', 'key_2': '2'}
+
+
+class TestApplyXmlSchema():
+
+    def test_missing_values_should_stay_missing(self):
+        data_frame = pd.DataFrame({
+            'Dose': ['1.5', None],
+            'NumberOffractions': [None, '40'],
+            'PhasePlateUsed': ['true', None],
+            'ComputerName': ['a', None],
+            }, dtype=object)
+        typed_frame = xml.apply_xml_schema(data_frame)
+
+        assert typed_frame['Dose'][0] == 1.5
+        assert pd.isnull(typed_frame['Dose'][1])
+        assert pd.isnull(typed_frame['NumberOffractions'][0])
+        assert typed_frame['NumberOffractions'][1] == 40
+        assert typed_frame['PhasePlateUsed'][0]
+        assert pd.isnull(typed_frame['PhasePlateUsed'][1])
+        assert pd.isnull(typed_frame['ComputerName'][1])
+
+    def test_unknown_column_should_stay_string(self):
+        data_frame = pd.DataFrame({'Unknown': ['1.5']})
+        typed_frame = xml.apply_xml_schema(data_frame)
+
+        assert typed_frame['Unknown'][0] == '1.5'
+
+    def test_custom_schema_should_be_used(self):
+        data_frame = pd.DataFrame({'Unknown': ['1.5']})
+        typed_frame = xml.apply_xml_schema(data_frame, {'Unknown': ('float64', 'm')})
+
+        assert typed_frame['Unknown'][0] == 1.5
+
+    def test_input_should_not_be_modified(self):
+        data_frame = pd.DataFrame({'Dose': ['1.5']})
+        xml.apply_xml_schema(data_frame)
+
+        assert data_frame['Dose'][0] == '1.5'
+
+    def test_complete_int_and_bool_columns_should_be_converted(self):
+        data_frame = pd.DataFrame({'NumberOffractions': ['40'], 'PhasePlateUsed': ['False']})
+        typed_frame = xml.apply_xml_schema(data_frame)
+
+        assert typed_frame['NumberOffractions'].dtype == np.int32
+        assert typed_frame['PhasePlateUsed'].dtype == bool
+
+    def test_not_integer_should_raise_valueerror(self):
+        data_frame = pd.DataFrame({'NumberOffractions': ['1.5']})
+        with pytest.raises(ValueError):
+            xml.apply_xml_schema(data_frame)
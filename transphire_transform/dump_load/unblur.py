@@ -23,38 +23,112 @@ SOFTWARE.
 """
 
 
+import re
 import typing
 
+import numpy as np # type: ignore
 import pandas as pd # type: ignore
 
 from . import util
 
 
-def load_unblur_1_0_2(file_name: str) -> pd.DataFrame:
+def get_unblur_1_0_2_extract_dict() -> typing.Dict[str, str]:
     """
-    Read the motioncor shift files.
+    Returns the extraction dict for the unblur meta information.
 
     Arguments:
-    file_name - Name of the motioncor shift file
+    None
 
     Returns:
-    Pandas data frame containing the extended header information
+    Dictionary with key as key and regular expression as value.
+    """
+    return {
+        'n_micrographs': r'.*Number of micrographs: ([^ ]*).*',
+        'PixelSize': r'.*Pixel size \(A\): ([^ ]*).*',
+        }
+
+
+def get_unblur_1_0_2_meta(file_name: str) -> typing.Dict[str, float]:
     """
-    input_data: pd.DataFrame
-    output_data: pd.DataFrame
+    Import the unblur header information used.
+    Only the header in front of the first shift line is read.
+
+    Arguments:
+    file_name - Name of the file to export the information from.
+
+    Returns:
+    Dictionary containing the information.
+    """
+    extract_dict: typing.Dict[str, str]
+    meta_data: typing.Dict[str, float]
+    match: typing.Optional[typing.Match[str]]
+
+    extract_dict = get_unblur_1_0_2_extract_dict()
+    meta_data = {}
+    with open(file_name, 'r') as read:
+        for line in read:
+            if not line.startswith('#'):
+                break
+            for key, value in extract_dict.items():
+                match = re.match(value, line)
+                if match is not None:
+                    meta_data[key] = float(match.group(1))
+
+    return meta_data
 
+
+def load_unblur_trajectories_1_0_2(file_name: str, to_pixel: bool=False) -> np.ndarray:
+    """
+    Read all micrographs of an unblur shift file.
+    The shifts are referenced to the first frame.
+
+    Arguments:
+    file_name - Name of the unblur shift file
+    to_pixel - Convert the shifts from Angstrom to pixel (default False)
+
+    Returns:
+    Numpy array of shape (n_micrographs, n_frames, 2) containing the x and y shifts
+    """
+    meta_data: typing.Dict[str, float]
+    input_data: np.ndarray
+    output_data: np.ndarray
+
+    meta_data = get_unblur_1_0_2_meta(file_name)
     input_data = util.load_file(
         file_name,
         comment='#',
-        )
-    output_data = input_data.transpose()
-    output_data.rename(columns={0: 'shift_x', 1: 'shift_y'}, inplace=True)
-    output_data['shift_x'] -= output_data['shift_x'].iloc[0]
-    output_data['shift_y'] -= output_data['shift_y'].iloc[0]
+        ).values
+    if input_data.shape[0] != 2 * meta_data.get('n_micrographs', input_data.shape[0] // 2):
+        raise IOError(f'{file_name} does not contain two rows per micrograph')
+
+    output_data = np.empty((input_data.shape[0] // 2, input_data.shape[1], 2), dtype=float)
+    output_data[:, :, 0] = input_data[0::2]
+    output_data[:, :, 1] = input_data[1::2]
+    output_data -= output_data[:, :1]
+    if to_pixel:
+        if 'PixelSize' not in meta_data:
+            raise IOError(f'{file_name} does not contain a pixel size to convert the shifts')
+        output_data /= meta_data['PixelSize']
 
     return output_data
 
 
+def load_unblur_1_0_2(file_name: str) -> pd.DataFrame:
+    """
+    Read the motioncor shift files.
+
+    Arguments:
+    file_name - Name of the motioncor shift file
+
+    Returns:
+    Pandas data frame containing the extended header information
+    """
+    return pd.DataFrame(
+        load_unblur_trajectories_1_0_2(file_name)[0],
+        columns=['shift_x', 'shift_y']
+        )
+
+
 def load_unblur(
         file_name: str,
         version: typing.Optional[str]=None
@@ -83,3 +157,36 @@ def load_unblur(
 
     function = util.extract_function_from_function_dict(function_dict, version)
     return function(file_name)
+
+
+def load_unblur_trajectories(
+        file_name: str,
+        version: typing.Optional[str]=None,
+        to_pixel: bool=False
+    ) -> np.ndarray:
+    """
+    Load all micrographs of an unblur shift file based on the version number
+
+    Arguments:
+    file_name - Path to the input unblur file.
+    version - Unblur version default the latest version
+    to_pixel - Convert the shifts from Angstrom to pixel (default False)
+
+    Returns:
+    Numpy array of shape (n_micrographs, n_frames, 2) containing the x and y shifts
+    """
+    function_dict: typing.Dict[
+        str,
+        typing.Callable[
+            [str, bool],
+            np.ndarray
+            ]
+        ]
+    function: typing.Callable[[str, bool], np.ndarray]
+
+    function_dict = {
+        '1.0.2': load_unblur_trajectories_1_0_2,
+        }
+
+    function = util.extract_function_from_function_dict(function_dict, version)
+    return function(file_name, to_pixel)
@@ -22,7 +22,9 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import concurrent.futures
 import typing
+import numpy as np # type: ignore
 import pandas as pd # type: ignore
 
 
@@ -57,16 +59,19 @@ def dump_file(
         file_name: str,
         data: pd.DataFrame,
         header: typing.Optional[typing.List[str]] = None,
-        vertical: bool = True
+        vertical: bool = True,
+        append: bool = False
     ) -> None:
     """
     Dump a file with or without a header to an output file.
+    In append mode, the header is skipped and the data is added to the end of the file.
 
     Arguments:
     file_name - Name of the output file
     data - Pandas dataframe containing the data to dump
     header - List of header names (Default None)
     vertical - Stack the header vertical or horizontal (default vertical)
+    append - Append the data to an existing file (default False)
 
     Returns:
     None
@@ -85,8 +90,9 @@ def dump_file(
     else:
         export_header = '{0}\n'.format(orientation.join(header))
 
-    with open(file_name, 'w') as write:
-        write.write(f'{export_header}')
+    if not append:
+        with open(file_name, 'w') as write:
+            write.write(f'{export_header}')
     data.to_csv(file_name, sep='\t', header=False, index=False, mode='a')
 
 
@@ -256,3 +262,69 @@ def extract_function_from_function_dict(
             match_version = sorted_version_list[idx_version-1]
 
     return function_dict['.'.join([str(entry) for entry in match_version])]
+
+
+def map_files(
+        function: typing.Callable[[str], typing.Any],
+        file_names: typing.List[str],
+        n_workers: int=1,
+        use_processes: bool=False
+    ) -> typing.List[typing.Any]:
+    """
+    Apply the function to every file name and keep the input order.
+    With more than one worker, a thread or process pool is used.
+
+    Arguments:
+    function - Function to apply, needs to be picklable for processes
+    file_names - List of file names
+    n_workers - Number of parallel workers (default 1)
+    use_processes - Use processes instead of threads (default False)
+
+    Returns:
+    List of function results
+    """
+    executor_class: typing.Type[concurrent.futures.Executor]
+
+    if n_workers <= 1:
+        return [function(file_name) for file_name in file_names]
+
+    if use_processes:
+        executor_class = concurrent.futures.ProcessPoolExecutor
+    else:
+        executor_class = concurrent.futures.ThreadPoolExecutor
+
+    with executor_class(max_workers=n_workers) as executor:
+        return list(executor.map(function, file_names))
+
+
+def stack_padded(
+        arrays: typing.List[np.ndarray],
+        fill_value: float=np.nan
+    ) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """
+    Stack arrays with a different number of rows into a single array.
+    Missing rows are filled with fill_value.
+
+    Arguments:
+    arrays - List of arrays with the same shape except for the first axis
+    fill_value - Value of the padded entries (default nan)
+
+    Returns:
+    Stacked array of shape (n_arrays, max_rows, ...), number of valid rows per array
+    """
+    lengths: np.ndarray
+    output_array: np.ndarray
+
+    if not arrays:
+        raise IOError('Cannot stack empty sequence')
+
+    lengths = np.array([len(array) for array in arrays], dtype=int)
+    output_array = np.full(
+        (len(arrays), lengths.max()) + arrays[0].shape[1:],
+        fill_value,
+        dtype=float
+        )
+    for idx, array in enumerate(arrays):
+        output_array[idx, :len(array)] = array
+
+    return output_array, lengths
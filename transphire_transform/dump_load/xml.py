@@ -17,19 +17,28 @@
 """
 
 
+import functools
+import sys
 import typing
 import re
 import xml.etree.ElementTree as et
 
+import numpy as np # type: ignore
 import pandas as pd # type: ignore
 
+from . import epu
 from . import util
 
 
+XML_KEY_PATTERN = re.compile(r'.*{.*}(.*)')
+
+
+@functools.lru_cache(maxsize=4096)
 def get_key_without_prefix(key: str) -> str:
     """
     Return the key of the XML entry by removing trailing and leading whitespaces
     and underscores.
+    The results are cached and interned, because the number of different tags is small.
 
     Arguments:
     key - XML key
@@ -40,12 +49,26 @@ def get_key_without_prefix(key: str) -> str:
     return_key: str
     xml_key_match: typing.Optional[typing.Match[str]]
 
-    xml_key_match = re.match(r'.*{.*}(.*)', key)
+    xml_key_match = XML_KEY_PATTERN.match(key)
     if xml_key_match is None:
         return_key = key
     else:
         return_key = xml_key_match.group(1)
-    return return_key.strip().strip('_')
+    return sys.intern(return_key.strip().strip('_'))
+
+
+@functools.lru_cache(maxsize=1024)
+def get_search_keys_without_prefix(search_keys: typing.Tuple[str, ...]) -> typing.FrozenSet[str]:
+    """
+    Return the set of search keys without prefix.
+
+    Arguments:
+    search_keys - XML search keys
+
+    Returns:
+    Set of keys without prefix
+    """
+    return frozenset(get_key_without_prefix(search_key) for search_key in search_keys)
 
 
 def get_all_key_value(
@@ -241,23 +264,22 @@ def get_level_1_xml(
     Returns:
     None
     """
-    search_keys_no_prefix: typing.List[str]
+    search_keys_no_prefix: typing.FrozenSet[str]
     key_1: str
     key_2: str
     combined_key: str
 
-    search_keys_no_prefix = [get_key_without_prefix(search_key) for search_key in search_keys]
     if key == node.tag:
+        search_keys_no_prefix = get_search_keys_without_prefix(tuple(search_keys))
         key_1 = get_key_without_prefix(key)
 
         for child in node:
             key_2 = get_key_without_prefix(child.tag)
-            combined_key = '_'.join([key_1, key_2])
 
-            for key_check in search_keys_no_prefix:
-                if key_check == key_2:
-                    assert child.text is not None
-                    util.add_to_dict(data_dict, combined_key, child.text)
+            if key_2 in search_keys_no_prefix:
+                combined_key = '_'.join([key_1, key_2])
+                assert child.text is not None
+                util.add_to_dict(data_dict, combined_key, child.text)
     else:
         pass
 
@@ -288,16 +310,15 @@ def get_level_3_xml(
     Returns:
     None
     """
-    search_keys_no_prefix: typing.List[str]
+    search_keys_no_prefix: typing.FrozenSet[str]
     key_1: str
     key_2: str
     combined_key: str
-    test_tag: str
     list_key: typing.List[str]
     list_child: typing.List[et.Element]
 
     if key == node.tag:
-        search_keys_no_prefix = [get_key_without_prefix(search_key) for search_key in search_keys]
+        search_keys_no_prefix = get_search_keys_without_prefix(tuple(search_keys))
         list_key = []
         list_child = []
 
@@ -313,12 +334,9 @@ def get_level_3_xml(
         assert len(list_key) == len(list_child)
         for combined_key, child in zip(list_key, list_child):
             for grand_child in child:
-                test_tag = get_key_without_prefix(grand_child.tag)
-
-                for key_check in search_keys_no_prefix:
-                    if key_check == test_tag:
-                        assert grand_child.text is not None
-                        util.add_to_dict(data_dict, combined_key, grand_child.text)
+                if get_key_without_prefix(grand_child.tag) in search_keys_no_prefix:
+                    assert grand_child.text is not None
+                    util.add_to_dict(data_dict, combined_key, grand_child.text)
     else:
         pass
 
@@ -370,47 +388,580 @@ def recursive_node(
     return None
 
 
+def get_level_func_dict() -> typing.Dict[
+        str,
+        typing.Callable[
+            [et.Element, str, typing.List[str], typing.Dict[str, str]],
+            None
+            ]
+        ]:
+    """
+    Returns the level function for every level in the level_dict.
+
+    Arguments:
+    None
+
+    Returns:
+    Dictionary with the level name as key and the function as value
+    """
+    return {
+        'key_value': get_all_key_value,
+        'level 0': get_level_0_xml,
+        'level 1': get_level_1_xml,
+        'level 3': get_level_3_xml,
+        }
+
+
+def compile_level_dict(
+        level_dict: typing.Dict[str, typing.Dict[str, typing.List[str]]],
+        level_func_dict: typing.Optional[typing.Dict[
+            str,
+            typing.Callable[
+                [et.Element, str, typing.List[str], typing.Dict[str, str]],
+                None
+                ]
+            ]]=None
+    ) -> typing.Dict[str, typing.Dict[str, typing.List[typing.Tuple[
+            int,
+            typing.Callable[[et.Element, str, typing.List[str], typing.Dict[str, str]], None],
+            str,
+            typing.List[str]
+            ]]]]:
+    """
+    Map every searched tag to the level functions that need to be called for it.
+    The key_value level is called on the parent of the tag,
+    all other levels on the node with the tag itself.
+    The compiled handlers can be reused for every file with the same level_dict.
+
+    Arguments:
+    level_dict - Dictionary containing the searched keys for each level
+    level_func_dict - Dictionary containing the level functions (default get_level_func_dict)
+
+    Returns:
+    Dictionary with the handlers by node tag ('node') and by child tag ('parent')
+    """
+    tag_handlers: typing.Dict[str, typing.Dict[str, typing.List[typing.Tuple[
+        int,
+        typing.Callable[[et.Element, str, typing.List[str], typing.Dict[str, str]], None],
+        str,
+        typing.List[str]
+        ]]]]
+    position: int
+
+    if level_func_dict is None:
+        level_func_dict = get_level_func_dict()
+
+    tag_handlers = {'node': {}, 'parent': {}}
+    position = 0
+    for level_key, level_value in level_dict.items():
+        for key, value in level_value.items():
+            tag_handlers['parent' if level_key == 'key_value' else 'node'].setdefault(
+                key,
+                []
+                ).append((position, level_func_dict[level_key], key, value))
+            position += 1
+
+    return tag_handlers
+
+
+def get_element_handlers(
+        element: et.Element,
+        tag_handlers: typing.Dict[str, typing.Dict[str, typing.List[typing.Tuple[
+            int,
+            typing.Callable[[et.Element, str, typing.List[str], typing.Dict[str, str]], None],
+            str,
+            typing.List[str]
+            ]]]]
+    ) -> typing.List[typing.Tuple[
+        int,
+        typing.Callable[[et.Element, str, typing.List[str], typing.Dict[str, str]], None],
+        str,
+        typing.List[str]
+        ]]:
+    """
+    Return the compiled level handlers that need to be called for the element.
+    The handlers are sorted in the same order as in recursive_node.
+
+    Arguments:
+    element - Node in the xml tree
+    tag_handlers - Handlers created by compile_level_dict
+
+    Returns:
+    List of handlers containing the position, level function, key and search keys
+    """
+    handlers: typing.List[typing.Tuple[
+        int,
+        typing.Callable[[et.Element, str, typing.List[str], typing.Dict[str, str]], None],
+        str,
+        typing.List[str]
+        ]]
+
+    handlers = tag_handlers['node'].get(element.tag, [])
+    if tag_handlers['parent']:
+        for tag in set(child.tag for child in element) & tag_handlers['parent'].keys():
+            handlers = handlers + tag_handlers['parent'][tag]
+        if len(handlers) > 1:
+            handlers = sorted(handlers, key=lambda handler: handler[0])
+
+    return handlers
+
+
+def compiled_node(
+        node: et.Element,
+        data_dict: typing.Dict[str, str],
+        tag_handlers: typing.Dict[str, typing.Dict[str, typing.List[typing.Tuple[
+            int,
+            typing.Callable[[et.Element, str, typing.List[str], typing.Dict[str, str]], None],
+            str,
+            typing.List[str]
+            ]]]]
+    ) -> None:
+    """
+    Find all xml information in a single walk with the compiled level handlers.
+    The handlers are called in the same order as in recursive_node.
+
+    Arguments:
+    node - Root node to search
+    data_dict - Dictionary containing the extracted data
+    tag_handlers - Handlers created by compile_level_dict
+
+    Returns:
+    None - Dictionary will be modified inplace
+    """
+    for element in node.iter():
+        for _, function, key, value in get_element_handlers(element, tag_handlers):
+            function(element, key, value, data_dict)
+
+    return None
+
+
+def merge_handler_results(
+        data_dict: typing.Dict[str, str],
+        results: typing.List[typing.Tuple[int, int, typing.Dict[str, str]]]
+    ) -> None:
+    """
+    Add the handler results to the data dictionary sorted by element and handler position.
+
+    Arguments:
+    data_dict - Dictionary containing the extracted data
+    results - List of element position, handler position and extracted data
+
+    Returns:
+    None - Dictionary will be modified inplace
+    """
+    for _, _, handler_dict in sorted(results, key=lambda result: result[:2]):
+        for key, value in handler_dict.items():
+            util.add_to_dict(data_dict, key, value)
+
+    return None
+
+
+def iterparse_node(
+        file_name: str,
+        data_dict: typing.Dict[str, str],
+        tag_handlers: typing.Dict[str, typing.Dict[str, typing.List[typing.Tuple[
+            int,
+            typing.Callable[[et.Element, str, typing.List[str], typing.Dict[str, str]], None],
+            str,
+            typing.List[str]
+            ]]]],
+        stop_early: bool=True
+    ) -> None:
+    """
+    Find all xml information while streaming the file with the compiled level handlers.
+    Handlers are called once their element is complete and elements that are
+    not needed by a handler anymore are cleared.
+    A searched tag is done once its element is complete.
+    Key/value pairs can occur anywhere in the file,
+    so the file is always read completely if key_value handlers are present.
+    The data_dict is filled in the same order as in recursive_node.
+
+    Arguments:
+    file_name - Path to the xml file
+    data_dict - Dictionary containing the extracted data
+    tag_handlers - Handlers created by compile_level_dict
+    stop_early - Stop parsing once every searched tag is done;
+                 Ignored if key_value handlers are present (default True)
+
+    Returns:
+    None - Dictionary will be modified inplace
+    """
+    keep_tags: typing.Set[str]
+    missing_tags: typing.Set[str]
+    results: typing.List[typing.Tuple[int, int, typing.Dict[str, str]]]
+    stack: typing.List[typing.List[typing.Any]]
+    n_needed: int
+    n_started: int
+
+    # Parents of key_value keys and values need to keep their children
+    keep_tags = set(tag_handlers['parent']) | set(
+        search_key
+        for handlers in tag_handlers['parent'].values()
+        for handler in handlers
+        for search_key in handler[3]
+        )
+    missing_tags = set(tag_handlers['node'])
+    stop_early = stop_early and bool(missing_tags) and not tag_handlers['parent']
+    results = []
+    stack = []
+    n_needed = 0
+    n_started = 0
+
+    with open(file_name, 'rb') as read:
+        for event, element in et.iterparse(read, events=('start', 'end')):
+            if event == 'start':
+                # Element, pre-order position, needed by a handler, done tags
+                stack.append([element, n_started, element.tag in tag_handlers['node'], set()])
+                n_started += 1
+                n_needed += stack[-1][2]
+                if element.tag in keep_tags and len(stack) > 1 and not stack[-2][2]:
+                    stack[-2][2] = True
+                    n_needed += 1
+                continue
+
+            entry = stack.pop()
+            for handler in get_element_handlers(element, tag_handlers):
+                results.append((entry[1], handler[0], {}))
+                handler[1](element, handler[2], handler[3], results[-1][2])
+                (stack[-1] if stack and handler[2] != element.tag else entry)[3].add(handler[2])
+
+            missing_tags -= entry[3]
+            n_needed -= entry[2]
+            if n_needed == 0:
+                element.clear()
+                if stack:
+                    del stack[-1][0][-1]
+
+            if stop_early and not missing_tags:
+                break
+
+    merge_handler_results(data_dict, results)
+    return None
+
+
+def load_xml_dict(
+        file_name: str,
+        tag_handlers: typing.Dict[str, typing.Dict[str, typing.List[typing.Tuple[
+            int,
+            typing.Callable[[et.Element, str, typing.List[str], typing.Dict[str, str]], None],
+            str,
+            typing.List[str]
+            ]]]],
+        streaming: bool=False
+    ) -> typing.Dict[str, str]:
+    """
+    Extract the xml information from the file into a dictionary.
+
+    Arguments:
+    file_name - Path to the xml file
+    tag_handlers - Handlers created by compile_level_dict
+    streaming - Use iterparse_node instead of parsing the full tree (default False)
+
+    Returns:
+    Dictionary containing the information
+    """
+    data_dict: typing.Dict[str, str]
+
+    data_dict = {}
+    if streaming:
+        iterparse_node(
+            file_name=file_name,
+            data_dict=data_dict,
+            tag_handlers=tag_handlers
+            )
+    else:
+        compiled_node(
+            node=et.parse(file_name).getroot(),
+            data_dict=data_dict,
+            tag_handlers=tag_handlers
+            )
+
+    return data_dict
+
+
+def load_xml_compiled(
+        file_name: str,
+        tag_handlers: typing.Dict[str, typing.Dict[str, typing.List[typing.Tuple[
+            int,
+            typing.Callable[[et.Element, str, typing.List[str], typing.Dict[str, str]], None],
+            str,
+            typing.List[str]
+            ]]]],
+        streaming: bool=False
+    ) -> pd.DataFrame:
+    """
+    Extract the xml information from the file with precompiled level handlers.
+
+    Arguments:
+    file_name - Path to the xml file
+    tag_handlers - Handlers created by compile_level_dict
+    streaming - Use iterparse_node instead of parsing the full tree (default False)
+
+    Returns:
+    Pandas data frame containing the information
+    """
+    return pd.DataFrame(load_xml_dict(file_name, tag_handlers, streaming), index=[0])
+
+
 def load_xml(
         file_name: str,
-        level_dict: typing.Dict[str, typing.Dict[str, typing.List[str]]]
+        level_dict: typing.Optional[typing.Dict[str, typing.Dict[str, typing.List[str]]]]=None,
+        streaming: bool=False,
+        typed: bool=False
     ) -> pd.DataFrame:
     """
     Extract the xml information from the file.
+    By default, the level_dict of the detected preset is used.
 
     Arguments:
     file_name - Path to the xml file
-    level_dict - Dictionary containin the keys to extract
+    level_dict - Dictionary containin the keys to extract (default epu.detect_xml_preset)
+    streaming - Stream the file and stop once all keys are found (default False)
+    typed - Convert the columns with apply_xml_schema (default False)
 
     Returns:
     Pandas data frame containing the information
     """
-    level_func_dict: typing.Dict[
+    xml_data: pd.DataFrame
+
+    if level_dict is None:
+        level_dict = epu.get_xml_level_dict(epu.detect_xml_preset(file_name))
+
+    xml_data = load_xml_compiled(file_name, compile_level_dict(level_dict), streaming)
+    if typed:
+        xml_data = apply_xml_schema(xml_data)
+    return xml_data
+
+
+def get_xml_schema() -> typing.Dict[str, typing.Tuple[str, str]]:
+    """
+    Returns the data type and the unit for the extracted xml keys.
+    An empty unit means arbitrary or no unit.
+
+    Arguments:
+    None
+
+    Returns:
+    Dictionary with the key as key and (data type, unit) as value
+    """
+    return {
+        'Dose': ('float64', 'e/m^2'),
+        'DoseOnCamera': ('float64', ''),
+        'AppliedDefocus': ('float64', 'm'),
+        'Defocus': ('float64', 'm'),
+        'AccelerationVoltage': ('float64', 'V'),
+        'Intensity': ('float64', ''),
+        'NominalMagnification': ('float64', ''),
+        'camera_ExposureTime': ('float64', 's'),
+        'camera_PreExposureTime': ('float64', 's'),
+        'camera_PreExposurePauseTime': ('float64', 's'),
+        'pixelSize_x': ('float64', 'm'),
+        'pixelSize_y': ('float64', 'm'),
+        'offset_x': ('float64', 'm'),
+        'offset_y': ('float64', 'm'),
+        'Position_A': ('float64', 'rad'),
+        'Position_B': ('float64', 'rad'),
+        'Position_X': ('float64', 'm'),
+        'Position_Y': ('float64', 'm'),
+        'Position_Z': ('float64', 'm'),
+        'ImageShift_x': ('float64', ''),
+        'ImageShift_y': ('float64', ''),
+        'BeamShift_x': ('float64', ''),
+        'BeamShift_y': ('float64', ''),
+        'BeamTilt_x': ('float64', ''),
+        'BeamTilt_y': ('float64', ''),
+        'NumberOffractions': ('int32', ''),
+        'FramesPerFraction': ('int32', ''),
+        'CetaFramesSummed': ('int32', ''),
+        'SuperResolutionFactor': ('int32', ''),
+        'PhasePlatePosition': ('int32', ''),
+        'Binning_x': ('int32', ''),
+        'Binning_y': ('int32', ''),
+        'ReadoutArea_height': ('int32', 'pixel'),
+        'ReadoutArea_width': ('int32', 'pixel'),
+        'ExpectedNumberOfFractions': ('int32', ''),
+        'RecordedNumberOfFractions': ('int32', ''),
+        'Binning': ('int32', ''),
+        'RegionOfInterest_Top': ('int32', 'pixel'),
+        'RegionOfInterest_Left': ('int32', 'pixel'),
+        'RegionOfInterest_Width': ('int32', 'pixel'),
+        'RegionOfInterest_Height': ('int32', 'pixel'),
+        'PhasePlateUsed': ('bool', ''),
+        'CetaNoiseReductionEnabled': ('bool', ''),
+        'ElectronCountingEnabled': ('bool', ''),
+        'AlignIntegratedImageEnabled': ('bool', ''),
+        'ApplicationSoftware': ('category', ''),
+        'ApplicationSoftwareVersion': ('category', ''),
+        'ComputerName': ('category', ''),
+        'InstrumentID': ('category', ''),
+        'InstrumentModel': ('category', ''),
+        'PhasePlateApertureName': ('category', ''),
+        'BinaryResult.Detector': ('category', ''),
+        'Detector': ('category', ''),
+        'FileVersion': ('category', ''),
+        }
+
+
+def convert_to_float(values: pd.Series) -> pd.Series:
+    """
+    Convert string values to float, missing values are NaN.
+    Every value is parsed by float, so the result is exact.
+
+    Arguments:
+    values - Series of strings
+
+    Returns:
+    Series of floats
+    """
+    return values.astype(object).astype(float)
+
+
+def convert_to_int(values: pd.Series) -> pd.Series:
+    """
+    Convert string values to int32.
+    Columns with missing values stay float with NaN.
+
+    Arguments:
+    values - Series of strings
+
+    Returns:
+    Series of integers
+    """
+    float_values: pd.Series
+
+    float_values = convert_to_float(values)
+    if (float_values % 1 > 0).any():
+        raise ValueError(f'{values.name}: Cannot convert non integer values to int')
+    if float_values.isnull().any():
+        return float_values
+    return float_values.astype(np.int32)
+
+
+def convert_to_bool(values: pd.Series) -> pd.Series:
+    """
+    Convert true/false string values to bool.
+    Columns with missing values stay object with NaN.
+
+    Arguments:
+    values - Series of strings
+
+    Returns:
+    Series of booleans
+    """
+    bool_values: pd.Series
+
+    bool_values = values.str.lower().map({'true': True, 'false': False})
+    if bool_values.isnull().any():
+        return bool_values
+    return bool_values.astype(bool)
+
+
+def convert_to_category(values: pd.Series) -> pd.Series:
+    """
+    Convert string values to a category to store repeated strings once.
+
+    Arguments:
+    values - Series of strings
+
+    Returns:
+    Series of categories
+    """
+    return values.astype('category')
+
+
+def apply_xml_schema(
+        xml_data: pd.DataFrame,
+        schema: typing.Optional[typing.Dict[str, typing.Tuple[str, str]]]=None
+    ) -> pd.DataFrame:
+    """
+    Convert the columns of the xml data to the data type of the schema.
+    Columns that are not part of the schema stay strings.
+
+    Arguments:
+    xml_data - Pandas data frame containing the extracted xml information
+    schema - Dictionary with (data type, unit) for every key (default get_xml_schema)
+
+    Returns:
+    Pandas data frame containing the converted columns
+    """
+    function_dict: typing.Dict[
         str,
         typing.Callable[
-            [et.Element, str, typing.List[str], typing.Dict[str, str]],
-            None
+            [pd.Series],
+            pd.Series
             ]
         ]
-    tree: et.ElementTree
-    root: et.Element
-    data_dict: typing.Dict[str, str]
+    output_data: pd.DataFrame
 
-    level_func_dict = {
-        'key_value': get_all_key_value,
-        'level 0': get_level_0_xml,
-        'level 1': get_level_1_xml,
-        'level 3': get_level_3_xml,
+    function_dict = {
+        'float64': convert_to_float,
+        'int32': convert_to_int,
+        'bool': convert_to_bool,
+        'category': convert_to_category,
         }
 
-    tree = et.parse(file_name)
-    root = tree.getroot()
-    data_dict = {}
-    recursive_node(
-        node=root,
-        data_dict=data_dict,
-        level_dict=level_dict,
-        level_func_dict=level_func_dict
+    if schema is None:
+        schema = get_xml_schema()
+
+    output_data = xml_data.copy(deep=False)
+    for name in output_data:
+        if name in schema:
+            output_data[name] = function_dict[schema[name][0]](output_data[name])
+    return output_data
+
+
+def load_xml_many(
+        file_names: typing.List[str],
+        level_dict: typing.Optional[typing.Dict[str, typing.Dict[str, typing.List[str]]]]=None,
+        n_workers: int=1,
+        use_processes: bool=True,
+        streaming: bool=False
+    ) -> pd.DataFrame:
+    """
+    Extract the xml information of many files into a single data frame.
+    The columns are created once from the extracted values and
+    converted with apply_xml_schema.
+    Keys that are missing in a file are missing values.
+    By default, the level_dict of the preset detected on the first file is used.
+
+    Arguments:
+    file_names - Paths to the xml files
+    level_dict - Dictionary containin the keys to extract (default epu.detect_xml_preset)
+    n_workers - Number of parallel workers (default 1)
+    use_processes - Use processes instead of threads (default True)
+    streaming - Use iterparse_node instead of parsing the full tree (default False)
+
+    Returns:
+    Pandas data frame containing the file_name and the information of every file
+    """
+    data_dicts: typing.List[typing.Dict[str, str]]
+    column_names: typing.Dict[str, None]
+    columns: typing.Dict[str, typing.List[typing.Optional[str]]]
+    xml_data: pd.DataFrame
+
+    if level_dict is None and file_names:
+        level_dict = epu.get_xml_level_dict(epu.detect_xml_preset(file_names[0]))
+    elif level_dict is None:
+        level_dict = {}
+
+    data_dicts = util.map_files(
+        functools.partial(
+            load_xml_dict,
+            tag_handlers=compile_level_dict(level_dict),
+            streaming=streaming
+            ),
+        file_names,
+        n_workers,
+        use_processes
         )
 
+    column_names = {}
+    for data_dict in data_dicts:
+        column_names.update(dict.fromkeys(data_dict))
+
+    columns = {'file_name': list(file_names)}
+    for name in column_names:
+        columns[name] = [data_dict.get(name) for data_dict in data_dicts]
 
-    return pd.DataFrame(data_dict, index=[0])
+    xml_data = pd.DataFrame(columns, index=range(len(file_names)), dtype=object)
+    return apply_xml_schema(xml_data)